@@ -0,0 +1,86 @@
+import math
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import Config
+
+
+@dataclass(frozen=True)
+class InstanceSpec:
+    groups: int = 4
+    subjects_per_group: int = 10
+    common_ratio: float = 0.3
+    subjects: int | None = None
+    teachers: int | None = None
+    max_hours: int = 2
+    days: int = 10
+    hours_per_day: int = 7
+    max_subjects_per_day: int = 6
+    seed: int = 0
+
+    @property
+    def num_common(self) -> int:
+        return round(self.common_ratio * self.subjects_per_group)
+
+    @property
+    def num_subjects(self) -> int:
+        """Size of the subject pool; by default each elective is shared by at most two groups."""
+        if self.subjects is not None:
+            return self.subjects
+        electives = self.subjects_per_group - self.num_common
+        return self.num_common + max(electives, math.ceil(self.groups * electives / 2))
+
+    @property
+    def num_teachers(self) -> int:
+        return self.teachers if self.teachers is not None else self.num_subjects
+
+    @property
+    def label(self) -> str:
+        return (f"g{self.groups}-s{self.num_subjects}-t{self.num_teachers}-c{self.common_ratio:g}"
+                f"-d{self.days}x{self.hours_per_day}")
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def generate_instance(spec: InstanceSpec):
+    """Build a synthetic (teachers, subjects_per_group, config) triple shaped like the Excel data."""
+    rng = random.Random(spec.seed)
+    pool = [f"Subject {i:03d}" for i in range(spec.num_subjects)]
+    common = pool[:spec.num_common]
+    electives = pool[spec.num_common:]
+    per_group = spec.subjects_per_group - spec.num_common
+    hours = {subject: rng.randint(1, spec.max_hours) for subject in pool}
+
+    subjects_per_group = {}
+    for g in range(spec.groups):
+        # Rotate through the elective pool so electives are spread evenly across groups.
+        offset = (g * per_group) % len(electives) if electives else 0
+        chosen = [electives[(offset + k) % len(electives)] for k in range(per_group)]
+        subjects_per_group[f"group{g + 1:03d}"] = {subject: hours[subject] for subject in common + chosen}
+
+    teachers = {subject: f"Teacher {i % spec.num_teachers:03d}" for i, subject in enumerate(pool)}
+    config = Config(
+        days=spec.days,
+        hours_per_day=spec.hours_per_day,
+        max_subjects_per_day=spec.max_subjects_per_day,
+        subjects=pool,
+        common_subjects=common,
+    )
+    return teachers, subjects_per_group, config
+
+
+def write_instance_excel(teachers, subjects_per_group, data_dir: Path) -> None:
+    """Write an instance in the layout read by ``load_data_from_excel``."""
+    groups_dir = data_dir / "groups"
+    groups_dir.mkdir(parents=True, exist_ok=True)
+    for group, subjects in subjects_per_group.items():
+        pd.DataFrame({"Subject": list(subjects), "Min_Hours": list(subjects.values())}).to_excel(
+            groups_dir / f"{group}.xlsx", index=False
+        )
+    pd.DataFrame({"Subject": list(teachers), "Teacher": list(teachers.values())}).to_excel(
+        data_dir / "Teachers.xlsx", index=False
+    )
@@ -0,0 +1,177 @@
+"""Scaling benchmark for the scheduler pipeline.
+
+Example::
+
+    python -m benchmarks.run --groups 4 16 64 --output bench.json
+    python -m benchmarks.run --groups 4 16 64 --compare bench.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from importlib.metadata import version
+from pathlib import Path
+
+from ortools.sat.python import cp_model
+
+from benchmarks.generator import InstanceSpec, generate_instance, write_instance_excel
+from src.data_loader import load_data_from_excel
+from src.engines import ENGINES
+from src.solver import make_solver
+
+# Measured metrics where a larger value is a regression, with the absolute slack tolerated on top of
+# the relative tolerance so sub-millisecond noise on tiny instances is not reported.
+TIMED_METRICS = {
+    "load_time": 0.05,
+    "build_time": 0.05,
+    "solve_time": 0.25,
+    "peak_rss_mb": 10.0,
+}
+# Model size is deterministic, so any growth is reported.
+COUNTED_METRICS = ("variables", "constraints")
+
+
+def run_case(spec: InstanceSpec, time_limit: float, num_workers: int, engine: str = "grid") -> dict:
+    """Generate, load, build and solve one instance and return its metrics."""
+    teachers, subjects_per_group, config = generate_instance(spec)
+    config = replace(config, time_limit=time_limit, num_workers=num_workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_instance_excel(teachers, subjects_per_group, Path(tmp))
+        start = time.perf_counter()
+        teachers, subjects_per_group = load_data_from_excel(tmp + "/")
+        load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model, _ = ENGINES[engine].build(subjects_per_group, teachers, config)
+    build_time = time.perf_counter() - start
+
+    proto = model.Proto()
+    solver = make_solver(config)
+    start = time.perf_counter()
+    status = solver.Solve(model)
+    solve_time = time.perf_counter() - start
+
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "label": f"{spec.label}-{engine}",
+        "engine": engine,
+        "spec": spec.to_dict(),
+        "status": solver.StatusName(status),
+        "objective": solver.ObjectiveValue() if solved else None,
+        "bound": solver.BestObjectiveBound() if solved else None,
+        "load_time": load_time,
+        "build_time": build_time,
+        "solve_time": solve_time,
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        # ru_maxrss is reported in kilobytes on Linux.
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_suite(specs: list[InstanceSpec], time_limit: float, num_workers: int, engines=("grid",)) -> dict:
+    """Run every spec and engine in a fresh process so peak RSS is attributable to that case alone."""
+    results = []
+    for spec in specs:
+        for engine in engines:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_case, spec, time_limit, num_workers, engine).result()
+            print(f"{result['label']}: {result['status']} objective={result['objective']} "
+                  f"build={result['build_time']:.2f}s solve={result['solve_time']:.2f}s "
+                  f"vars={result['variables']} constraints={result['constraints']} "
+                  f"rss={result['peak_rss_mb']:.0f}MB", flush=True)
+            results.append(result)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "ortools": version("ortools"),
+            "platform": platform.platform(),
+            "time_limit": time_limit,
+            "num_workers": num_workers,
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a human-readable line for every metric that regressed against ``baseline``."""
+    previous = {result["label"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(result["label"])
+        if old is None:
+            continue
+        if result["status"] != old["status"]:
+            regressions.append(f"{result['label']}: status {old['status']} -> {result['status']}")
+        if old["objective"] is not None and result["objective"] is not None and result["objective"] > old["objective"]:
+            regressions.append(f"{result['label']}: objective {old['objective']:g} -> {result['objective']:g}")
+        for metric, slack in TIMED_METRICS.items():
+            if result[metric] > old[metric] * (1 + tolerance) + slack:
+                regressions.append(f"{result['label']}: {metric} {old[metric]:.3f} -> {result[metric]:.3f}")
+        for metric in COUNTED_METRICS:
+            if result[metric] > old[metric]:
+                regressions.append(f"{result['label']}: {metric} {old[metric]} -> {result[metric]}")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    defaults = InstanceSpec()
+    parser = argparse.ArgumentParser(description="Scheduler scaling benchmark")
+    parser.add_argument("--groups", type=int, nargs="+", default=[4, 16, 64], help="group counts to benchmark")
+    parser.add_argument("--subjects-per-group", type=int, default=defaults.subjects_per_group)
+    parser.add_argument("--subjects", type=int, default=None, help="subject pool size (default: scales with groups)")
+    parser.add_argument("--teachers", type=int, default=None, help="teacher count (default: one per subject)")
+    parser.add_argument("--common-ratio", type=float, default=defaults.common_ratio)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--hours-per-day", type=int, default=defaults.hours_per_day)
+    parser.add_argument("--max-subjects-per-day", type=int, default=defaults.max_subjects_per_day)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=["grid"],
+                        help="model formulations to compare (default: grid)")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="per-instance solve limit in seconds")
+    parser.add_argument("--num-workers", type=int, default=8, help="CP-SAT search workers")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    specs = [
+        InstanceSpec(
+            groups=groups,
+            subjects_per_group=args.subjects_per_group,
+            common_ratio=args.common_ratio,
+            subjects=args.subjects,
+            teachers=args.teachers,
+            days=args.days,
+            hours_per_day=args.hours_per_day,
+            max_subjects_per_day=args.max_subjects_per_day,
+            seed=args.seed,
+        )
+        for groups in args.groups
+    ]
+    report = run_suite(specs, args.time_limit, args.num_workers, args.engines)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.compare is not None:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Import-time benchmark for the command-line entry point.
+
+Example::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup -- --from-solution --export-csv out/timetable.csv
+
+Runs ``python -X importtime -m src.main <args>`` (``--help`` by default) in a fresh process and reports
+the total import time, whether any heavy dependency was imported, and the slowest top-level imports.
+``tests/test_startup.py`` checks that the light entry paths import none of the heavy dependencies; the
+time is only compared against ``STARTUP_BUDGET_MS`` here, since wall-clock numbers vary between machines.
+"""
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("ortools", "pandas", "matplotlib")
+# Import budget for entry paths that neither solve nor draw; importing OR-Tools alone costs more.
+STARTUP_BUDGET_MS = 450
+
+
+@dataclass
+class ImportProfile:
+    # Cumulative microseconds per imported module, and the same for top-level imports only.
+    modules: dict[str, int]
+    top_level: dict[str, int]
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.top_level.values()) / 1000
+
+    def imported(self, package: str) -> bool:
+        return any(name == package or name.startswith(package + ".") for name in self.modules)
+
+    def heavy(self) -> list[str]:
+        return [package for package in HEAVY_MODULES if self.imported(package)]
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    """Parse ``-X importtime`` lines: ``import time: self [us] | cumulative | imported package``."""
+    modules, top_level = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        modules[name.strip()] = int(cumulative)
+        # Nested imports are indented by two extra spaces per level.
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative)
+    return ImportProfile(modules, top_level)
+
+
+def measure_startup(argv: list[str], cwd: Path = PROJECT_ROOT) -> ImportProfile:
+    """Run the entry point with ``argv`` under ``-X importtime`` and return its import profile."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "src.main", *argv], cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure src.main import time")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list (default: 10)")
+    parser.add_argument("args", nargs="*", default=["--help"], help="arguments for src.main (default: --help)")
+    args = parser.parse_args(argv)
+
+    profile = measure_startup(args.args)
+    verdict = "within" if profile.total_ms <= STARTUP_BUDGET_MS else "over"
+    print(f"total import time: {profile.total_ms:.1f} ms ({verdict} the {STARTUP_BUDGET_MS} ms budget)")
+    print(f"heavy modules imported: {', '.join(profile.heavy()) or 'none'}")
+    for name, cumulative in sorted(profile.top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{cumulative / 1000:>9.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
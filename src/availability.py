@@ -0,0 +1,47 @@
+"""Availability calendars: slots a teacher, group or subject cannot be scheduled in.
+
+Calendars live in ``Config.unavailable`` as ``{kind: {name: [[day, hour], ...]}}`` with model day and
+hour indices, where an entry of just ``[day]`` blocks the whole day. ``data_loader.load_availability``
+reads them from ``Availability.xlsx`` or ``Availability.csv`` next to the teachers file.
+"""
+import numpy as np
+
+from src.config import Config
+
+CALENDAR_KINDS = ("teacher", "group", "subject")
+
+
+def blocked_slots(config: Config, kind: str, name: str) -> np.ndarray | None:
+    """(days, hours) mask of the slots one calendar blocks, or None when it blocks nothing.
+
+    Entries outside the configured days and hours are ignored.
+    """
+    entries = config.unavailable.get(kind, {}).get(name)
+    if not entries:
+        return None
+    blocked = np.zeros((config.days, config.hours_per_day), dtype=bool)
+    for day, *hour in entries:
+        if not 0 <= day < config.days:
+            continue
+        if not hour:
+            blocked[day] = True
+        elif 0 <= hour[0] < config.hours_per_day:
+            blocked[day, hour[0]] = True
+    return blocked
+
+
+def allowed_slots(config: Config, groups, subject: str, teacher: str | None) -> np.ndarray | None:
+    """(days, hours) mask of slots where ``subject`` can be taught to every one of ``groups``.
+
+    A slot is allowed when neither the subject's calendar, its teacher's nor any of the groups' blocks
+    it. Returns None when no calendar blocks anything, so callers can keep the dense path.
+    """
+    calendars = [("subject", subject), *(("group", group) for group in groups)]
+    if teacher is not None:
+        calendars.append(("teacher", teacher))
+    allowed = None
+    for kind, name in calendars:
+        blocked = blocked_slots(config, kind, name)
+        if blocked is not None:
+            allowed = ~blocked if allowed is None else allowed & ~blocked
+    return allowed
@@ -4,6 +4,15 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 
+def _override(cli_value, file_value, default):
+    """Prefer an explicit CLI value, then config.toml, then the built-in default."""
+    if cli_value is not None:
+        return cli_value
+    if file_value is not None:
+        return file_value
+    return default
+
+
 @dataclass
 class Config:
     days: int = 10
@@ -12,6 +21,14 @@ class Config:
     max_subjects_per_day: int = 6
     subjects: list[str] = field(default_factory=list)
     common_subjects: list[str] = field(default_factory=list)
+    alias_common_subjects: bool = True
+    prune_redundant_constraints: bool = True
+    # Blocked slots per availability calendar, see src/availability.py.
+    unavailable: dict[str, dict[str, list[list[int]]]] = field(default_factory=dict)
+    num_workers: int = 0
+    time_limit: float | None = None
+    relative_gap: float | None = None
+    absolute_gap: float | None = None
 
     @classmethod
     def load(cls, args: argparse.Namespace, toml_path: str | None = None) -> "Config":
@@ -21,6 +38,7 @@ class Config:
         with open(toml_path, "rb") as f:
             data = tomllib.load(f)
 
+        solver = data.get("solver", {})
         return cls(
             days=args.days,
             start_hour=args.start_hour,
@@ -28,4 +46,10 @@ class Config:
             max_subjects_per_day=args.max_subjects_per_day,
             subjects=data.get("subjects", []),
             common_subjects=data.get("common_subjects", []),
+            alias_common_subjects=args.alias_common_subjects,
+            prune_redundant_constraints=args.prune_redundant_constraints,
+            num_workers=_override(args.num_workers, solver.get("num_workers"), 0),
+            time_limit=_override(args.time_limit, solver.get("time_limit"), None),
+            relative_gap=_override(args.relative_gap, solver.get("relative_gap"), None),
+            absolute_gap=_override(args.absolute_gap, solver.get("absolute_gap"), None),
         )
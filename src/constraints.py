@@ -1,160 +1,349 @@
-from src.config import Config
-
-
-def add_subject_slots(model, subjects_per_group, config: Config):
-    """Create a boolean variable for each (group, subject, day, hour) combination."""
-    subject_slots: dict[str, dict] = {}
+import time
+from dataclasses import dataclass, field
 
-    for group, subjects in subjects_per_group.items():
-        subject_slots[group] = {}
-        for subject, min_hours in subjects.items():
-            for day in range(config.days):
-                for hour in range(config.hours_per_day):
-                    subject_slots[group][(subject, day, hour)] = model.NewBoolVar(f'{group}_{subject}_{day}_{hour}')
+import numpy as np
+from ortools.sat.python import cp_model
 
-    return subject_slots
-
-
-def add_common_subject_constraints(model, subject_slots, subjects_per_group, config: Config):
+from src.availability import allowed_slots
+from src.config import Config
+from src.slots import SlotStore
+
+# add_no_gaps_constraints only lets a lesson start at hour h >= 2 if the same subject also sits at
+# h - 1 or h - 2 that day, which one-lesson-per-day forbids; so lessons can only use hours 0 and 1.
+LAST_GAPLESS_HOUR = 1
+
+
+def usable_hours_per_day(config: Config) -> int:
+    """Lessons a group can actually take per day under the full set of constraint families."""
+    return min(config.hours_per_day, config.max_subjects_per_day, LAST_GAPLESS_HOUR + 1)
+
+
+def _aliased_subjects(config: Config) -> set[str]:
+    """Common subjects whose slots are shared by reference between groups."""
+    return set(config.common_subjects) if config.alias_common_subjects else set()
+
+
+def add_subject_slots(model, subjects_per_group, config: Config, teachers_per_subject=None) -> SlotStore:
+    """Create a boolean variable for each allowed (group, subject, day, hour) combination.
+
+    When ``config.alias_common_subjects`` is set, every group taking a common subject points at
+    one shared variable per (subject, day, hour) instead of owning its own copy. Slots blocked by
+    ``config.unavailable`` get no variable; a common subject is only allowed where every group taking
+    it is free, so its rows stay aligned either way.
+    """
+    teachers_per_subject = teachers_per_subject or {}
+    subjects = list(dict.fromkeys(subject for group in subjects_per_group.values() for subject in group))
+    store = SlotStore(subjects_per_group, subjects, config.days, config.hours_per_day)
+    aliased = _aliased_subjects(config)
+    common_blocks: dict[str, tuple[int, np.ndarray]] = {}
+    common_groups: dict[str, list[str]] = {}
+    for group, group_subjects in subjects_per_group.items():
+        for subject in group_subjects:
+            if subject in config.common_subjects:
+                common_groups.setdefault(subject, []).append(group)
+
+    for g, (group, group_subjects) in enumerate(subjects_per_group.items()):
+        for subject, min_hours in group_subjects.items():
+            s = store.subject_index[subject]
+            allowed = allowed_slots(config, common_groups.get(subject, [group]), subject,
+                                    teachers_per_subject.get(subject))
+            if subject not in aliased:
+                store.add_row(model, g, s, f'{group}_{subject}', allowed)
+                store.required[g, s] = min_hours
+            elif subject in common_blocks:
+                owner, block = common_blocks[subject]
+                store.share_row(g, s, block)
+                store.required[owner, s] = max(store.required[owner, s], min_hours)
+            else:
+                common_blocks[subject] = (g, store.add_row(model, g, s, subject, allowed))
+                store.required[g, s] = min_hours
+
+    return store
+
+
+def add_common_subject_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
     """Force common subjects to occupy the same time slot across all groups."""
-    common_slots: dict[str, dict] = {}
+    if config.alias_common_subjects:
+        return  # add_subject_slots already shares one variable per common slot
+
+    present = subject_slots.present()
     for subject in config.common_subjects:
-        common_slots[subject] = {}
+        s = subject_slots.subject_index.get(subject)
+        if s is None:
+            continue
+        rows = subject_slots.index[present[:, s], s]
         for day in range(config.days):
             for hour in range(config.hours_per_day):
-                common_slots[subject][(day, hour)] = model.NewBoolVar(f'{subject}_{day}_{hour}')
-                for group in subjects_per_group:
-                    if subject in subjects_per_group[group]:
-                        model.Add(subject_slots[group][(subject, day, hour)] == common_slots[subject][(day, hour)])
+                group_slots = subject_slots.vars_at(rows[:, day, hour])
+                if not group_slots:
+                    continue  # blocked for every group taking the subject
+                common_slot = model.NewBoolVar(f'{subject}_{day}_{hour}')
+                for group_slot in group_slots:
+                    model.Add(group_slot == common_slot)
 
 
-def add_minimum_hours_constraints(model, subject_slots, subjects_per_group, config: Config):
+def add_minimum_hours_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
     """Ensure each subject meets its minimum required hours per group."""
-    for group, subjects in subjects_per_group.items():
-        for subject, min_hours in subjects.items():
-            model.Add(
-                sum(
-                    subject_slots[group][(subject, day, hour)]
-                    for day in range(config.days)
-                    for hour in range(config.hours_per_day)
-                ) >= min_hours
-            )
-
-
-def add_single_class_per_slot_constraints(model, subject_slots, subjects_per_group, config: Config):
+    for g, s in subject_slots.rows():
+        row = subject_slots.vars_at(subject_slots.row(g, s))
+        model.Add(cp_model.LinearExpr.Sum(row) >= int(subject_slots.required[g, s]))
+
+
+def add_single_class_per_slot_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
     """Allow at most one subject per time slot for each group."""
-    for group in subjects_per_group:
+    for g in range(len(subject_slots.groups)):
         for day in range(config.days):
             for hour in range(config.hours_per_day):
-                model.Add(
-                    sum(subject_slots[group][(subject, day, hour)] for subject in subjects_per_group[group]) <= 1
-                )
+                slot = subject_slots.vars_at(subject_slots.slot(g, day, hour))
+                if len(slot) > 1:
+                    model.AddAtMostOne(slot)
 
 
-
-def add_max_subjects_per_day_constraints(model, subject_slots, subjects_per_group, config: Config):
+def add_max_subjects_per_day_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
     """Limit the number of classes per day for each group."""
-    for group in subjects_per_group:
+    for g in range(len(subject_slots.groups)):
         for day in range(config.days):
-            model.Add(
-                sum(
-                    subject_slots[group][(subject, day, hour)]
-                    for subject in subjects_per_group[group]
-                    for hour in range(config.hours_per_day)
-                ) <= config.max_subjects_per_day
-            )
-
-
-def add_no_gaps_constraints(model, subject_slots, subjects_per_group, config: Config):
-    """Prevent scheduling gaps between consecutive hours for a subject."""
-    for group in subjects_per_group:
-        for subject in subjects_per_group[group]:
-            for day in range(config.days):
-                for hour in range(1, config.hours_per_day - 1):
-                    model.AddBoolOr([
-                        subject_slots[group][(subject, day, hour - 1)],
-                        subject_slots[group][(subject, day, hour + 1)].Not(),
-                        subject_slots[group][(subject, day, hour)]
-                    ])
-
-
-def add_non_adjacent_repeats_constraints(model, subject_slots, subjects_per_group, config: Config):
-    """Prevent the same subject from being scheduled in consecutive time slots."""
-    for group in subjects_per_group:
-        for subject in subjects_per_group[group]:
-            for day in range(config.days):
-                for hour in range(config.hours_per_day - 1):
-                    model.AddImplication(
-                        subject_slots[group][(subject, day, hour)],
-                        subject_slots[group][(subject, day, hour + 1)].Not()
-                    )
+            lessons = subject_slots.vars_at(subject_slots.index[g, :, day, :])
+            if len(lessons) > config.max_subjects_per_day:
+                model.Add(cp_model.LinearExpr.Sum(lessons) <= config.max_subjects_per_day)
 
 
-def add_one_subject_per_day_constraints(model, subject_slots, subjects_per_group, config: Config):
-    """Limit each subject to at most one lesson per day for each group."""
-    for group in subjects_per_group:
-        for subject in subjects_per_group[group]:
-            for day in range(config.days):
-                model.Add(
-                    sum(subject_slots[group][(subject, day, hour)] for hour in range(config.hours_per_day)) <= 1
-                )
+def add_no_gaps_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
+    """Prevent scheduling gaps between consecutive hours for a subject.
+
+    A blocked slot has no variable and counts as false, so its literal drops out of the clause; when
+    both earlier slots are blocked the later one cannot be used.
+    """
+    variables = subject_slots.variables
+    for g, s in subject_slots.rows():
+        for day_row in subject_slots.row(g, s).tolist():
+            for hour in range(1, config.hours_per_day - 1):
+                before, after, current = day_row[hour - 1], day_row[hour + 1], day_row[hour]
+                if after < 0:
+                    continue
+                model.AddBoolOr([variables[i].Not() if i == after else variables[i]
+                                 for i in (before, after, current) if i >= 0])
+
+
+def add_non_adjacent_repeats_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
+    """Prevent the same subject from being scheduled in consecutive time slots."""
+    variables = subject_slots.variables
+    for g, s in subject_slots.rows():
+        for day_row in subject_slots.row(g, s).tolist():
+            for hour in range(config.hours_per_day - 1):
+                if day_row[hour] >= 0 and day_row[hour + 1] >= 0:
+                    model.AddImplication(variables[day_row[hour]], variables[day_row[hour + 1]].Not())
 
 
-def add_teacher_constraints(model, subject_slots, teachers_per_subject, subjects_per_group, config: Config):
+def add_one_subject_per_day_constraints(model, subject_slots: SlotStore, subjects_per_group, config: Config):
+    """Limit each subject to at most one lesson per day for each group."""
+    for g, s in subject_slots.rows():
+        row = subject_slots.row(g, s)
+        for day in range(config.days):
+            lessons = subject_slots.vars_at(row[day])
+            if len(lessons) > 1:
+                model.AddAtMostOne(lessons)
+
+
+def teacher_lessons(present: np.ndarray, subjects: list[str], teachers_per_subject,
+                    config: Config) -> dict[str, list[tuple[int, int]]]:
+    """Map each teacher to the (group, subject) index rows they teach, listing each lesson once.
+
+    ``present`` is the (groups, subjects) mask of rows that exist. A common subject is one lesson
+    for every group taking it, so only its first group is kept; other subjects are separate
+    lessons per group even when the same teacher gives them.
+    """
+    common_subjects = set(config.common_subjects)
+    common = {s for s, subject in enumerate(subjects) if subject in common_subjects}
+    rows: dict[str, list[tuple[int, int]]] = {}
+    seen: set = set()
+
+    for g, s in np.argwhere(present).tolist():
+        teacher = teachers_per_subject.get(subjects[s])
+        if teacher is None:
+            continue
+        lesson = s if s in common else (g, s)
+        if lesson in seen:
+            continue
+        seen.add(lesson)
+        rows.setdefault(teacher, []).append((g, s))
+
+    return rows
+
+
+def add_teacher_constraints(model, subject_slots: SlotStore, teachers_per_subject, subjects_per_group,
+                            config: Config):
     """Ensure a teacher is not assigned to multiple classes at the same time."""
-    teacher_busy_slots: dict[str, dict] = {}
-
-    for group, subjects in subjects_per_group.items():
-        for subject, hours in subjects.items():
-            teacher = teachers_per_subject.get(subject)
-            if teacher is None:
-                continue
-
-            if teacher not in teacher_busy_slots:
-                teacher_busy_slots[teacher] = {}
-
-            for day in range(config.days):
-                for hour in range(config.hours_per_day):
-                    if subject in config.common_subjects:
-                        if (day, hour) not in teacher_busy_slots[teacher]:
-                            teacher_busy_slots[teacher][(day, hour)] = []
-
-                        common_slot_var = subject_slots[group].get((subject, day, hour))
-                        if common_slot_var is not None:
-                            teacher_busy_slots[teacher][(day, hour)].append(common_slot_var)
-                    else:
-                        if (subject, day, hour) in subject_slots[group]:
-                            subject_slot = subject_slots[group][(subject, day, hour)]
-                            if (day, hour) not in teacher_busy_slots[teacher]:
-                                teacher_busy_slots[teacher][(day, hour)] = []
-
-                            teacher_busy_slots[teacher][(day, hour)].append(subject_slot)
-
-    for teacher, slots in teacher_busy_slots.items():
-        for (day, hour), slot_vars in slots.items():
-            if len(slot_vars) > 1:
-                model.Add(sum(slot_vars) <= 1)
-
-    return teacher_busy_slots
-
-
-def add_all_constraints(model, subject_slots, subjects_per_group, teachers, config: Config):
-    add_common_subject_constraints(model, subject_slots, subjects_per_group, config)
-    add_minimum_hours_constraints(model, subject_slots, subjects_per_group, config)
-    add_single_class_per_slot_constraints(model, subject_slots, subjects_per_group, config)
-    add_max_subjects_per_day_constraints(model, subject_slots, subjects_per_group, config)
-    add_no_gaps_constraints(model, subject_slots, subjects_per_group, config)
-    add_non_adjacent_repeats_constraints(model, subject_slots, subjects_per_group, config)
-    add_one_subject_per_day_constraints(model, subject_slots, subjects_per_group, config)
-    # add_teacher_constraints(model, subject_slots, teachers, subjects_per_group, config)
-
-
-def minimize_slots_usage(model, subject_slots, subjects_per_group, config: Config):
-    """Minimize the total number of used time slots across all groups."""
-    model.Minimize(
-        sum(subject_slots[group][(subject, day, hour)]
-            for group in subjects_per_group
-            for subject in subjects_per_group[group]
-            for day in range(config.days)
-            for hour in range(config.hours_per_day))
-    )
+    teacher_rows = teacher_lessons(subject_slots.present(), subject_slots.subjects, teachers_per_subject, config)
+
+    for rows in teacher_rows.values():
+        if len(rows) < 2:
+            continue
+        groups, subjects = zip(*rows)
+        positions = subject_slots.index[list(groups), list(subjects)]
+        for day in range(config.days):
+            for hour in range(config.hours_per_day):
+                lessons = subject_slots.vars_at(positions[:, day, hour])
+                if len(lessons) > 1:
+                    model.AddAtMostOne(lessons)
+
+    return {
+        teacher: [(subject_slots.groups[g], subject_slots.subjects[s]) for g, s in rows]
+        for teacher, rows in teacher_rows.items()
+    }
+
+
+def constraint_families(teachers):
+    """The constraint families applied by ``add_all_constraints``, as (name, builder) pairs.
+
+    Every builder takes ``(model, subject_slots, subjects_per_group, config)``.
+    """
+    def add_teachers(model, subject_slots, subjects_per_group, config):
+        add_teacher_constraints(model, subject_slots, teachers, subjects_per_group, config)
+
+    return [
+        ("common_subjects", add_common_subject_constraints),
+        ("minimum_hours", add_minimum_hours_constraints),
+        ("single_class_per_slot", add_single_class_per_slot_constraints),
+        ("max_subjects_per_day", add_max_subjects_per_day_constraints),
+        ("no_gaps", add_no_gaps_constraints),
+        ("non_adjacent_repeats", add_non_adjacent_repeats_constraints),
+        ("one_subject_per_day", add_one_subject_per_day_constraints),
+        ("teachers", add_teachers),
+    ]
+
+
+def redundant_families(config: Config) -> dict[str, str]:
+    """Families of ``constraint_families`` that the rest of the model already implies, with the reason.
+
+    Every reason relies only on families that are never pruned, so skipping all of them together
+    leaves the solution space unchanged.
+    """
+    redundant = {"non_adjacent_repeats": "implied by one_subject_per_day"}
+    if config.alias_common_subjects:
+        redundant["common_subjects"] = "common slots are aliased"
+    if config.max_subjects_per_day >= min(config.hours_per_day, LAST_GAPLESS_HOUR + 1):
+        redundant["max_subjects_per_day"] = "no_gaps already limits a day to the first hours"
+    return redundant
+
+
+@dataclass
+class FamilyStats:
+    """What one constraint family added to the model."""
+
+    name: str
+    seconds: float = 0.0
+    variables: int = 0
+    constraints: int = 0
+    literals: int = 0
+    skipped: str | None = None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "seconds": self.seconds, "variables": self.variables,
+                "constraints": self.constraints, "literals": self.literals, "skipped": self.skipped}
+
+
+@dataclass
+class BuildReport:
+    """Per-family build cost collected by ``add_all_constraints``."""
+
+    families: list[FamilyStats] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(stats.seconds for stats in self.families)
+
+    @property
+    def variables(self) -> int:
+        return sum(stats.variables for stats in self.families)
+
+    @property
+    def constraints(self) -> int:
+        return sum(stats.constraints for stats in self.families)
+
+    @property
+    def literals(self) -> int:
+        return sum(stats.literals for stats in self.families)
+
+    def to_dict(self) -> dict:
+        return {
+            "families": [stats.to_dict() for stats in self.families],
+            "total": {"seconds": self.seconds, "variables": self.variables,
+                      "constraints": self.constraints, "literals": self.literals},
+        }
+
+    def format(self) -> str:
+        lines = [f"{'family':<22} {'seconds':>8} {'vars':>7} {'constraints':>11} {'literals':>9}"]
+        for stats in self.families:
+            if stats.skipped is not None:
+                lines.append(f"{stats.name:<22} skipped: {stats.skipped}")
+            else:
+                lines.append(f"{stats.name:<22} {stats.seconds:>8.3f} {stats.variables:>7} "
+                             f"{stats.constraints:>11} {stats.literals:>9}")
+        lines.append(f"{'total':<22} {self.seconds:>8.3f} {self.variables:>7} "
+                     f"{self.constraints:>11} {self.literals:>9}")
+        return "\n".join(lines)
+
+
+def _constraint_literals(ct) -> int:
+    """Literals (or linear terms) referenced by one proto constraint, enforcement included."""
+    count = len(ct.enforcement_literal)
+    if ct.has_bool_or():
+        count += len(ct.bool_or.literals)
+    elif ct.has_bool_and():
+        count += len(ct.bool_and.literals)
+    elif ct.has_at_most_one():
+        count += len(ct.at_most_one.literals)
+    elif ct.has_exactly_one():
+        count += len(ct.exactly_one.literals)
+    elif ct.has_linear():
+        count += len(ct.linear.vars)
+    return count
+
+
+def _measure(model, name: str, add_family, subject_slots: SlotStore, subjects_per_group,
+             config: Config) -> FamilyStats:
+    proto = model.Proto()
+    variables, constraints = len(proto.variables), len(proto.constraints)
+    start = time.perf_counter()
+    add_family(model, subject_slots, subjects_per_group, config)
+    seconds = time.perf_counter() - start
+    added = len(proto.constraints) - constraints
+    literals = sum(_constraint_literals(proto.constraints[i]) for i in range(constraints, constraints + added))
+    return FamilyStats(name, seconds, len(proto.variables) - variables, added, literals)
+
+
+def add_all_constraints(model, subject_slots: SlotStore, subjects_per_group, teachers, config: Config,
+                        report: BuildReport | None = None):
+    """Apply every constraint family, skipping redundant ones when ``config.prune_redundant_constraints``.
+
+    When ``report`` is given, one ``FamilyStats`` per family (skipped ones included) is appended to it.
+    """
+    redundant = redundant_families(config) if config.prune_redundant_constraints else {}
+
+    for name, add_family in constraint_families(teachers):
+        if name in redundant:
+            if report is not None:
+                report.families.append(FamilyStats(name, skipped=redundant[name]))
+        elif report is None:
+            add_family(model, subject_slots, subjects_per_group, config)
+        else:
+            report.families.append(_measure(model, name, add_family, subject_slots, subjects_per_group, config))
+
+
+def minimize_slots_usage(model, subject_slots: SlotStore, subjects_per_group, config: Config):
+    """Minimize the total number of used time slots across all groups.
+
+    Works on the variables that exist, so blocked slots simply carry no term.
+    """
+    counts = subject_slots.usage_counts()
+    model.Minimize(cp_model.LinearExpr.WeightedSum(subject_slots.variables, counts.tolist()))
+
+
+def build_model(subjects_per_group, teachers, config: Config, report: BuildReport | None = None):
+    """Create the full model: slot variables, every constraint family and the objective."""
+    model = cp_model.CpModel()
+    subject_slots = add_subject_slots(model, subjects_per_group, config, teachers)
+    add_all_constraints(model, subject_slots, subjects_per_group, teachers, config, report)
+    minimize_slots_usage(model, subject_slots, subjects_per_group, config)
+    return model, subject_slots
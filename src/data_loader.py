@@ -1,25 +1,219 @@
+import csv
+import hashlib
+import json
+import os
 from pathlib import Path
+from typing import Any
 
-import pandas as pd
+from src.availability import CALENDAR_KINDS
 
+SNAPSHOT_VERSION = 1
+# Below this many group files a process pool costs more to start than it saves.
+PARALLEL_THRESHOLD = 8
+AVAILABILITY_FILES = ("Availability.xlsx", "Availability.csv")
 
-def load_data_from_excel(data_dir="data/"):
-    """Load subjects-per-group and teacher assignments from Excel files."""
-    subjects_per_group = {}
+
+def _read_group_excel(path) -> dict[str, int]:
+    import pandas as pd
+
+    df = pd.read_excel(path)
+    return {subject: int(hours) for subject, hours in zip(df['Subject'], df['Min_Hours'])}
+
+
+def _read_teachers_excel(path) -> dict[str, str]:
+    import pandas as pd
+
+    df_teachers = pd.read_excel(path)
+    return dict(zip(df_teachers['Subject'], df_teachers['Teacher']))
+
+
+def _read_availability_excel(path) -> list[list]:
+    import pandas as pd
+
+    df = pd.read_excel(path)
+    return [[kind, name, int(day), None if pd.isna(hour) else int(hour)]
+            for kind, name, day, hour in zip(df['Type'], df['Name'], df['Day'], df['Hour'])]
+
+
+def _read_availability_csv(path) -> list[list]:
+    with open(path, newline="") as f:
+        return [[row['Type'], row['Name'], int(row['Day']), int(row['Hour']) if row.get('Hour') else None]
+                for row in csv.DictReader(f)]
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_snapshot(cache_path: Path | None) -> dict:
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        snapshot = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return {}
+    files: dict = snapshot.get("files", {})
+    return files
+
+
+def _save_snapshot(cache_path: Path, files: dict) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"version": SNAPSHOT_VERSION, "files": files}))
+    os.replace(tmp_path, cache_path)
+
+
+def _cached_entry(path: Path, entry: dict | None) -> tuple[Any, dict]:
+    """Return the cached parse of ``path`` if still valid, plus fresh stat/hash metadata."""
+    stat = path.stat()
+    meta: dict = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if entry is not None and entry["mtime_ns"] == meta["mtime_ns"] and entry["size"] == meta["size"]:
+        return entry["data"], {**meta, "sha256": entry["sha256"]}
+
+    meta["sha256"] = _file_hash(path)
+    if entry is not None and entry["sha256"] == meta["sha256"]:
+        return entry["data"], meta
+    return None, meta
+
+
+def load_data_from_excel(data_dir="data/", workers: int | None = None, cache_path: Path | None = None):
+    """Load subjects-per-group and teacher assignments from Excel files.
+
+    Group files are parsed in parallel when there are many of them. With ``cache_path`` the parsed
+    instance is kept in a JSON snapshot keyed by path, mtime and content hash, and only files that
+    changed since the last run are parsed again.
+    """
     data_path_for_groups = Path(data_dir + 'groups/')
 
     if not data_path_for_groups.exists():
         raise FileNotFoundError(f"Directory {data_dir} does not exist")
 
-    for excel_file in data_path_for_groups.glob("*.xlsx"):
-        group_name = excel_file.stem
-        df = pd.read_excel(excel_file)
-        subjects_per_group[group_name] = dict(zip(df['Subject'], df['Min_Hours']))
+    group_files = sorted(data_path_for_groups.glob("*.xlsx"))
+    if not group_files:
+        raise ValueError(f"No Excel files found in {data_dir}")
+
+    teachers_file = Path(data_dir + 'Teachers.xlsx')
+    cached = _load_snapshot(cache_path)
+    files: dict[str, dict] = {}
+    parsed: dict[Path, object] = {}
+    stale: list[Path] = []
+    dirty = set(cached) != {str(path) for path in [*group_files, teachers_file]}
+
+    for path in [*group_files, teachers_file]:
+        entry = cached.get(str(path))
+        data, meta = _cached_entry(path, entry)
+        files[str(path)] = meta
+        dirty = dirty or entry is None or any(entry.get(key) != value for key, value in meta.items())
+        if data is None:
+            stale.append(path)
+        else:
+            parsed[path] = data
 
-    df_teachers = pd.read_excel(data_dir + 'Teachers.xlsx')
-    teachers_dict = dict(zip(df_teachers['Subject'], df_teachers['Teacher']))
+    stale_groups = [path for path in stale if path != teachers_file]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(stale_groups)) if len(stale_groups) >= PARALLEL_THRESHOLD else 1
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed.update(zip(stale_groups, pool.map(_read_group_excel, stale_groups)))
+    else:
+        parsed.update((path, _read_group_excel(path)) for path in stale_groups)
+    if teachers_file in stale:
+        parsed[teachers_file] = _read_teachers_excel(teachers_file)
+
+    if cache_path is not None and dirty:
+        for name, meta in files.items():
+            meta["data"] = parsed[Path(name)]
+        _save_snapshot(cache_path, files)
+
+    subjects_per_group = {path.stem: parsed[path] for path in group_files}
+    teachers_dict = parsed[teachers_file]
+    return teachers_dict, subjects_per_group
+
+
+def load_data_from_csv(data_dir="data/"):
+    """Load the same instance from ``groups/*.csv`` and ``Teachers.csv`` without pandas."""
+    data_path_for_groups = Path(data_dir + 'groups/')
+
+    if not data_path_for_groups.exists():
+        raise FileNotFoundError(f"Directory {data_dir} does not exist")
+
+    subjects_per_group = {}
+    for csv_file in sorted(data_path_for_groups.glob("*.csv")):
+        with open(csv_file, newline="") as f:
+            subjects_per_group[csv_file.stem] = {row['Subject']: int(row['Min_Hours']) for row in csv.DictReader(f)}
 
     if not subjects_per_group:
-        raise ValueError(f"No Excel files found in {data_dir}")
+        raise ValueError(f"No CSV files found in {data_dir}")
+
+    with open(data_dir + 'Teachers.csv', newline="") as f:
+        teachers_dict = {row['Subject']: row['Teacher'] for row in csv.DictReader(f)}
 
     return teachers_dict, subjects_per_group
+
+
+def load_data_from_json(path):
+    """Load an instance saved by ``save_data_to_json``."""
+    with open(path) as f:
+        data = json.load(f)
+    if not data.get("subjects_per_group"):
+        raise ValueError(f"No groups found in {path}")
+    return data["teachers"], data["subjects_per_group"]
+
+
+def save_data_to_json(teachers, subjects_per_group, path) -> None:
+    """Write an instance in the pandas-free JSON input format."""
+    with open(path, "w") as f:
+        json.dump({"teachers": teachers, "subjects_per_group": subjects_per_group}, f, indent=2)
+
+
+def load_data(source="data/", cache_path: Path | None = None):
+    """Load an instance from a JSON file, or from a data directory of Excel or CSV files."""
+    if str(source).endswith(".json"):
+        return load_data_from_json(source)
+
+    data_dir = str(source) if str(source).endswith("/") else str(source) + "/"
+    if not any(Path(data_dir + 'groups/').glob("*.xlsx")) and any(Path(data_dir + 'groups/').glob("*.csv")):
+        return load_data_from_csv(data_dir)
+    return load_data_from_excel(data_dir, cache_path=cache_path)
+
+
+def load_availability(source="data/", start_hour: int = 9, cache_path: Path | None = None) -> dict:
+    """Load availability calendars from ``Availability.xlsx`` or ``Availability.csv`` in a data directory.
+
+    Each row blocks one slot: ``Type`` is teacher, group or subject, ``Name`` the teacher, group file
+    stem or subject, ``Day`` the 0-based teaching day and ``Hour`` the clock hour, left empty to block
+    the whole day. Returns the ``Config.unavailable`` mapping, empty when there is no file; JSON
+    instances carry no calendars. With ``cache_path`` a parsed Excel file is kept in a JSON snapshot.
+    """
+    if str(source).endswith(".json"):
+        return {}
+    path = next((Path(source) / name for name in AVAILABILITY_FILES if (Path(source) / name).exists()), None)
+    if path is None:
+        return {}
+
+    if path.suffix == ".csv":
+        rows = _read_availability_csv(path)
+    else:
+        cached = _load_snapshot(cache_path)
+        rows, meta = _cached_entry(path, cached.get(str(path)))
+        if rows is None:
+            rows = _read_availability_excel(path)
+            if cache_path is not None:
+                _save_snapshot(cache_path, {str(path): {**meta, "data": rows}})
+
+    calendars: dict[str, dict[str, list[list[int]]]] = {}
+    for kind, name, day, hour in rows:
+        kind = str(kind).strip().lower()
+        if kind not in CALENDAR_KINDS:
+            raise ValueError(f"{path}: unknown availability type {kind!r}, expected one of {', '.join(CALENDAR_KINDS)}")
+        entry = [day] if hour is None else [day, hour - start_hour]
+        calendars.setdefault(kind, {}).setdefault(str(name), []).append(entry)
+    return calendars
@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.engines import ENGINES
+from src.schedule import Schedule, merge_schedules
+from src.solver import make_solver, split_cores
+
+
+def coupling_components(subjects_per_group, teachers_per_subject, config: Config) -> list[list[str]]:
+    """Split groups into components that share no common subject and no teacher."""
+    parent = {group: group for group in subjects_per_group}
+
+    def find(group):
+        while parent[group] != group:
+            parent[group] = parent[parent[group]]
+            group = parent[group]
+        return group
+
+    def union(groups):
+        roots = [find(group) for group in groups]
+        for root in roots[1:]:
+            parent[root] = roots[0]
+
+    common = set(config.common_subjects)
+    links: dict[tuple[str, str], list[str]] = {}
+    for group, subjects in subjects_per_group.items():
+        for subject in subjects:
+            if subject in common:
+                links.setdefault(("subject", subject), []).append(group)
+            teacher = teachers_per_subject.get(subject)
+            if teacher is not None:
+                links.setdefault(("teacher", teacher), []).append(group)
+    for groups in links.values():
+        union(groups)
+
+    components: dict[str, list[str]] = {}
+    for group in subjects_per_group:
+        components.setdefault(find(group), []).append(group)
+    return list(components.values())
+
+
+@dataclass
+class ComponentResult:
+    groups: list[str]
+    status: str
+    objective: float | None
+    wall_time: float
+    schedule: Schedule | None
+
+
+@dataclass
+class DecomposedResult:
+    status: str
+    objective: float | None
+    wall_time: float
+    components: list[ComponentResult]
+    schedule: Schedule | None
+
+
+def solve_component(groups: list[str], subjects_per_group, teachers_per_subject, config: Config,
+                    engine: str = "grid") -> ComponentResult:
+    """Build and solve the model restricted to one component's groups."""
+    component = {group: subjects_per_group[group] for group in groups}
+    model, store = ENGINES[engine].build(component, teachers_per_subject, config)
+    solver = make_solver(config)
+    status = solver.Solve(model)
+
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return ComponentResult(
+        groups=groups,
+        status=solver.StatusName(status),
+        objective=solver.ObjectiveValue() if solved else None,
+        wall_time=solver.WallTime(),
+        schedule=ENGINES[engine].extract(store, solver.ResponseProto(), teachers_per_subject) if solved else None,
+    )
+
+
+def solve_decomposed(subjects_per_group, teachers_per_subject, config: Config, workers: int | None = None,
+                     engine: str = "grid") -> DecomposedResult:
+    """Solve each independent component as its own model across a process pool and merge the results."""
+    components = coupling_components(subjects_per_group, teachers_per_subject, config)
+    workers = min(workers or os.cpu_count() or 1, len(components))
+
+    if workers <= 1:
+        results = [
+            solve_component(groups, subjects_per_group, teachers_per_subject, config, engine) for groups in components
+        ]
+    else:
+        config = split_cores(config, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(solve_component, groups, subjects_per_group, teachers_per_subject, config, engine)
+                for groups in components
+            ]
+            results = [future.result() for future in futures]
+
+    statuses = {result.status for result in results}
+    if statuses <= {"OPTIMAL"}:
+        status = "OPTIMAL"
+    elif statuses <= {"OPTIMAL", "FEASIBLE"}:
+        status = "FEASIBLE"
+    else:
+        status = "INFEASIBLE" if "INFEASIBLE" in statuses else "UNKNOWN"
+
+    solved = status in ("OPTIMAL", "FEASIBLE")
+    return DecomposedResult(
+        status=status,
+        objective=sum(result.objective or 0 for result in results) if solved else None,
+        wall_time=max((result.wall_time for result in results), default=0.0),
+        components=results,
+        schedule=merge_schedules([r.schedule for r in results if r.schedule], list(subjects_per_group))
+        if solved else None,
+    )
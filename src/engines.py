@@ -0,0 +1,20 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.constraints import build_model
+from src.interval_engine import build_interval_model, extract_interval_schedule
+from src.schedule import Schedule, extract_schedule
+
+
+@dataclass(frozen=True)
+class Engine:
+    """A model formulation: how to build it and how to read a ``Schedule`` back from a response."""
+
+    build: Callable  # (subjects_per_group, teachers, config) -> (model, store)
+    extract: Callable[..., Schedule]  # (store, response, teachers) -> Schedule
+
+
+ENGINES = {
+    "grid": Engine(build_model, extract_schedule),
+    "interval": Engine(build_interval_model, extract_interval_schedule),
+}
@@ -0,0 +1,205 @@
+"""Stream a solved timetable to CSV, Parquet and iCalendar files for other systems to consume.
+
+Every writer walks the schedule grid one group (or teacher) at a time and writes rows as it goes, so no
+table of the whole timetable is built; teacher calendars index the occupied slots once up front. Nothing
+here imports matplotlib; Parquet needs the optional ``pyarrow`` package.
+"""
+import csv
+import re
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.config import Config
+from src.schedule import EMPTY, Schedule
+
+COLUMNS = ("group", "day", "hour", "subject", "teacher")
+PRODID = "-//university-scheduler//timetable export//EN"
+# Parquet row groups hold this many groups' lessons each.
+PARQUET_GROUPS_PER_BATCH = 64
+
+
+def iter_rows(schedule: Schedule, config: Config) -> Iterator[tuple[str, int, int, str, str]]:
+    """Yield (group, day, hour, subject, teacher) per lesson, group by group; ``hour`` is the clock hour."""
+    for group in schedule.groups:
+        for day, hour, subject, teacher in schedule.lessons(group):
+            yield group, day, config.start_hour + hour, subject, teacher
+
+
+def write_csv(schedule: Schedule, config: Config, path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(iter_rows(schedule, config))
+    return path
+
+
+def write_parquet(schedule: Schedule, config: Config, path: Path,
+                  groups_per_batch: int = PARQUET_GROUPS_PER_BATCH) -> Path:
+    """Write the rows as Parquet, one row group per ``groups_per_batch`` groups."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from error
+
+    schema = pa.schema([("group", pa.string()), ("day", pa.int16()), ("hour", pa.int16()),
+                        ("subject", pa.string()), ("teacher", pa.string())])
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    subjects = np.array(schedule.subjects, dtype=object)
+    teachers = np.array(schedule.teachers, dtype=object)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, len(schedule.groups), groups_per_batch):
+            grid = schedule.grid[start:start + groups_per_batch]
+            g, day, hour = np.nonzero(grid != EMPTY)
+            lesson = grid[g, day, hour]
+            groups = np.array(schedule.groups[start:start + groups_per_batch], dtype=object)
+            writer.write_batch(pa.record_batch(
+                [groups[g].tolist(), day.astype(np.int16), (hour + config.start_hour).astype(np.int16),
+                 subjects[lesson].tolist(), teachers[lesson].tolist()], schema=schema))
+    return path
+
+
+def lesson_date(start: date, day: int) -> date:
+    """Calendar date of model day ``day`` when day 0 is the Monday ``start`` and weekends are skipped."""
+    return start + timedelta(days=day + (day // 5) * 2)
+
+
+def _escape(text: str) -> str:
+    return re.sub(r"([\\;,])", r"\\\1", text).replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    """Split a content line into 75-octet pieces joined by CRLF + space (RFC 5545, section 3.1)."""
+    if len(line.encode()) <= 75:
+        return line
+    pieces: list[str] = []
+    piece = b""
+    for char in line:
+        octets = char.encode()
+        if len(piece) + len(octets) > (75 if not pieces else 74):
+            pieces.append(piece.decode())
+            piece = b""
+        piece += octets
+    pieces.append(piece.decode())
+    return "\r\n ".join(pieces)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "calendar"
+
+
+class _Calendar:
+    """One .ics file written event by event."""
+
+    def __init__(self, path: Path, name: str, stamp: str):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.stamp = stamp
+        self._line("BEGIN:VCALENDAR")
+        self._line("VERSION:2.0")
+        self._line(f"PRODID:{PRODID}")
+        self._line(f"X-WR-CALNAME:{_escape(name)}")
+
+    def _line(self, line: str) -> None:
+        self.file.write(_fold(line) + "\r\n")
+
+    def event(self, uid: str, start: datetime, summary: str, description: str) -> None:
+        self._line("BEGIN:VEVENT")
+        self._line(f"UID:{uid}")
+        self._line(f"DTSTAMP:{self.stamp}")
+        self._line(f"DTSTART:{start:%Y%m%dT%H%M%S}")
+        self._line(f"DTEND:{start + timedelta(hours=1):%Y%m%dT%H%M%S}")
+        self._line(f"SUMMARY:{_escape(summary)}")
+        self._line(f"DESCRIPTION:{_escape(description)}")
+        self._line("END:VEVENT")
+
+    def close(self) -> None:
+        self._line("END:VCALENDAR")
+        self.file.close()
+
+
+def _unique_slugs(names) -> dict[str, str]:
+    """File name per name; names that would share one (ignoring case) get ``-2``, ``-3``, ... suffixes."""
+    slugs: dict[str, str] = {}
+    taken: set[str] = set()
+    for name in names:
+        slug = base = _slug(name)
+        suffix = 1
+        while slug.lower() in taken:
+            suffix += 1
+            slug = f"{base}-{suffix}"
+        taken.add(slug.lower())
+        slugs[name] = slug
+    return slugs
+
+
+def _teacher_events(schedule: Schedule, teachers: list[str]) -> list[list[tuple[int, int, int, list[int]]]]:
+    """(day, hour, subject, groups) events per teacher in ``teachers``, from one pass over the lessons.
+
+    A common subject taught to several groups in the same slot is one event listing all of them.
+    """
+    teacher_ids = {name: t for t, name in enumerate(teachers)}
+    teacher_of = np.array([teacher_ids.get(name, -1) for name in schedule.teachers], dtype=np.int64)
+    g, day, hour = np.nonzero(schedule.grid != EMPTY)
+    lesson = schedule.grid[g, day, hour].astype(np.int64)
+    order = np.lexsort((g, lesson, hour, day, teacher_of[lesson]))
+    keys = np.stack([teacher_of[lesson], day, hour, lesson], axis=1)[order]
+    groups = g[order]
+
+    events: list[list[tuple[int, int, int, list[int]]]] = [[] for _ in teachers]
+    if len(keys) == 0:
+        return events
+    starts = [0, *(np.flatnonzero((keys[1:] != keys[:-1]).any(axis=1)) + 1).tolist(), len(keys)]
+    for lo, hi in zip(starts[:-1], starts[1:]):
+        t, d, h, s = keys[lo].tolist()
+        if t >= 0:
+            events[t].append((d, h, s, groups[lo:hi].tolist()))
+    return events
+
+
+def _start_time(start: date, config: Config, day: int, hour: int) -> datetime:
+    return datetime.combine(lesson_date(start, day), datetime.min.time()) + timedelta(hours=config.start_hour + hour)
+
+
+def write_ics(schedule: Schedule, config: Config, output_dir: Path, start: date) -> list[Path]:
+    """Write ``groups/<group>.ics`` and ``teachers/<teacher>.ics`` under ``output_dir``.
+
+    ``start`` is the Monday of the first scheduled week. Event times are floating local times. A common
+    subject taught to several groups at once is a single event in the teacher's calendar.
+    """
+    if start.weekday() != 0:
+        raise ValueError(f"Calendar start {start} is not a Monday")
+    output_dir = Path(output_dir)
+    stamp = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+    paths = []
+
+    (output_dir / "groups").mkdir(parents=True, exist_ok=True)
+    group_slugs = _unique_slugs(schedule.groups)
+    for group in schedule.groups:
+        slug = group_slugs[group]
+        path = output_dir / "groups" / f"{slug}.ics"
+        calendar = _Calendar(path, group, stamp)
+        for day, hour, subject, teacher in schedule.lessons(group):
+            calendar.event(f"{slug}-{day}-{hour}@university-scheduler", _start_time(start, config, day, hour),
+                           subject, f"{group}, {teacher}")
+        calendar.close()
+        paths.append(path)
+
+    (output_dir / "teachers").mkdir(parents=True, exist_ok=True)
+    teachers = list(dict.fromkeys(name for name in schedule.teachers if name != "Unknown"))
+    teacher_slugs = _unique_slugs(teachers)
+    for teacher, events in zip(teachers, _teacher_events(schedule, teachers)):
+        slug = teacher_slugs[teacher]
+        path = output_dir / "teachers" / f"{slug}.ics"
+        calendar = _Calendar(path, teacher, stamp)
+        for day, hour, s, groups in events:
+            calendar.event(f"{slug}-{day}-{hour}-{s}@university-scheduler", _start_time(start, config, day, hour),
+                           schedule.subjects[s], ", ".join(schedule.groups[g] for g in groups))
+        calendar.close()
+        paths.append(path)
+    return paths
@@ -0,0 +1,138 @@
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.availability import allowed_slots, blocked_slots
+from src.config import Config
+from src.constraints import (
+    LAST_GAPLESS_HOUR,
+    add_subject_slots,
+    constraint_families,
+    teacher_lessons,
+    usable_hours_per_day,
+)
+
+
+class InfeasibleInstanceError(ValueError):
+    """The instance cannot be scheduled; ``problems`` explains why."""
+
+    def __init__(self, problems: list[str]):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+def check_feasibility(subjects_per_group, teachers_per_subject, config: Config) -> list[str]:
+    """Check necessary conditions straight from the data, without building a model.
+
+    Returns one message per violated condition; an empty list does not prove feasibility.
+    """
+    problems = []
+    common = set(config.common_subjects)
+    groups = list(subjects_per_group)
+    subjects = list(dict.fromkeys(subject for group in subjects_per_group.values() for subject in group))
+    present = np.array([[subject in subjects_per_group[group] for subject in subjects] for group in groups])
+
+    # A common subject is one shared lesson, so every group taking it gets the largest minimum.
+    required: dict[str, int] = {}
+    for group_subjects in subjects_per_group.values():
+        for subject, min_hours in group_subjects.items():
+            if subject in common:
+                required[subject] = max(required.get(subject, 0), min_hours)
+
+    def hours(group, subject):
+        return required[subject] if subject in common else subjects_per_group[group][subject]
+
+    per_day = usable_hours_per_day(config)
+    gapless = min(config.hours_per_day, LAST_GAPLESS_HOUR + 1)
+    capacity = config.days * per_day
+    why = (f"min(hours_per_day={config.hours_per_day}, max_subjects_per_day={config.max_subjects_per_day}, "
+           f"{LAST_GAPLESS_HOUR + 1} gapless hours)")
+    common_groups = {subject: [group for group in groups if subject in subjects_per_group[group]]
+                     for subject in common}
+    for group, group_subjects in subjects_per_group.items():
+        total = sum(hours(group, subject) for subject in group_subjects)
+        blocked = blocked_slots(config, "group", group)
+        if blocked is None and total > capacity:
+            problems.append(f"{group} needs {total} hours but has {config.days} days x {per_day} usable hours "
+                            f"= {capacity} ({why})")
+        elif blocked is not None:
+            free = int(np.minimum((~blocked[:, :gapless]).sum(axis=1), per_day).sum())
+            if total > free:
+                problems.append(f"{group} needs {total} hours but its calendar leaves {free} usable hours")
+        for subject in group_subjects:
+            if hours(group, subject) > config.days:
+                problems.append(f"{group}: {subject} needs {hours(group, subject)} hours but allows one lesson "
+                                f"per day over {config.days} days")
+                continue
+            allowed = allowed_slots(config, common_groups.get(subject, [group]), subject,
+                                    teachers_per_subject.get(subject))
+            if allowed is None:
+                continue
+            free_days = int(allowed[:, :gapless].any(axis=1).sum())
+            if hours(group, subject) > free_days:
+                problems.append(f"{group}: {subject} needs {hours(group, subject)} hours but the availability "
+                                f"calendars leave {free_days} days with a usable slot")
+
+    for teacher, lessons in teacher_lessons(present, subjects, teachers_per_subject, config).items():
+        load = sum(hours(groups[g], subjects[s]) for g, s in lessons)
+        blocked = blocked_slots(config, "teacher", teacher)
+        teacher_capacity = config.days * gapless - (0 if blocked is None else int(blocked[:, :gapless].sum()))
+        if load > teacher_capacity:
+            taught = list(dict.fromkeys(subjects[s] for _, s in lessons))
+            problems.append(f"{teacher} must teach {load} hours ({', '.join(taught)}) but only "
+                            f"{teacher_capacity} slots are usable")
+
+    return problems
+
+
+def ensure_feasible(subjects_per_group, teachers_per_subject, config: Config) -> None:
+    """Raise ``InfeasibleInstanceError`` if any cheap necessary condition fails."""
+    problems = check_feasibility(subjects_per_group, teachers_per_subject, config)
+    if problems:
+        raise InfeasibleInstanceError(problems)
+
+
+def _add_enforced_families(model, subject_slots, subjects_per_group, teachers_per_subject, config: Config) -> dict:
+    """Add every constraint family behind its own enforcement literal; returns name -> literal."""
+    proto = model.Proto()
+    literals = {}
+    for name, add_family in constraint_families(teachers_per_subject):
+        first = len(proto.constraints)
+        add_family(model, subject_slots, subjects_per_group, config)
+        literal = model.NewBoolVar(f'enable_{name}')
+        for ct in list(proto.constraints)[first:]:
+            ct.enforcement_literal.append(literal.Index())
+        literals[name] = literal
+    return literals
+
+
+def _solve_assuming(model, literals: list, time_limit: float) -> tuple[cp_model.CpSolver, bool]:
+    """Solve with only ``literals`` assumed true; returns the solver and whether it proved infeasibility."""
+    model.ClearAssumptions()
+    model.AddAssumptions(literals)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    return solver, solver.Solve(model) == cp_model.INFEASIBLE
+
+
+def explain_infeasibility(subjects_per_group, teachers_per_subject, config: Config,
+                          time_limit: float = 10.0) -> list[str]:
+    """Return a minimal set of constraint families that together make the model infeasible.
+
+    Every constraint of a family is enforced by one assumption literal; CP-SAT reports a subset of
+    assumptions that is already infeasible, which is then shrunk one family at a time.
+    """
+    model = cp_model.CpModel()
+    subject_slots = add_subject_slots(model, subjects_per_group, config, teachers_per_subject)
+    literals = _add_enforced_families(model, subject_slots, subjects_per_group, teachers_per_subject, config)
+
+    solver, infeasible = _solve_assuming(model, list(literals.values()), time_limit)
+    if not infeasible:
+        return []
+
+    by_index = {literal.Index(): name for name, literal in literals.items()}
+    core = [by_index[index] for index in solver.SufficientAssumptionsForInfeasibility()]
+    for name in list(core):
+        remaining = [other for other in core if other != name]
+        if _solve_assuming(model, [literals[other] for other in remaining], time_limit)[1]:
+            core = remaining
+    return core
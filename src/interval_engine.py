@@ -0,0 +1,172 @@
+"""Interval formulation: one fixed-size interval per lesson instead of the dense boolean grid.
+
+Each lesson gets a day and an hour variable; the slot ``day * hours_per_day + hour`` is the start
+of a unit interval, so "one class at a time" per group and per teacher become ``AddNoOverlap``.
+The constraint families of the grid model are encoded as follows:
+
+* minimum hours: a row gets exactly ``Min_Hours`` lessons, which is what the grid objective
+  settles on anyway, so the objective is the constant number of group-hours;
+* one lesson of a subject per day: the lesson days of a row are strictly increasing, which
+  also removes the symmetry between interchangeable lessons;
+* non-adjacent repeats: implied by one lesson per day;
+* no gaps: with one lesson per day, ``add_no_gaps_constraints`` forbids a lesson at hour >= 2
+  (it needs an earlier lesson of the same subject that day), so it becomes an hour bound;
+* max subjects per day: per-day indicator literals, only when the limit can actually bind;
+* availability calendars: a lesson's start domain holds only the slots every calendar involved allows.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.availability import allowed_slots
+from src.config import Config
+from src.constraints import LAST_GAPLESS_HOUR, teacher_lessons
+from src.schedule import EMPTY, Schedule
+
+
+@dataclass
+class LessonStore:
+    """Index of lesson variables by (group, subject) row."""
+
+    groups: list[str]
+    subjects: list[str]
+    offered: np.ndarray
+    # One entry per (group, lesson) pair; shared lessons appear once for every group taking them.
+    lesson_group: np.ndarray
+    lesson_subject: np.ndarray
+    lesson_day: np.ndarray
+    lesson_hour: np.ndarray
+    days: int
+    hours: int
+
+
+def _rows(subjects_per_group, config: Config):
+    """Distinct lesson rows as (owner group, subject, required hours, groups sharing the row)."""
+    groups = list(subjects_per_group)
+    common = set(config.common_subjects)
+    shared: dict[str, list] = {}
+    rows = []
+    for g, (group, subjects) in enumerate(subjects_per_group.items()):
+        for subject, min_hours in subjects.items():
+            if subject not in common:
+                rows.append([g, subject, min_hours, [g]])
+            elif subject in shared:
+                shared[subject][2] = max(shared[subject][2], min_hours)
+                shared[subject][3].append(g)
+            else:
+                shared[subject] = [g, subject, min_hours, [g]]
+                rows.append(shared[subject])
+    return groups, rows
+
+
+def add_lesson_intervals(model, subjects_per_group, teachers, config: Config) -> LessonStore:
+    """Add lesson variables, every constraint family and the objective of the interval formulation."""
+    groups, rows = _rows(subjects_per_group, config)
+    subjects = list(dict.fromkeys(subject for group in subjects_per_group.values() for subject in group))
+    subject_index = {subject: s for s, subject in enumerate(subjects)}
+    offered = np.zeros((len(groups), len(subjects)), dtype=bool)
+
+    hours = config.hours_per_day
+    last_hour = min(hours - 1, LAST_GAPLESS_HOUR)
+    day_capacity = last_hour + 1
+
+    group_intervals: list[list] = [[] for _ in groups]
+    row_intervals: dict[tuple[int, int], list] = {}
+    group_day_literals: list[list[list]] = [[[] for _ in range(config.days)] for _ in groups]
+    lesson_group, lesson_subject, lesson_day, lesson_hour = [], [], [], []
+    group_hours = 0
+
+    for owner, subject, required, sharing in rows:
+        s = subject_index[subject]
+        offered[sharing, s] = True
+        group_hours += required * len(sharing)
+        intervals = row_intervals.setdefault((owner, s), [])
+        allowed = allowed_slots(config, [groups[g] for g in sharing], subject, teachers.get(subject))
+        starts = None
+        if allowed is not None:
+            starts = cp_model.Domain.FromValues([day * hours + hour
+                                                 for day, hour in np.argwhere(allowed[:, :last_hour + 1]).tolist()])
+            if starts.is_empty() and required:
+                # The calendars leave this lesson no slot at all: add an always-false constraint so the model is
+                # infeasible, as the grid model is with no variables for the row. check_feasibility reports it.
+                model.Add(0 == 1)
+                starts = None
+        previous_day = None
+        for k in range(required):
+            name = f'{groups[owner]}_{subject}_{k}'
+            day = model.NewIntVar(0, config.days - 1, f'{name}_day')
+            hour = model.NewIntVar(0, last_hour, f'{name}_hour')
+            if starts is None:
+                start = model.NewIntVar(0, config.days * hours - 1, f'{name}_start')
+            else:
+                start = model.NewIntVarFromDomain(starts, f'{name}_start')
+            model.Add(start == day * hours + hour)
+            interval = model.NewFixedSizeIntervalVar(start, 1, f'{name}_interval')
+            if previous_day is not None:
+                model.Add(day > previous_day)
+            previous_day = day
+            intervals.append(interval)
+
+            if config.max_subjects_per_day < day_capacity:
+                on_day = [model.NewBoolVar(f'{name}_on_{d}') for d in range(config.days)]
+                model.AddExactlyOne(on_day)
+                model.Add(day == sum(d * literal for d, literal in enumerate(on_day)))
+                for g in sharing:
+                    for d, literal in enumerate(on_day):
+                        group_day_literals[g][d].append(literal)
+
+            for g in sharing:
+                group_intervals[g].append(interval)
+                lesson_group.append(g)
+                lesson_subject.append(s)
+                lesson_day.append(day.Index())
+                lesson_hour.append(hour.Index())
+
+    for intervals in group_intervals:
+        model.AddNoOverlap(intervals)
+    for day_literals in group_day_literals:
+        for literals in day_literals:
+            if len(literals) > config.max_subjects_per_day:
+                model.Add(sum(literals) <= config.max_subjects_per_day)
+
+    for lessons in teacher_lessons(offered, subjects, teachers, config).values():
+        owned = [row_intervals[(g, s)] for g, s in lessons if (g, s) in row_intervals]
+        if len(owned) > 1:
+            model.AddNoOverlap([interval for intervals in owned for interval in intervals])
+
+    model.Minimize(cp_model.LinearExpr.Sum([]) + group_hours)
+
+    return LessonStore(
+        groups=groups,
+        subjects=subjects,
+        offered=offered,
+        lesson_group=np.asarray(lesson_group, dtype=np.int32),
+        lesson_subject=np.asarray(lesson_subject, dtype=np.int16),
+        lesson_day=np.asarray(lesson_day, dtype=np.int64),
+        lesson_hour=np.asarray(lesson_hour, dtype=np.int64),
+        days=config.days,
+        hours=hours,
+    )
+
+
+def build_interval_model(subjects_per_group, teachers, config: Config):
+    """Create the interval formulation of the timetable; returns ``(model, LessonStore)``."""
+    model = cp_model.CpModel()
+    store = add_lesson_intervals(model, subjects_per_group, teachers, config)
+    return model, store
+
+
+def extract_interval_schedule(store: LessonStore, response, teachers_per_subject) -> Schedule:
+    """Turn lesson day/hour values from a CP-SAT response into a ``Schedule``."""
+    solution = np.asarray(response.solution, dtype=np.int64)
+    grid = np.full((len(store.groups), store.days, store.hours), EMPTY, dtype=np.int16)
+    grid[store.lesson_group, solution[store.lesson_day], solution[store.lesson_hour]] = store.lesson_subject
+
+    return Schedule(
+        groups=list(store.groups),
+        subjects=list(store.subjects),
+        teachers=[teachers_per_subject.get(subject, "Unknown") for subject in store.subjects],
+        offered=store.offered.copy(),
+        grid=grid,
+    )
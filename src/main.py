@@ -1,45 +1,348 @@
+"""Command-line entry point.
+
+Only light modules are imported at load time. OR-Tools (which itself imports pandas) and everything
+built on it are imported once a run actually builds or solves a model, matplotlib only when charts
+are drawn and pandas only when Excel files must be parsed, so ``--help``, ``--from-solution`` and
+headless exports start quickly.
+"""
 import argparse
+from dataclasses import replace
+from datetime import date, timedelta
 from pathlib import Path
 
-from ortools.sat.python import cp_model
-
 from src.config import Config
-from src.constraints import add_all_constraints, add_subject_slots, minimize_slots_usage
-from src.data_loader import load_data_from_excel
-from src.visualizer import visualize_result_full
+from src.data_loader import load_availability, load_data
+from src.export import write_csv, write_ics, write_parquet
+from src.schedule import Schedule
+from src.telemetry import RunMetrics, profiled
+from src.warm_start import load_solution, save_solution, touched_by_change
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LAST_SOLUTION = PROJECT_ROOT / ".cache" / "last_solution.json"
+MODEL_CACHE = PROJECT_ROOT / ".cache" / "models"
+# The keys of src.engines.ENGINES, listed here so building the parser does not import the solver.
+ENGINE_CHOICES = ("grid", "interval")
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="University course scheduler")
     parser.add_argument("--days", type=int, default=10, help="number of scheduling days (default: 10)")
     parser.add_argument("--start-hour", type=int, default=9, help="first class hour (default: 9)")
     parser.add_argument("--hours-per-day", type=int, default=7, help="teaching hours per day (default: 7)")
     parser.add_argument("--max-subjects-per-day", type=int, default=6, help="max subjects per day (default: 6)")
-    return parser.parse_args()
+    parser.add_argument("--no-alias-common-subjects", dest="alias_common_subjects", action="store_false",
+                        help="give each group its own copy of common-subject slots tied by equality constraints")
+    parser.add_argument("--no-prune-constraints", dest="prune_redundant_constraints", action="store_false",
+                        help="emit every constraint family even when the others already imply it")
+    parser.add_argument("--build-report", action="store_true",
+                        help="print the build time and size of each constraint family")
+    parser.add_argument("--data", type=Path, default=None,
+                        help="data directory (Excel or CSV) or instance .json file (default: ./data)")
+    parser.add_argument("--no-data-cache", dest="data_cache", action="store_false",
+                        help="always re-parse the Excel files instead of using the parsed snapshot")
+    parser.add_argument("--no-availability", dest="availability", action="store_false",
+                        help="ignore Availability.xlsx/.csv and allow every slot")
+    parser.add_argument("--no-model-cache", dest="model_cache", action="store_false",
+                        help="always rebuild the grid model instead of loading it from .cache/models")
+    parser.add_argument("--clear-model-cache", action="store_true",
+                        help="delete every cached model before running")
+    parser.add_argument("--num-workers", type=int, default=None,
+                        help="CP-SAT search workers, 0 = all cores (default: config.toml, else 0)")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="wall-clock limit in seconds (default: config.toml, else none)")
+    parser.add_argument("--relative-gap", type=float, default=None,
+                        help="stop once the relative optimality gap drops below this value")
+    parser.add_argument("--absolute-gap", type=float, default=None,
+                        help="stop once the absolute optimality gap drops below this value")
+    parser.add_argument("--solutions-dir", type=Path, default=None,
+                        help="write every improving solution to this directory as it is found")
+    parser.add_argument("--save-solution", type=Path, default=LAST_SOLUTION,
+                        help="where to persist the solved schedule (default: .cache/last_solution.json)")
+    parser.add_argument("--warm-start", type=Path, nargs="?", const=LAST_SOLUTION, default=None,
+                        help="hint the solver with a saved schedule (default file: the last saved solution)")
+    parser.add_argument("--fix-untouched", action="store_true",
+                        help="with --warm-start, fix lessons whose group and subject data did not change")
+    parser.add_argument("--compare-cold", action="store_true",
+                        help="with --warm-start, also solve from scratch and report both solve times")
+    parser.add_argument("--engine", choices=ENGINE_CHOICES, default="grid",
+                        help="model formulation: boolean slot grid or one interval per lesson (default: grid)")
+    parser.add_argument("--decompose", action="store_true",
+                        help="solve groups that share no common subject or teacher as separate models in parallel")
+    parser.add_argument("--from-solution", type=Path, nargs="?", const=LAST_SOLUTION, default=None,
+                        help="skip solving and publish a saved schedule (default file: the last saved solution)")
+    parser.add_argument("--charts-dir", type=Path, default=None,
+                        help="save group charts to this directory instead of opening windows")
+    parser.add_argument("--chart-format", choices=["png", "svg", "pdf"], default="png",
+                        help="file format for --charts-dir (default: png)")
+    parser.add_argument("--render-workers", type=int, default=None,
+                        help="processes used to render --charts-dir (default: one per core)")
+    parser.add_argument("--combined-pdf", type=Path, default=None,
+                        help="save all group charts as pages of one PDF file")
+    parser.add_argument("--export-csv", type=Path, default=None,
+                        help="write (group, day, hour, subject, teacher) rows to this CSV file")
+    parser.add_argument("--export-parquet", type=Path, default=None,
+                        help="write the same rows to this Parquet file (needs pyarrow)")
+    parser.add_argument("--export-ics", type=Path, default=None,
+                        help="write one .ics calendar per group and per teacher under this directory")
+    parser.add_argument("--calendar-start", type=date.fromisoformat, default=None,
+                        help="Monday of the first week for --export-ics, YYYY-MM-DD (default: this week's Monday)")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="write a JSON record of stage timings, model size and solver statistics")
+    parser.add_argument("--profile", action="store_true",
+                        help="run under cProfile and tracemalloc and print the top hotspots and allocation sites")
+    parser.add_argument("--profile-top", type=int, default=20,
+                        help="rows printed per --profile table (default: 20)")
+    args = parser.parse_args(argv)
+    if args.warm_start is not None and (args.decompose or args.engine != "grid"):
+        parser.error("--warm-start needs the grid engine and cannot be combined with --decompose")
+    if args.warm_start is not None and not args.warm_start.is_file():
+        parser.error(f"--warm-start: no saved solution at {args.warm_start}; run once without it first")
+    if args.build_report and (args.decompose or args.engine != "grid"):
+        parser.error("--build-report needs the grid engine and cannot be combined with --decompose")
+    if args.from_solution is not None and (args.warm_start is not None or args.build_report or args.decompose):
+        parser.error("--from-solution does not solve, so it cannot be combined with --warm-start, --build-report "
+                     "or --decompose")
+    if args.from_solution is not None and not args.from_solution.is_file():
+        parser.error(f"--from-solution: no saved solution at {args.from_solution}")
+    return args
 
 
-def main():
-    args = parse_args()
+def _cold_solve_time(subjects_per_group, teachers, config: Config) -> float:
+    from src.constraints import build_model
+    from src.solver import make_solver
+
+    model, _ = build_model(subjects_per_group, teachers, config)
+    solver = make_solver(config)
+    solver.Solve(model)
+    return float(solver.WallTime())
+
+
+def _build(engine, cache, subjects_per_group, teachers, config: Config, report, metrics: RunMetrics):
+    """Build the model through the cache when there is one, else with ``report`` or the engine's builder."""
+    if cache is not None:
+        model, store, hit = cache.get_or_build(subjects_per_group, teachers, config, report)
+        metrics.record(model_cache="hit" if hit else "miss")
+        return model, store
+    if report is not None:
+        from src.constraints import build_model
+
+        return build_model(subjects_per_group, teachers, config, report)
+    return engine.build(subjects_per_group, teachers, config)
+
+
+def _exports_requested(args: argparse.Namespace) -> bool:
+    return any(path is not None for path in (args.export_csv, args.export_parquet, args.export_ics))
+
+
+def _export(schedule: Schedule, args: argparse.Namespace, config: Config):
+    if args.export_csv is not None:
+        print(f"Wrote {write_csv(schedule, config, args.export_csv)}")
+    if args.export_parquet is not None:
+        print(f"Wrote {write_parquet(schedule, config, args.export_parquet)}")
+    if args.export_ics is not None:
+        today = date.today()
+        start = args.calendar_start or today - timedelta(days=today.weekday())
+        paths = write_ics(schedule, config, args.export_ics, start)
+        print(f"Wrote {len(paths)} calendars to {args.export_ics}")
+
+
+def _publish(schedule: Schedule, args: argparse.Namespace, config: Config):
+    """Render charts; exports alone mean a headless run, so matplotlib is only imported when charts are drawn."""
+    charts = args.charts_dir is not None or args.combined_pdf is not None
+    if not charts and _exports_requested(args):
+        return
+    from src.visualizer import render_combined_pdf, render_groups, visualize_result_full
+
+    if args.charts_dir is not None:
+        paths = render_groups(schedule, config, args.charts_dir, args.chart_format, args.render_workers)
+        print(f"Wrote {len(paths)} charts to {args.charts_dir}")
+    if args.combined_pdf is not None:
+        print(f"Wrote {render_combined_pdf(schedule, config, args.combined_pdf)}")
+    if not charts:
+        for group in schedule.groups:
+            visualize_result_full(schedule, group, config)
+
+
+def _main_decomposed(args: argparse.Namespace, config: Config, subjects_per_group, teachers, metrics: RunMetrics):
+    from src.decompose import solve_decomposed
+
+    with metrics.stage("solve"):
+        result = solve_decomposed(subjects_per_group, teachers, config, engine=args.engine)
+    metrics.record(solve={"status": result.status, "objective": result.objective, "wall_time": result.wall_time},
+                   components=[{"groups": component.groups, "status": component.status,
+                                "objective": component.objective, "wall_time": component.wall_time}
+                               for component in result.components])
+    for component in result.components:
+        print(f"component {component.groups}: {component.status} objective={component.objective} "
+              f"after {component.wall_time:.2f}s")
+
+    if result.schedule is None:
+        print("No solution found")
+        return
+    print(f"{result.status}: objective={result.objective:g} over {len(result.components)} components "
+          f"after {result.wall_time:.2f}s")
+    with metrics.stage("export"):
+        save_solution(args.save_solution, result.schedule, subjects_per_group, teachers, config,
+                      result.objective or 0.0, result.wall_time)
+        _export(result.schedule, args, config)
+    with metrics.stage("render"):
+        _publish(result.schedule, args, config)
+
+
+def _publish_saved(args: argparse.Namespace, config: Config, subjects_per_group, teachers, metrics: RunMetrics):
+    """Export and render a schedule saved by an earlier run, without importing the solver."""
+    with metrics.stage("export"):
+        previous = load_solution(args.from_solution)
+        groups, subjects = touched_by_change(previous, subjects_per_group, teachers, config)
+        if groups or subjects:
+            print(f"Warning: {args.from_solution} predates changes to groups {sorted(groups) or 'none'} and "
+                  f"subjects {sorted(subjects) or 'none'}; solve again to update it")
+        metrics.record(solve={"status": "SAVED", "objective": previous["objective"],
+                              "wall_time": previous["wall_time"]})
+        _export(previous["schedule"], args, config)
+    with metrics.stage("render"):
+        _publish(previous["schedule"], args, config)
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics):
+    """The load -> check -> build -> solve -> publish pipeline, timing each stage into ``metrics``."""
     config = Config.load(args)
+    if args.clear_model_cache:
+        from src.model_cache import ModelCache
+
+        print(f"Removed {ModelCache(MODEL_CACHE).invalidate()} cached models")
+
+    data_source = args.data if args.data is not None else PROJECT_ROOT / "data"
+    cache_path = PROJECT_ROOT / ".cache" / "instance.json" if args.data_cache else None
+    with metrics.stage("load"):
+        teachers, subjects_per_group = load_data(data_source, cache_path=cache_path)
+        if args.availability:
+            config = replace(config, unavailable=load_availability(
+                data_source, config.start_hour, cache_path.with_name("availability.json") if cache_path else None))
+    metrics.record(instance={"data": str(data_source), "groups": len(subjects_per_group),
+                             "lessons": sum(len(subjects) for subjects in subjects_per_group.values()),
+                             "teachers": len(set(teachers.values())),
+                             "blocked": sum(len(entries) for calendars in config.unavailable.values()
+                                            for entries in calendars.values())},
+                   engine="decompose" if args.decompose else args.engine)
+
+    if args.from_solution is not None:
+        _publish_saved(args, config, subjects_per_group, teachers, metrics)
+        return
+
+    from ortools.sat.python import cp_model
+
+    from src.constraints import BuildReport
+    from src.engines import ENGINES
+    from src.feasibility import InfeasibleInstanceError, ensure_feasible, explain_infeasibility
+    from src.model_cache import ModelCache
+    from src.solver import ImprovingSolutionRecorder, make_solver
+    from src.telemetry import BoundTracker, model_size, solver_metrics, trajectory
+    from src.warm_start import apply_warm_start
 
-    model = cp_model.CpModel()
+    try:
+        with metrics.stage("feasibility"):
+            ensure_feasible(subjects_per_group, teachers, config)
+    except InfeasibleInstanceError as error:
+        metrics.record(solve={"status": "INFEASIBLE", "problems": error.problems})
+        print("Instance is infeasible:")
+        for problem in error.problems:
+            print(f"  - {problem}")
+        return
 
-    project_root = Path(__file__).resolve().parent.parent
-    teachers, subjects_per_group = load_data_from_excel(str(project_root / "data") + "/")
+    if args.decompose:
+        _main_decomposed(args, config, subjects_per_group, teachers, metrics)
+        return
 
-    subject_slots = add_subject_slots(model, subjects_per_group, config)
-    add_all_constraints(model, subject_slots, subjects_per_group, teachers, config)
-    minimize_slots_usage(model, subject_slots, subjects_per_group, config)
+    engine = ENGINES[args.engine]
+    report = BuildReport() if args.engine == "grid" else None
+    # --build-report needs the builders to run, so it bypasses the cache.
+    cache = ModelCache(MODEL_CACHE) if args.model_cache and report is not None and not args.build_report else None
+    with metrics.stage("build"):
+        model, subject_slots = _build(engine, cache, subjects_per_group, teachers, config, report, metrics)
+    metrics.record(model=model_size(model))
+    if report is not None and report.families:
+        metrics.record(build=report.to_dict())
+        if args.build_report:
+            print(report.format())
 
-    solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    warm_start = None
+    if args.warm_start is not None:
+        with metrics.stage("warm_start"):
+            previous = load_solution(args.warm_start)
+            warm_start = apply_warm_start(model, subject_slots, previous, subjects_per_group, teachers, config,
+                                          fix_untouched=args.fix_untouched)
+        print(f"Warm start: {len(warm_start.values)} hints, {warm_start.fixed} variables fixed, "
+              f"changed groups: {sorted(warm_start.touched_groups) or 'none'}")
+
+    solver = make_solver(config)
+    recorder = ImprovingSolutionRecorder(subject_slots, teachers, output_dir=args.solutions_dir,
+                                         extract=engine.extract)
+    bounds = BoundTracker()
+    bounds.attach(solver)
+    with metrics.stage("solve"):
+        status = solver.Solve(model, recorder)
+
+    if status == cp_model.INFEASIBLE and warm_start is not None and warm_start.fixed:
+        print("Fixed lessons leave no feasible schedule; retrying with hints only")
+        with metrics.stage("build"):
+            model, subject_slots = _build(engine, cache, subjects_per_group, teachers, config, None, metrics)
+            warm_start = apply_warm_start(model, subject_slots, previous, subjects_per_group, teachers, config)
+        recorder = ImprovingSolutionRecorder(subject_slots, teachers, output_dir=args.solutions_dir,
+                                             extract=engine.extract)
+        bounds = BoundTracker()
+        bounds.attach(solver)
+        with metrics.stage("solve"):
+            status = solver.Solve(model, recorder)
+    metrics.record(solve=solver_metrics(solver, status), trajectory=trajectory(recorder.records, bounds.bounds))
 
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        for group in subjects_per_group:
-            visualize_result_full(solver, subject_slots, subjects_per_group, teachers, group, config)
+        print(f"{solver.StatusName(status)}: objective={solver.ObjectiveValue():g} "
+              f"bound={solver.BestObjectiveBound():g} after {solver.WallTime():.2f}s")
+        with metrics.stage("export"):
+            schedule = engine.extract(subject_slots, solver.ResponseProto(), teachers)
+            save_solution(args.save_solution, schedule, subjects_per_group, teachers, config,
+                          solver.ObjectiveValue(), solver.WallTime())
+            _export(schedule, args, config)
+
+        if warm_start is not None:
+            hints = len(warm_start.values)
+            kept = warm_start.kept(subject_slots, solver.ResponseProto())
+            metrics.record(warm_start={"hints": hints, "fixed": warm_start.fixed, "kept": kept})
+            print(f"Warm start kept {kept}/{hints} hints ({kept / max(hints, 1):.1%})")
+            if args.compare_cold:
+                cold = _cold_solve_time(subjects_per_group, teachers, config)
+                print(f"Solve time: warm {solver.WallTime():.2f}s vs cold {cold:.2f}s")
+
+        with metrics.stage("render"):
+            _publish(schedule, args, config)
+    elif status == cp_model.INFEASIBLE:
+        with metrics.stage("explain"):
+            families = explain_infeasibility(subjects_per_group, teachers, config)
+        # The explanation always rebuilds the grid formulation, whichever engine ran.
+        formulation = "" if args.engine == "grid" else f" (explained on the grid model; {args.engine} engine ran)"
+        if families:
+            print(f"No solution found: these constraint families conflict{formulation}: {', '.join(families)}")
+        else:
+            print(f"No solution found: could not isolate a conflicting subset of constraint families within the "
+                  f"time limit{formulation}")
     else:
         print("No solution found")
 
 
+def main():
+    args = parse_args()
+    metrics = RunMetrics()
+    if args.profile:
+        with profiled(args.profile_top) as profile:
+            run(args, metrics)
+        metrics.record(profile=profile)
+    else:
+        run(args, metrics)
+
+    if args.metrics is not None:
+        print(f"Wrote metrics to {metrics.write(args.metrics)}")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+"""On-disk cache of built grid models, so reruns skip the Python constraint builders.
+
+Each entry is a directory named after ``model_key`` holding the CpModelProto in text format (the only
+form the ortools Python proto can be read back from) and the ``SlotStore`` arrays that map
+(group, subject, day, hour) onto proto variable indices.
+"""
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict
+from importlib.metadata import version
+from pathlib import Path
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.constraints import build_model
+from src.slots import SlotStore
+
+MODEL_CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+# Config fields that only affect solving or display, never the built model.
+NON_MODEL_FIELDS = ("start_hour", "subjects", "num_workers", "time_limit", "relative_gap", "absolute_gap")
+
+MODEL_FILE = "model.pbtxt"
+SLOTS_FILE = "slots.npz"
+
+
+def model_key(subjects_per_group, teachers_per_subject, config: Config) -> str:
+    """Hash of everything the built model depends on: instance, model-relevant config and ortools version."""
+    settings = {name: value for name, value in asdict(config).items() if name not in NON_MODEL_FIELDS}
+    payload = {
+        "version": MODEL_CACHE_VERSION,
+        "ortools": version("ortools"),
+        "subjects_per_group": subjects_per_group,
+        "teachers": teachers_per_subject,
+        "config": settings,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _entry_size(path: Path) -> int:
+    return sum(child.stat().st_size for child in path.iterdir())
+
+
+class ModelCache:
+    """Directory of built models keyed by ``model_key``, evicting least recently used entries past ``max_bytes``."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return [path for path in self.directory.iterdir() if path.is_dir() and not path.name.endswith(".tmp")]
+
+    def load(self, key: str):
+        """Return ``(model, SlotStore)`` for ``key``, or None when it is not cached or cannot be read."""
+        path = self.directory / key
+        try:
+            text = (path / MODEL_FILE).read_text()
+            with np.load(path / SLOTS_FILE, allow_pickle=False) as arrays:
+                slots = {name: arrays[name] for name in arrays.files}
+        except (OSError, ValueError, KeyError):
+            return None
+
+        model = cp_model.CpModel()
+        if not model.Proto().parse_text_format(text):
+            return None
+        store = SlotStore.from_model(model, slots["groups"].tolist(), slots["subjects"].tolist(), slots["index"],
+                                     slots["required"], slots["owner"], slots["offered"], slots["proto_indices"])
+        os.utime(path)  # mark as recently used for eviction
+        return model, store
+
+    def save(self, key: str, model, store: SlotStore) -> Path:
+        """Write one entry atomically, then evict old entries until the cache fits ``max_bytes``."""
+        path = self.directory / key
+        tmp_path = self.directory / f"{key}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        model.ExportToFile(str(tmp_path / MODEL_FILE))
+        np.savez(tmp_path / SLOTS_FILE, groups=np.array(store.groups), subjects=np.array(store.subjects),
+                 index=store.index, required=store.required, owner=store.owner, offered=store.offered,
+                 proto_indices=store.proto_indices())
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+        return path
+
+    def get_or_build(self, subjects_per_group, teachers_per_subject, config: Config, report=None):
+        """Load the model for this instance and config, building and caching it on a miss.
+
+        Returns ``(model, store, hit)``. ``report`` is only filled in when the model is built.
+        """
+        key = model_key(subjects_per_group, teachers_per_subject, config)
+        cached = self.load(key)
+        if cached is not None:
+            return *cached, True
+        model, store = build_model(subjects_per_group, teachers_per_subject, config, report)
+        self.save(key, model, store)
+        return model, store, False
+
+    def invalidate(self, key: str | None = None) -> int:
+        """Remove one entry, or every entry when ``key`` is None; returns how many were removed."""
+        paths = [self.directory / key] if key is not None else self._entries()
+        removed = 0
+        for path in paths:
+            if path.exists():
+                shutil.rmtree(path)
+                removed += 1
+        return removed
+
+    def size(self) -> int:
+        return sum(_entry_size(path) for path in self._entries())
+
+    def evict(self, keep: str | None = None) -> list[str]:
+        """Drop least recently used entries (never ``keep``) until the total size is within ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda path: path.stat().st_mtime)
+        sizes = {path: _entry_size(path) for path in entries}
+        total = sum(sizes.values())
+        evicted = []
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.name == keep:
+                continue
+            shutil.rmtree(path)
+            total -= sizes[path]
+            evicted.append(path.name)
+        return evicted
+
@@ -0,0 +1,172 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.availability import allowed_slots
+from src.config import Config
+from src.slots import SlotStore
+
+EMPTY = -1
+
+
+@dataclass
+class Schedule:
+    """A solved timetable as a dense group x day x hour array of subject ids (``EMPTY`` = free)."""
+
+    groups: list[str]
+    subjects: list[str]
+    teachers: list[str]
+    offered: np.ndarray
+    grid: np.ndarray
+
+    @property
+    def days(self) -> int:
+        return int(self.grid.shape[1])
+
+    @property
+    def hours(self) -> int:
+        return int(self.grid.shape[2])
+
+    def group_subjects(self, group: str) -> list[str]:
+        """Subjects the group takes, in model order."""
+        g = self.groups.index(group)
+        return [self.subjects[s] for s in np.flatnonzero(self.offered[g]).tolist()]
+
+    def lessons(self, group: str) -> Iterator[tuple[int, int, str, str]]:
+        """Yield (day, hour, subject, teacher) for each occupied slot of a group."""
+        g = self.groups.index(group)
+        grid = self.grid[g]
+        for day, hour in np.argwhere(grid != EMPTY).tolist():
+            s = int(grid[day, hour])
+            yield day, hour, self.subjects[s], self.teachers[s]
+
+    def hours_per_subject(self) -> np.ndarray:
+        """Scheduled hours per (group, subject)."""
+        counts = np.zeros((len(self.groups), len(self.subjects)), dtype=np.int64)
+        g, _, _ = np.nonzero(self.grid != EMPTY)
+        np.add.at(counts, (g, self.grid[self.grid != EMPTY]), 1)
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "groups": self.groups,
+            "subjects": self.subjects,
+            "teachers": self.teachers,
+            "offered": self.offered.tolist(),
+            "grid": self.grid.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Schedule":
+        return cls(
+            groups=list(data["groups"]),
+            subjects=list(data["subjects"]),
+            teachers=list(data["teachers"]),
+            offered=np.asarray(data["offered"], dtype=bool),
+            grid=np.asarray(data["grid"], dtype=np.int16),
+        )
+
+
+def extract_schedule(store: SlotStore, response, teachers_per_subject) -> Schedule:
+    """Read every slot variable from a CP-SAT response in one vectorized pass.
+
+    ``response`` is anything with a ``solution`` vector indexed by model variable, i.e. the
+    solver's ``ResponseProto()`` or a solution callback's ``Response()``.
+    """
+    solution = np.asarray(response.solution, dtype=np.int8)
+    values = solution[store.proto_indices()]
+
+    index = store.index
+    active = (index >= 0) & (values[index] == 1)
+    grid = np.where(active.any(axis=1), active.argmax(axis=1), EMPTY).astype(np.int16)
+
+    return Schedule(
+        groups=list(store.groups),
+        subjects=list(store.subjects),
+        teachers=[teachers_per_subject.get(subject, "Unknown") for subject in store.subjects],
+        offered=store.present(),
+        grid=grid,
+    )
+
+
+def merge_schedules(schedules: list[Schedule], groups: list[str] | None = None) -> Schedule:
+    """Combine schedules over disjoint groups into one, remapping subject ids to a shared list."""
+    subjects: list[str] = []
+    teachers: list[str] = []
+    subject_index: dict[str, int] = {}
+    for part in schedules:
+        for subject, teacher in zip(part.subjects, part.teachers):
+            if subject not in subject_index:
+                subject_index[subject] = len(subjects)
+                subjects.append(subject)
+                teachers.append(teacher)
+
+    rows: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for part in schedules:
+        remap = np.array([subject_index[subject] for subject in part.subjects], dtype=np.int16)
+        for g, group in enumerate(part.groups):
+            offered = np.zeros(len(subjects), dtype=bool)
+            offered[remap[part.offered[g]]] = True
+            grid = part.grid[g]
+            rows[group] = offered, np.where(grid == EMPTY, EMPTY, remap[np.maximum(grid, 0)]).astype(np.int16)
+
+    order = groups if groups is not None else list(rows)
+    return Schedule(
+        groups=order,
+        subjects=subjects,
+        teachers=teachers,
+        offered=np.array([rows[group][0] for group in order]),
+        grid=np.array([rows[group][1] for group in order]),
+    )
+
+
+def validate_schedule(schedule: Schedule, subjects_per_group, config: Config) -> list[str]:
+    """Return a message for every hard rule the schedule breaks; empty when it is valid."""
+    problems = []
+    hours = schedule.hours_per_subject()
+    subject_index = {subject: s for s, subject in enumerate(schedule.subjects)}
+
+    for g, group in enumerate(schedule.groups):
+        for subject, min_hours in subjects_per_group.get(group, {}).items():
+            got = hours[g, subject_index[subject]] if subject in subject_index else 0
+            if got < min_hours:
+                problems.append(f"{group}: {subject} has {got} hours, needs {min_hours}")
+
+        grid = schedule.grid[g]
+        for day in range(schedule.days):
+            taught = grid[day][grid[day] != EMPTY]
+            if len(taught) > config.max_subjects_per_day:
+                problems.append(f"{group}: {len(taught)} classes on day {day}")
+            if len(np.unique(taught)) < len(taught):
+                problems.append(f"{group}: a subject repeats on day {day}")
+
+    common = {subject_index[s] for s in config.common_subjects if s in subject_index}
+    for s in common:
+        taking = schedule.offered[:, s]
+        placements = schedule.grid[taking] == s
+        if len(placements) and not (placements == placements[0]).all():
+            problems.append(f"common subject {schedule.subjects[s]} is not aligned across groups")
+
+    for day in range(schedule.days):
+        for hour in range(schedule.hours):
+            busy: dict[str, set] = {}
+            for g, s in enumerate(schedule.grid[:, day, hour].tolist()):
+                if s == EMPTY or schedule.teachers[s] == "Unknown":
+                    continue
+                busy.setdefault(schedule.teachers[s], set()).add(s if s in common else (g, s))
+            for teacher, lessons in busy.items():
+                if len(lessons) > 1:
+                    problems.append(f"{teacher} double-booked at day {day}, hour {hour}")
+
+    if config.unavailable:
+        allowed: dict[tuple[str, str], np.ndarray | None] = {}
+        for group in schedule.groups:
+            for day, hour, subject, teacher in schedule.lessons(group):
+                if (group, subject) not in allowed:
+                    allowed[group, subject] = allowed_slots(config, [group], subject, teacher)
+                mask = allowed[group, subject]
+                if mask is not None and not mask[day, hour]:
+                    problems.append(f"{group}: {subject} at day {day}, hour {hour} is in a blocked slot")
+
+    return problems
@@ -0,0 +1,358 @@
+"""Long-running local scheduling service: a job queue in front of a bounded process pool.
+
+Example::
+
+    python -m src.service --port 8765 --workers 2
+
+Clients connect over TCP and send one JSON request per connection; the service answers with one JSON
+object per line and closes the connection when the request is served::
+
+    {"op": "submit", "subjects_per_group": {...}, "teachers": {...}, "config": {"days": 10},
+     "engine": "grid", "timeout": 60, "watch": true}
+    {"op": "watch", "job": "<id>"}      # replay the job's events so far, then follow it to the end
+    {"op": "status", "job": "<id>"}
+    {"op": "cancel", "job": "<id>"}
+
+``subjects_per_group`` and ``teachers`` have the shape ``load_data_from_excel`` returns and ``config``
+holds ``Config`` fields. A submission identical to a queued or running job joins that job; one identical
+to a finished job is answered from the result cache. Events are ``queued``, ``running``, ``solution``
+(every improving schedule), ``bound`` and a final ``done``, ``cancelled``, ``timeout`` or ``failed``.
+A job's ``timeout`` counts from when it starts running; cancelled and timed-out jobs keep the best
+schedule found so far.
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.engines import ENGINES
+from src.feasibility import check_feasibility
+from src.solver import ImprovingSolutionRecorder, make_solver, split_cores
+
+DEFAULT_PORT = 8765
+TERMINAL = ("done", "cancelled", "timeout", "failed")
+# How often a pool worker checks whether its job was cancelled or timed out.
+STOP_POLL_SECONDS = 0.05
+# Largest reply line accepted; solution events carry a whole schedule.
+LINE_LIMIT = 64 * 2**20
+
+
+def instance_key(subjects_per_group, teachers_per_subject, config: Config, engine: str) -> str:
+    """Hash identifying a submission; identical submissions share one job and one cached result."""
+    payload = {
+        "subjects_per_group": subjects_per_group,
+        "teachers": teachers_per_subject,
+        "config": asdict(config),
+        "engine": engine,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class _StreamingRecorder(ImprovingSolutionRecorder):
+    """Push every improving solution onto a cross-process event queue."""
+
+    def __init__(self, store, teachers_per_subject, extract, events):
+        super().__init__(store, teachers_per_subject, verbose=False, extract=extract)
+        self.events = events
+
+    def on_solution_callback(self):
+        found = len(self.records)
+        super().on_solution_callback()
+        if len(self.records) > found and self.schedule is not None:
+            record = self.records[-1]
+            self.events.put({"type": "solution", "objective": record.objective, "bound": record.bound,
+                             "time": record.wall_time, "schedule": self.schedule.to_dict()})
+
+
+def _stop_when_set(stop, solver, finished: threading.Event) -> None:
+    while not finished.is_set():
+        if stop.wait(STOP_POLL_SECONDS):
+            solver.StopSearch()
+            return
+
+
+def solve_job(subjects_per_group, teachers_per_subject, config: Config, engine: str, events, stop) -> dict:
+    """Pool worker: solve one submission, streaming events until it finishes or ``stop`` is set.
+
+    Always ends the event stream with a ``None`` sentinel.
+    """
+    try:
+        problems = check_feasibility(subjects_per_group, teachers_per_subject, config)
+        if problems:
+            return {"status": "INFEASIBLE", "objective": None, "bound": None, "wall_time": 0.0,
+                    "schedule": None, "problems": problems}
+
+        model, store = ENGINES[engine].build(subjects_per_group, teachers_per_subject, config)
+        solver = make_solver(config)
+        recorder = _StreamingRecorder(store, teachers_per_subject, ENGINES[engine].extract, events)
+        solver.best_bound_callback = lambda bound: events.put({"type": "bound", "bound": bound})
+
+        finished = threading.Event()
+        watcher = threading.Thread(target=_stop_when_set, args=(stop, solver, finished), daemon=True)
+        watcher.start()
+        try:
+            status = solver.Solve(model, recorder)
+        finally:
+            finished.set()
+            watcher.join()
+
+        solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        return {
+            "status": solver.StatusName(status),
+            "objective": solver.ObjectiveValue() if solved else None,
+            "bound": solver.BestObjectiveBound() if solved else None,
+            "wall_time": solver.WallTime(),
+            "schedule": recorder.schedule.to_dict() if solved and recorder.schedule is not None else None,
+            "problems": [],
+        }
+    finally:
+        events.put(None)
+
+
+@dataclass
+class Job:
+    id: str
+    key: str
+    payload: tuple
+    timeout: float | None = None
+    status: str = "queued"
+    cached: bool = False
+    result: dict | None = None
+    history: list[dict] = field(default_factory=list)
+    stop: Any = None
+    cancel_requested: bool = False
+    _changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    def summary(self) -> dict:
+        summary = {"job": self.id, "status": self.status, "cached": self.cached}
+        if self.status in TERMINAL:
+            summary["result"] = self.result
+        return summary
+
+    async def publish(self, event: dict) -> None:
+        self.history.append(event)
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def events(self) -> AsyncIterator[dict]:
+        """Every event so far, then new ones as they arrive, ending with the terminal event."""
+        seen = 0
+        while True:
+            while seen < len(self.history):
+                seen += 1
+                yield self.history[seen - 1]
+            if self.status in TERMINAL:
+                return
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.history) > seen)
+
+
+class SchedulerService:
+    """Queue submissions, solve them ``workers`` at a time and cache finished results."""
+
+    def __init__(self, workers: int = 2, cache_size: int = 128):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.jobs: dict[str, Job] = {}
+        self.results: OrderedDict[str, dict] = OrderedDict()
+        self._active: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] = asyncio.Queue()
+        self._dispatchers: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> "SchedulerService":
+        # Spawned rather than forked: pool workers start lazily, and a forked worker would inherit open
+        # client sockets and keep those connections from closing.
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        for job in self._active.values():
+            if job.stop is not None:
+                job.stop.set()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        # Waiting for running solves to stop happens off the loop, so connected clients keep being served.
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._pool.shutdown, wait=True, cancel_futures=True))
+        await loop.run_in_executor(None, self._manager.shutdown)
+
+    async def submit(self, subjects_per_group, teachers_per_subject, config: Config, engine: str = "grid",
+                     timeout: float | None = None) -> Job:
+        """Queue a submission, or return the queued/running or cached job for an identical one."""
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(sorted(ENGINES))}")
+        key = instance_key(subjects_per_group, teachers_per_subject, config, engine)
+        if key in self._active:
+            return self._active[key]
+
+        job = Job(uuid.uuid4().hex, key, (subjects_per_group, teachers_per_subject, config, engine), timeout)
+        self.jobs[job.id] = job
+        if key in self.results:
+            self.results.move_to_end(key)
+            job.cached = True
+            await self._finish(job, "done", self.results[key])
+            return job
+
+        self._active[key] = job
+        await job.publish({"type": "queued"})
+        self._queue.put_nowait(job)
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job outright or stop a running one; False if it already finished."""
+        job = self.jobs[job_id]
+        if job.status == "queued":
+            await self._finish(job, "cancelled", None)
+            return True
+        if job.status == "running":
+            job.cancel_requested = True
+            job.stop.set()
+            return True
+        return False
+
+    async def _dispatch(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.status == "queued":  # skip jobs cancelled while waiting
+                await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        events, job.stop = self._manager.Queue(), self._manager.Event()
+        job.status = "running"
+        await job.publish({"type": "running"})
+
+        subjects_per_group, teachers_per_subject, config, engine = job.payload
+        config = split_cores(config, self.workers)
+        future = loop.run_in_executor(self._pool, solve_job, subjects_per_group, teachers_per_subject, config,
+                                      engine, events, job.stop)
+        forward = asyncio.create_task(self._forward(job, events))
+        timed_out = False
+        try:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), job.timeout)
+            except TimeoutError:
+                timed_out = True
+                job.stop.set()
+                result = await future
+        except asyncio.CancelledError:
+            job.stop.set()
+            forward.cancel()
+            raise
+        except Exception as error:  # the solve itself failed; report it on the job
+            events.put(None)
+            await forward
+            await self._finish(job, "failed", {"error": f"{type(error).__name__}: {error}"})
+            return
+
+        await forward
+        status = "cancelled" if job.cancel_requested else "timeout" if timed_out else "done"
+        await self._finish(job, status, result)
+
+    async def _forward(self, job: Job, events) -> None:
+        loop = asyncio.get_running_loop()
+        while (event := await loop.run_in_executor(None, events.get)) is not None:
+            await job.publish(event)
+
+    async def _finish(self, job: Job, status: str, result: dict | None) -> None:
+        job.status, job.result = status, result
+        if self._active.get(job.key) is job:
+            del self._active[job.key]
+        if status == "done" and not job.cached and result is not None:
+            self.results[job.key] = result
+            while len(self.results) > self.cache_size:
+                self.results.popitem(last=False)
+        await job.publish({"type": status, "result": result})
+
+    async def handle(self, request: dict) -> AsyncIterator[dict]:
+        """Serve one protocol request, yielding the reply lines."""
+        op = request.get("op")
+        if op == "submit":
+            job = await self.submit(request["subjects_per_group"], request["teachers"],
+                                    Config(**request.get("config", {})), request.get("engine", "grid"),
+                                    request.get("timeout"))
+            yield job.summary()
+            if request.get("watch"):
+                async for event in job.events():
+                    yield {"job": job.id, **event}
+        elif op == "watch":
+            job = self.jobs[request["job"]]
+            async for event in job.events():
+                yield {"job": job.id, **event}
+        elif op == "status":
+            yield self.jobs[request["job"]].summary()
+        elif op == "cancel":
+            yield {"job": request["job"], "cancelled": await self.cancel(request["job"])}
+        else:
+            raise ValueError(f"Unknown op {op!r}")
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                async for reply in self.handle(json.loads(await reader.readline())):
+                    writer.write(json.dumps(reply).encode() + b"\n")
+                    await writer.drain()
+            except (ValueError, KeyError, TypeError) as error:
+                writer.write(json.dumps({"error": f"{type(error).__name__}: {error}"}).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass  # the client went away; its job keeps running
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.Server:
+        return await asyncio.start_server(self._serve_connection, host, port, limit=LINE_LIMIT)
+
+
+async def call(request: dict, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> AsyncIterator[dict]:
+    """Send one request to a running service and yield its reply lines."""
+    reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+    try:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        while line := await reader.readline():
+            yield json.loads(line)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _serve_forever(host: str, port: int, workers: int, cache_size: int) -> None:
+    async with SchedulerService(workers, cache_size) as service:
+        server = await service.serve(host, port)
+        print(f"Scheduling service listening on {host}:{port} with {workers} workers", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local scheduling service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=2, help="solves run at once (default: 2)")
+    parser.add_argument("--cache-size", type=int, default=128, help="finished results kept for reuse (default: 128)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve_forever(args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from collections.abc import Iterator, Mapping
+
+import numpy as np
+
+
+class SlotStore:
+    """Dense (group, subject, day, hour) index over the model's slot variables.
+
+    ``index[g, s, d, h]`` holds a position in ``variables`` or -1 when group ``g`` does not take
+    subject ``s`` or the slot is blocked by an availability calendar. Groups sharing a common subject
+    point at the same positions.
+    """
+
+    def __init__(self, groups, subjects, days: int, hours: int):
+        self.groups: list[str] = list(groups)
+        self.subjects: list[str] = list(subjects)
+        self.group_index = {group: i for i, group in enumerate(self.groups)}
+        self.subject_index = {subject: i for i, subject in enumerate(self.subjects)}
+        self.days = days
+        self.hours = hours
+        self.index = np.full((len(self.groups), len(self.subjects), days, hours), -1, dtype=np.int32)
+        self.variables: list = []
+        # Minimum hours each (group, subject) row must receive; 0 where the group does not take it.
+        self.required = np.zeros((len(self.groups), len(self.subjects)), dtype=np.int32)
+        # True for the one row per distinct set of variables, so shared rows are constrained once.
+        self.owner = np.zeros((len(self.groups), len(self.subjects)), dtype=bool)
+        # True where the group takes the subject, even if every slot of the row is blocked.
+        self.offered = np.zeros((len(self.groups), len(self.subjects)), dtype=bool)
+        self._proto_indices: np.ndarray | None = None
+
+    @classmethod
+    def from_model(cls, model, groups, subjects, index: np.ndarray, required: np.ndarray, owner: np.ndarray,
+                   offered: np.ndarray, proto_indices: np.ndarray) -> "SlotStore":
+        """Rebuild a store over an existing model, with ``proto_indices`` giving each position's variable."""
+        _, _, days, hours = index.shape
+        store = cls(groups, subjects, days, hours)
+        store.index = index.astype(np.int32)
+        store.required = required.astype(np.int32)
+        store.owner = owner.astype(bool)
+        store.offered = offered.astype(bool)
+        store.variables = [model.GetBoolVarFromProtoIndex(i) for i in proto_indices.tolist()]
+        store._proto_indices = proto_indices.astype(np.int64)
+        return store
+
+    def add_row(self, model, group: int, subject: int, prefix: str, allowed: np.ndarray | None = None) -> np.ndarray:
+        """Create a fresh day x hour block of variables for one (group, subject) row.
+
+        With an ``allowed`` (days, hours) mask, only allowed slots get a variable; the rest stay -1.
+        """
+        start = len(self.variables)
+        if allowed is None:
+            self.variables.extend(
+                model.NewBoolVar(f'{prefix}_{day}_{hour}') for day in range(self.days) for hour in range(self.hours)
+            )
+            block = np.arange(start, len(self.variables), dtype=np.int32).reshape(self.days, self.hours)
+        else:
+            slots = np.argwhere(allowed).tolist()
+            self.variables.extend(model.NewBoolVar(f'{prefix}_{day}_{hour}') for day, hour in slots)
+            block = np.full((self.days, self.hours), -1, dtype=np.int32)
+            block[allowed] = np.arange(start, len(self.variables), dtype=np.int32)
+        self.index[group, subject] = block
+        self.owner[group, subject] = True
+        self.offered[group, subject] = True
+        return block
+
+    def share_row(self, group: int, subject: int, block: np.ndarray) -> None:
+        """Point a (group, subject) row at variables created for another group."""
+        self.index[group, subject] = block
+        self.offered[group, subject] = True
+
+    def vars_at(self, positions: np.ndarray) -> list:
+        """Variables at the given positions, skipping missing (-1) entries."""
+        variables = self.variables
+        return [variables[i] for i in positions.ravel().tolist() if i >= 0]
+
+    def row(self, group: int, subject: int) -> np.ndarray:
+        """Positions for every day and hour of one (group, subject) row, shaped (days, hours)."""
+        return self.index[group, subject, :, :]
+
+    def slot(self, group: int, day: int, hour: int) -> np.ndarray:
+        """Positions of all subjects a group could have at (day, hour)."""
+        return self.index[group, :, day, hour]
+
+    def rows(self) -> Iterator[tuple[int, int]]:
+        """Yield (group, subject) index pairs once per distinct set of variables."""
+        for group, subject in np.argwhere(self.owner).tolist():
+            yield group, subject
+
+    def present(self) -> np.ndarray:
+        """Boolean (groups, subjects) mask of the rows each group takes."""
+        return self.offered.copy()
+
+    def proto_indices(self) -> np.ndarray:
+        """Model (proto) index of each entry in ``variables``, for reading solution vectors."""
+        if self._proto_indices is None or len(self._proto_indices) != len(self.variables):
+            self._proto_indices = np.fromiter((var.Index() for var in self.variables), dtype=np.int64,
+                                              count=len(self.variables))
+        return self._proto_indices
+
+    def usage_counts(self) -> np.ndarray:
+        """How many (group, subject, day, hour) entries refer to each variable."""
+        used = self.index[self.index >= 0]
+        return np.bincount(used, minlength=len(self.variables))
+
+    def __getitem__(self, group: str) -> "GroupSlots":
+        return GroupSlots(self, self.group_index[group])
+
+    def __contains__(self, group: object) -> bool:
+        return group in self.group_index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.groups)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+
+class GroupSlots(Mapping):
+    """Read-only ``(subject, day, hour) -> variable`` view of one group's row in a ``SlotStore``."""
+
+    def __init__(self, store: SlotStore, group: int):
+        self._store = store
+        self._group = group
+
+    def _position(self, key) -> int:
+        subject, day, hour = key
+        s = self._store.subject_index.get(subject)
+        if s is None or not (0 <= day < self._store.days and 0 <= hour < self._store.hours):
+            return -1
+        return int(self._store.index[self._group, s, day, hour])
+
+    def __getitem__(self, key):
+        position = self._position(key)
+        if position < 0:
+            raise KeyError(key)
+        return self._store.variables[position]
+
+    def __contains__(self, key) -> bool:
+        return self._position(key) >= 0
+
+    def __iter__(self):
+        store = self._store
+        for s, d, h in np.argwhere(store.index[self._group] >= 0).tolist():
+            yield store.subjects[s], d, h
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._store.index[self._group] >= 0))
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.schedule import Schedule, extract_schedule
+
+
+def make_solver(config: Config) -> cp_model.CpSolver:
+    """Create a CP-SAT solver configured from the worker, time and gap limits in ``config``."""
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = config.num_workers
+    if config.time_limit is not None:
+        solver.parameters.max_time_in_seconds = config.time_limit
+    if config.relative_gap is not None:
+        solver.parameters.relative_gap_limit = config.relative_gap
+    if config.absolute_gap is not None:
+        solver.parameters.absolute_gap_limit = config.absolute_gap
+    return solver
+
+
+def split_cores(config: Config, workers: int) -> Config:
+    """``config`` for one of ``workers`` concurrent solves.
+
+    With ``num_workers=0`` every CP-SAT model would claim all cores, so the cores are shared between the
+    pool instead. An explicit worker count is left alone.
+    """
+    if config.num_workers != 0:
+        return config
+    return replace(config, num_workers=max(1, (os.cpu_count() or 1) // workers))
+
+
+@dataclass
+class SolutionRecord:
+    index: int
+    objective: float
+    bound: float
+    wall_time: float
+    timestamp: float
+    path: Path | None = None
+
+
+class ImprovingSolutionRecorder(cp_model.CpSolverSolutionCallback):
+    """Record every improving solution and optionally write it to ``output_dir`` as it arrives."""
+
+    def __init__(self, subject_slots, teachers_per_subject, output_dir: Path | None = None, verbose: bool = True,
+                 extract=extract_schedule):
+        super().__init__()
+        self.subject_slots = subject_slots
+        self.extract = extract
+        self.teachers_per_subject = teachers_per_subject
+        self.output_dir = output_dir
+        self.verbose = verbose
+        self.records: list[SolutionRecord] = []
+        self.schedule: Schedule | None = None
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue()
+        if self.records and objective >= self.records[-1].objective:
+            return
+
+        record = SolutionRecord(
+            index=len(self.records) + 1,
+            objective=objective,
+            bound=self.BestObjectiveBound(),
+            wall_time=self.WallTime(),
+            timestamp=time.time(),
+        )
+        self.schedule = self.extract(self.subject_slots, self.Response(), self.teachers_per_subject)
+        if self.output_dir is not None:
+            record.path = self._write(record, self.schedule)
+        self.records.append(record)
+
+        if self.verbose:
+            print(f"solution #{record.index}: objective={record.objective:g} bound={record.bound:g} "
+                  f"t={record.wall_time:.2f}s")
+
+    def _write(self, record: SolutionRecord, schedule: Schedule) -> Path:
+        assert self.output_dir is not None
+        payload = {
+            "objective": record.objective,
+            "bound": record.bound,
+            "wall_time": record.wall_time,
+            "timestamp": record.timestamp,
+            "schedule": schedule.to_dict(),
+        }
+        text = json.dumps(payload)
+        path = self.output_dir / f"solution_{record.index:04d}.json"
+        path.write_text(text)
+
+        # Swap the "best" pointer atomically so readers never see a half-written file.
+        tmp_path = self.output_dir / "best.json.tmp"
+        tmp_path.write_text(text)
+        os.replace(tmp_path, self.output_dir / "best.json")
+        return path
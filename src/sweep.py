@@ -0,0 +1,186 @@
+"""Solve the same instance under many configurations and compare the outcomes.
+
+Example::
+
+    python -m src.sweep --days 9 10 --hours-per-day 7 8 --max-subjects-per-day 5 6 --time-limit 30
+    python -m src.sweep --scenarios what_if.json --output sweep.json
+
+The data is loaded once and shipped to each pool worker once; every scenario is a set of ``Config``
+overrides that is built and solved in its own worker with its own time limit. Rows are printed as
+scenarios finish.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.data_loader import load_availability, load_data
+from src.engines import ENGINES
+from src.feasibility import check_feasibility
+from src.schedule import EMPTY
+from src.solver import make_solver, split_cores
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SWEEP_FIELDS = ("days", "hours_per_day", "max_subjects_per_day")
+
+
+@dataclass
+class ScenarioResult:
+    overrides: dict
+    status: str
+    objective: float | None
+    bound: float | None
+    solve_time: float
+    elapsed: float
+    # Scheduled lessons over all group slots (groups x days x hours_per_day).
+    utilisation: float | None
+    problems: list[str]
+
+    @property
+    def feasible(self) -> bool:
+        return self.status in ("OPTIMAL", "FEASIBLE")
+
+    @property
+    def label(self) -> str:
+        return " ".join(f"{name}={value}" for name, value in self.overrides.items()) or "base"
+
+
+def scenario_grid(**values: list) -> list[dict]:
+    """Cartesian product of the given ``Config`` field values, e.g. ``scenario_grid(days=[9, 10])``."""
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def _check_overrides(scenarios: list[dict]) -> None:
+    known = {field.name for field in fields(Config)}
+    for overrides in scenarios:
+        unknown = set(overrides) - known
+        if unknown:
+            raise ValueError(f"Unknown Config fields in scenario {overrides}: {', '.join(sorted(unknown))}")
+
+
+_instance: tuple[dict, dict] | None = None
+
+
+def _init_worker(subjects_per_group, teachers_per_subject) -> None:
+    global _instance
+    _instance = (subjects_per_group, teachers_per_subject)
+
+
+def solve_scenario(overrides: dict, base: Config, engine: str = "grid",
+                   instance: tuple[dict, dict] | None = None) -> ScenarioResult:
+    """Build and solve one scenario; ``instance`` defaults to the data shipped to this pool worker."""
+    start = time.perf_counter()
+    instance = instance or _instance
+    assert instance is not None, "solve_scenario needs an instance outside a sweep worker"
+    subjects_per_group, teachers_per_subject = instance
+    config = replace(base, **overrides)
+
+    problems = check_feasibility(subjects_per_group, teachers_per_subject, config)
+    if problems:
+        return ScenarioResult(overrides, "INFEASIBLE", None, None, 0.0, time.perf_counter() - start, None, problems)
+
+    model, store = ENGINES[engine].build(subjects_per_group, teachers_per_subject, config)
+    solver = make_solver(config)
+    status = solver.Solve(model)
+
+    utilisation = objective = bound = None
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        objective, bound = solver.ObjectiveValue(), solver.BestObjectiveBound()
+        schedule = ENGINES[engine].extract(store, solver.ResponseProto(), teachers_per_subject)
+        utilisation = float(np.mean(schedule.grid != EMPTY))
+    return ScenarioResult(overrides, solver.StatusName(status), objective, bound, solver.WallTime(),
+                          time.perf_counter() - start, utilisation, [])
+
+
+def sweep(subjects_per_group, teachers_per_subject, base: Config, scenarios: list[dict],
+          workers: int | None = None, engine: str = "grid") -> Iterator[ScenarioResult]:
+    """Solve every scenario across a process pool, yielding results in completion order."""
+    _check_overrides(scenarios)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(scenarios)))
+    base = split_cores(base, workers)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(subjects_per_group, teachers_per_subject)) as pool:
+        futures = [pool.submit(solve_scenario, overrides, base, engine) for overrides in scenarios]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+HEADER = f"{'scenario':<48} {'status':<11} {'objective':>9} {'bound':>7} {'solve s':>8} {'util':>6}"
+
+
+def format_row(result: ScenarioResult) -> str:
+    def number(value, spec, width):
+        return f"{format(value, spec) if value is not None else '-':>{width}}"
+
+    row = (f"{result.label:<48} {result.status:<11} {number(result.objective, 'g', 9)} "
+           f"{number(result.bound, 'g', 7)} {result.solve_time:>8.2f} {number(result.utilisation, '.1%', 6)}")
+    if result.problems:
+        row += f"  ({result.problems[0]}{' ...' if len(result.problems) > 1 else ''})"
+    return row
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare schedules across configuration scenarios")
+    parser.add_argument("--data", type=Path, default=None,
+                        help="data directory (Excel or CSV) or instance .json file (default: ./data)")
+    parser.add_argument("--days", type=int, nargs="+", default=[10], help="day counts to try (default: 10)")
+    parser.add_argument("--hours-per-day", type=int, nargs="+", default=[7], help="hours per day to try (default: 7)")
+    parser.add_argument("--max-subjects-per-day", type=int, nargs="+", default=[6],
+                        help="daily subject limits to try (default: 6)")
+    parser.add_argument("--scenarios", type=Path, default=None,
+                        help="JSON list of Config overrides to solve instead of the --days/--hours grid")
+    parser.add_argument("--start-hour", type=int, default=9)
+    parser.add_argument("--no-alias-common-subjects", dest="alias_common_subjects", action="store_false")
+    parser.add_argument("--no-prune-constraints", dest="prune_redundant_constraints", action="store_false")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="grid")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="per-scenario solve limit in seconds")
+    parser.add_argument("--relative-gap", type=float, default=None)
+    parser.add_argument("--absolute-gap", type=float, default=None)
+    parser.add_argument("--num-workers", type=int, default=None,
+                        help="CP-SAT workers per scenario (default: cores split across the pool)")
+    parser.add_argument("--workers", type=int, default=None, help="scenarios solved at once (default: one per core)")
+    parser.add_argument("--output", type=Path, default=None, help="write all results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # The first value of each swept field stands in for the base config; every scenario overrides it.
+    base = Config.load(argparse.Namespace(**{**vars(args), **{name: getattr(args, name)[0] for name in SWEEP_FIELDS}}))
+    if args.scenarios is not None:
+        scenarios = json.loads(args.scenarios.read_text())
+    else:
+        scenarios = scenario_grid(**{name: getattr(args, name) for name in SWEEP_FIELDS})
+
+    data_source = args.data if args.data is not None else PROJECT_ROOT / "data"
+    teachers, subjects_per_group = load_data(data_source, cache_path=PROJECT_ROOT / ".cache" / "instance.json")
+    base = replace(base, unavailable=load_availability(data_source, base.start_hour,
+                                                       cache_path=PROJECT_ROOT / ".cache" / "availability.json"))
+
+    print(HEADER, flush=True)
+    results = []
+    for result in sweep(subjects_per_group, teachers, base, scenarios, args.workers, args.engine):
+        print(format_row(result), flush=True)
+        results.append(result)
+
+    if args.output is not None:
+        order = [json.dumps(overrides, sort_keys=True) for overrides in scenarios]
+        results.sort(key=lambda result: order.index(json.dumps(result.overrides, sort_keys=True)))
+        args.output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Structured metrics for one scheduler run and an optional cProfile/tracemalloc wrapper.
+
+``RunMetrics`` collects stage timings and solver statistics into a single JSON record, so runs can
+be compared across data releases. ``profiled`` wraps any part of the pipeline and reports where time
+and Python allocations went.
+"""
+import cProfile
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from importlib.metadata import version
+from pathlib import Path
+
+# Counters copied from the CP-SAT response; num_booleans/num_integers describe the presolved model.
+RESPONSE_FIELDS = (
+    "num_booleans",
+    "num_integers",
+    "num_fixed_booleans",
+    "num_branches",
+    "num_conflicts",
+    "num_binary_propagations",
+    "num_integer_propagations",
+    "num_restarts",
+    "num_lp_iterations",
+    "deterministic_time",
+    "gap_integral",
+)
+
+
+@dataclass
+class RunMetrics:
+    """Stage timings plus any other values recorded during a run, serialised as one JSON object."""
+
+    stages: dict[str, float] = field(default_factory=dict)
+    values: dict = field(default_factory=dict)
+    started: float = field(default_factory=time.time)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage in wall-clock seconds; repeated stages accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, **values) -> None:
+        self.values.update(values)
+
+    def to_dict(self) -> dict:
+        return {
+            "timestamp": self.started,
+            "python": platform.python_version(),
+            "ortools": version("ortools"),
+            "stages": self.stages,
+            **self.values,
+        }
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
+
+
+def model_size(model) -> dict:
+    proto = model.Proto()
+    return {"variables": len(proto.variables), "constraints": len(proto.constraints)}
+
+
+def solver_metrics(solver, status) -> dict:
+    """Status, objective and search statistics of a finished CP-SAT solve."""
+    response = solver.ResponseProto()
+    status_name = solver.StatusName(status)
+    solved = status_name in ("OPTIMAL", "FEASIBLE")
+    return {
+        "status": status_name,
+        "objective": solver.ObjectiveValue() if solved else None,
+        "bound": solver.BestObjectiveBound() if solved else None,
+        "wall_time": solver.WallTime(),
+        "user_time": solver.UserTime(),
+        **{name: getattr(response, name) for name in RESPONSE_FIELDS},
+        "response_stats": solver.ResponseStats(),
+    }
+
+
+class BoundTracker:
+    """Record every best-bound improvement reported by a solver, timed from ``attach``."""
+
+    def __init__(self) -> None:
+        self.bounds: list[tuple[float, float]] = []
+        self._start = 0.0
+
+    def attach(self, solver) -> None:
+        self._start = time.perf_counter()
+        solver.best_bound_callback = self._on_bound
+
+    def _on_bound(self, bound: float) -> None:
+        self.bounds.append((time.perf_counter() - self._start, bound))
+
+
+def trajectory(records, bounds: list[tuple[float, float]]) -> list[dict]:
+    """Merge improving solutions and bound updates into one time-ordered list of events."""
+    events = [{"time": record.wall_time, "objective": record.objective, "bound": record.bound}
+              for record in records]
+    events += [{"time": at, "bound": bound} for at, bound in bounds]
+    return sorted(events, key=lambda event: event["time"])
+
+
+def _hotspots(profiler: cProfile.Profile, top: int) -> list[dict]:
+    functions = pstats.Stats(profiler).get_stats_profile().func_profiles
+    busiest = sorted(functions.items(), key=lambda item: item[1].tottime, reverse=True)[:top]
+    return [
+        {"function": f"{profile.file_name}:{profile.line_number}({name})", "calls": profile.ncalls,
+         "self": profile.tottime, "cumulative": profile.cumtime}
+        for name, profile in busiest
+    ]
+
+
+def _allocations(snapshot: tracemalloc.Snapshot, top: int) -> list[dict]:
+    return [
+        {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "kib": stat.size / 1024,
+         "blocks": stat.count}
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def format_profile(profile: dict) -> str:
+    lines = [f"{'self s':>8} {'cum s':>8} {'calls':>9}  function"]
+    lines += [f"{row['self']:>8.3f} {row['cumulative']:>8.3f} {row['calls']:>9}  {row['function']}"
+              for row in profile["hotspots"]]
+    lines.append(f"\n{'KiB':>10} {'blocks':>8}  allocation site (peak traced {profile['peak_traced_mib']:.1f} MiB)")
+    lines += [f"{row['kib']:>10.1f} {row['blocks']:>8}  {row['site']}" for row in profile["allocations"]]
+    return "\n".join(lines)
+
+
+@contextmanager
+def profiled(top: int = 20, out=None):
+    """Run the body under cProfile and tracemalloc, then print and fill in the top hotspots.
+
+    Yields a dict that holds ``hotspots``, ``allocations`` and ``peak_traced_mib`` once the
+    block exits. Time spent inside CP-SAT shows up as one native call; its memory is not traced.
+    """
+    profile: dict = {}
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        profile.update(
+            hotspots=_hotspots(profiler, top),
+            allocations=_allocations(snapshot, top),
+            peak_traced_mib=peak / 2**20,
+        )
+        print(format_profile(profile), file=out or sys.stdout)
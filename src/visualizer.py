@@ -1,73 +1,122 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 
 from src.config import Config
+from src.schedule import Schedule
 
+FIGSIZE = (15, 8)
 
-def visualize_result(solver, subject_slots, subjects_per_group, teachers_per_subject, group_name, config: Config):
-    """Render a simple schedule chart for a single group."""
-    fig, ax = plt.subplots(figsize=(15, 8))
-    cmap = plt.colormaps["tab20"]
+
+def _scheduled_slots(schedule: Schedule, group_name: str) -> dict[str, list[tuple[int, int]]]:
+    """Group a single group's occupied slots by subject, keeping the group's subject order."""
+    slots: dict[str, list[tuple[int, int]]] = {subject: [] for subject in schedule.group_subjects(group_name)}
+    for day, hour, subject, _ in schedule.lessons(group_name):
+        slots[subject].append((day, hour))
+    return slots
+
+
+def _draw_full(ax, schedule: Schedule, group_name, config: Config):
+    """Draw the two-week chart with weekend gaps for one group onto ``ax``."""
+    cmap = matplotlib.colormaps["tab20"]
     colors = cmap.colors  # type: ignore[attr-defined]
 
-    for i, subject in enumerate(subjects_per_group[group_name]):
-        teacher = teachers_per_subject.get(subject, "Unknown")
-        label_text = f"{subject} ({teacher})"
+    weekdays_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun", "Mon", "Tue", "Wed", "Thu", "Fri"]
+    days_with_weekends = list(range(12))
 
-        scheduled_slots = [
-            (day, hour)
-            for day in range(config.days)
-            for hour in range(config.hours_per_day)
-            if solver.Value(subject_slots[group_name][(subject, day, hour)]) == 1
-        ]
+    for i, (subject, scheduled_slots) in enumerate(_scheduled_slots(schedule, group_name).items()):
+        teacher = schedule.teachers[schedule.subjects.index(subject)]
+        label_text = f"{subject} ({teacher})"
 
         for slot in scheduled_slots:
             day, hour = slot
-            ax.broken_barh([(day, 1)], (config.start_hour + hour, 1),
+            plot_day = day + (day // 5) * 2  # offset to skip weekends
+            ax.broken_barh([(plot_day, 1)], (config.start_hour + hour, 1),
                            facecolors=colors[i % len(colors)],
                            label=label_text if slot == scheduled_slots[0] else "")
 
-    ax.set_xlabel('Days')
-    ax.set_ylabel('Hours')
-    ax.set_xticks(range(0, config.days))
+    ax.set_title(group_name)
+    ax.set_xlabel('Day of the week')
+    ax.set_ylabel('Time')
+    ax.set_xticks(range(len(days_with_weekends)))
+    ax.set_xticklabels(weekdays_labels)
     ax.set_yticks(range(config.start_hour, config.start_hour + config.hours_per_day))
+    ax.set_yticklabels([f"{hour}:00" for hour in range(config.start_hour, config.start_hour + config.hours_per_day)])
     ax.grid(True)
     ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1), title='Subjects (Teacher)')
-    plt.show()
 
 
-def visualize_result_full(solver, subject_slots, subjects_per_group, teachers_per_subject, group_name, config: Config):
-    """Render a two-week schedule chart with weekends gaps for a single group."""
-    fig, ax = plt.subplots(figsize=(15, 8))
+def visualize_result(schedule: Schedule, group_name, config: Config):
+    """Render a simple schedule chart for a single group."""
+    fig, ax = plt.subplots(figsize=FIGSIZE)
     cmap = plt.colormaps["tab20"]
     colors = cmap.colors  # type: ignore[attr-defined]
 
-    weekdays_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun", "Mon", "Tue", "Wed", "Thu", "Fri"]
-    days_with_weekends = list(range(12))
-
-    for i, subject in enumerate(subjects_per_group[group_name]):
-        teacher = teachers_per_subject.get(subject, "Unknown")
+    for i, (subject, scheduled_slots) in enumerate(_scheduled_slots(schedule, group_name).items()):
+        teacher = schedule.teachers[schedule.subjects.index(subject)]
         label_text = f"{subject} ({teacher})"
 
-        scheduled_slots = [
-            (day, hour)
-            for day in range(config.days)
-            for hour in range(config.hours_per_day)
-            if solver.Value(subject_slots[group_name][(subject, day, hour)]) == 1
-        ]
-
         for slot in scheduled_slots:
             day, hour = slot
-            plot_day = day + (day // 5) * 2  # offset to skip weekends
-            ax.broken_barh([(plot_day, 1)], (config.start_hour + hour, 1),
+            ax.broken_barh([(day, 1)], (config.start_hour + hour, 1),
                            facecolors=colors[i % len(colors)],
                            label=label_text if slot == scheduled_slots[0] else "")
 
-    ax.set_xlabel('Day of the week')
-    ax.set_ylabel('Time')
-    ax.set_xticks(range(len(days_with_weekends)))
-    ax.set_xticklabels(weekdays_labels)
+    ax.set_xlabel('Days')
+    ax.set_ylabel('Hours')
+    ax.set_xticks(range(0, config.days))
     ax.set_yticks(range(config.start_hour, config.start_hour + config.hours_per_day))
-    ax.set_yticklabels([f"{hour}:00" for hour in range(config.start_hour, config.start_hour + config.hours_per_day)])
     ax.grid(True)
     ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1), title='Subjects (Teacher)')
     plt.show()
+
+
+def visualize_result_full(schedule: Schedule, group_name, config: Config):
+    """Render a two-week schedule chart with weekends gaps for a single group."""
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    _draw_full(ax, schedule, group_name, config)
+    plt.show()
+
+
+def _render_chunk(schedule: Schedule, groups: list[str], config: Config, output_dir: Path, fmt: str) -> list[Path]:
+    """Save charts for ``groups`` reusing one off-screen figure, so memory stays flat per worker."""
+    fig = Figure(figsize=FIGSIZE)
+    paths = []
+    for group in groups:
+        fig.clear()
+        _draw_full(fig.subplots(), schedule, group, config)
+        path = output_dir / f"{group}.{fmt}"
+        fig.savefig(path, format=fmt, bbox_inches="tight")
+        paths.append(path)
+    return paths
+
+
+def render_groups(schedule: Schedule, config: Config, output_dir: Path, fmt: str = "png",
+                  workers: int | None = None) -> list[Path]:
+    """Write every group's chart to ``output_dir/<group>.<fmt>`` without a display, fanning out over processes."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(schedule.groups)) or 1
+    if workers == 1:
+        return _render_chunk(schedule, schedule.groups, config, output_dir, fmt)
+
+    chunks = [schedule.groups[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_chunk, schedule, chunk, config, output_dir, fmt) for chunk in chunks]
+        return [path for future in futures for path in future.result()]
+
+
+def render_combined_pdf(schedule: Schedule, config: Config, path: Path) -> Path:
+    """Write all group charts as pages of a single PDF in one pass."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig = Figure(figsize=FIGSIZE)
+    with PdfPages(path) as pdf:
+        for group in schedule.groups:
+            fig.clear()
+            _draw_full(fig.subplots(), schedule, group, config)
+            pdf.savefig(fig, bbox_inches="tight")
+    return path
@@ -0,0 +1,149 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.config import Config
+from src.schedule import Schedule
+from src.slots import SlotStore
+
+# The Config fields a saved schedule depends on; solver settings such as workers or limits are left out.
+INSTANCE_FIELDS = ("days", "hours_per_day", "max_subjects_per_day", "common_subjects", "unavailable")
+
+
+def _instance_config(config: Config) -> dict:
+    # Round-trip through JSON so tuples and lists compare equal to what load_solution reads back.
+    snapshot: dict = json.loads(json.dumps({name: getattr(config, name) for name in INSTANCE_FIELDS}))
+    return snapshot
+
+
+def save_solution(path: Path, schedule: Schedule, subjects_per_group, teachers_per_subject, config: Config,
+                  objective: float, wall_time: float) -> None:
+    """Persist a solved schedule together with the instance and calendars it was solved for."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "schedule": schedule.to_dict(),
+        "subjects_per_group": subjects_per_group,
+        "teachers": teachers_per_subject,
+        "config": _instance_config(config),
+        "objective": objective,
+        "wall_time": wall_time,
+    }
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(payload))
+    os.replace(tmp_path, path)
+
+
+def load_solution(path: Path) -> dict:
+    """Load a file written by ``save_solution``; ``"schedule"`` is returned as a ``Schedule``."""
+    data: dict = json.loads(path.read_text())
+    data["schedule"] = Schedule.from_dict(data["schedule"])
+    return data
+
+
+def touched_by_change(previous: dict, subjects_per_group, teachers_per_subject,
+                      config: Config) -> tuple[set[str], set[str]]:
+    """Groups and subjects whose data or calendars differ between the previous instance and the current one.
+
+    A different grid size or daily limit touches everything, as does a file saved without its config.
+    """
+    old_groups = previous["subjects_per_group"]
+    old_teachers = previous["teachers"]
+    old_config = previous.get("config")
+    new_config = _instance_config(config)
+    if old_config is None or any(old_config[name] != new_config[name]
+                                 for name in ("days", "hours_per_day", "max_subjects_per_day")):
+        return set(old_groups) | set(subjects_per_group), {
+            subject for subjects in (*old_groups.values(), *subjects_per_group.values()) for subject in subjects}
+
+    groups: set[str] = set()
+    subjects: set[str] = set(old_config["common_subjects"]) ^ set(new_config["common_subjects"])
+
+    for group in set(old_groups) | set(subjects_per_group):
+        old, new = old_groups.get(group, {}), subjects_per_group.get(group, {})
+        if old != new:
+            groups.add(group)
+            subjects.update(subject for subject in set(old) | set(new) if old.get(subject) != new.get(subject))
+
+    subjects.update(
+        subject for subject in set(old_teachers) | set(teachers_per_subject)
+        if old_teachers.get(subject) != teachers_per_subject.get(subject)
+    )
+
+    old_calendars, new_calendars = old_config["unavailable"], new_config["unavailable"]
+    for kind in set(old_calendars) | set(new_calendars):
+        old, new = old_calendars.get(kind, {}), new_calendars.get(kind, {})
+        changed = {name for name in set(old) | set(new) if old.get(name) != new.get(name)}
+        if kind == "group":
+            groups.update(changed)
+        elif kind == "subject":
+            subjects.update(changed)
+        elif kind == "teacher":
+            subjects.update(subject for teachers in (old_teachers, teachers_per_subject)
+                            for subject, teacher in teachers.items() if teacher in changed)
+    return groups, subjects
+
+
+@dataclass
+class WarmStart:
+    positions: np.ndarray
+    values: np.ndarray
+    fixed: int
+    touched_groups: set[str]
+    touched_subjects: set[str]
+
+    def kept(self, store: SlotStore, response) -> int:
+        """How many hints the final solution in ``response`` agrees with."""
+        solution = np.asarray(response.solution, dtype=np.int8)
+        final = solution[store.proto_indices()[self.positions]]
+        return int(np.count_nonzero(final == self.values))
+
+
+def apply_warm_start(model, store: SlotStore, previous: dict, subjects_per_group, teachers_per_subject,
+                     config: Config, fix_untouched: bool = False) -> WarmStart:
+    """Hint the slot variables with a previous solution and optionally fix rows no change touched.
+
+    Rows are matched by group and subject name, so added or removed groups and subjects simply
+    get no hint. A fixed row keeps exactly the previous placement of that lesson.
+    """
+    old: Schedule = previous["schedule"]
+    old_groups = {group: g for g, group in enumerate(old.groups)}
+    old_subjects = {subject: s for s, subject in enumerate(old.subjects)}
+    touched_groups, touched_subjects = touched_by_change(previous, subjects_per_group, teachers_per_subject, config)
+    days, hours = min(store.days, old.days), min(store.hours, old.hours)
+
+    present = store.present()
+    positions, values = [], []
+    fixed = 0
+    for g, s in store.rows():
+        group, subject = store.groups[g], store.subjects[s]
+        old_g, old_s = old_groups.get(group), old_subjects.get(subject)
+        if old_g is None or old_s is None or not old.offered[old_g, old_s]:
+            continue
+
+        previous_row = np.zeros((store.days, store.hours), dtype=np.int8)
+        previous_row[:days, :hours] = old.grid[old_g, :days, :hours] == old_s
+        row = store.row(g, s)
+        available = row >= 0  # slots blocked by an availability calendar have no variable
+        positions.append(row[available])
+        values.append(previous_row[available])
+
+        # A common subject is one lesson for every group taking it, whether its rows are aliased or tied
+        # by equality constraints, so fixing it for one group fixes it for all of them.
+        if subject in config.common_subjects:
+            sharing = [store.groups[i] for i in np.flatnonzero(present[:, s]).tolist()]
+        else:
+            sharing = [group]
+        if fix_untouched and subject not in touched_subjects and not touched_groups.intersection(sharing):
+            for var, value in zip(store.vars_at(row), previous_row[available].tolist()):
+                model.Add(var == value)
+            fixed += int(np.count_nonzero(available))
+
+    all_positions = np.concatenate(positions) if positions else np.zeros(0, dtype=np.int32)
+    all_values = np.concatenate(values) if values else np.zeros(0, dtype=np.int8)
+    for var, value in zip(store.vars_at(all_positions), all_values.tolist()):
+        model.AddHint(var, value)
+
+    return WarmStart(all_positions, all_values, fixed, touched_groups, touched_subjects)
@@ -0,0 +1,23 @@
+import pytest
+
+from src.config import Config
+
+
+@pytest.fixture
+def schedule():
+    """Two groups sharing the common Math lessons, with one teacher covering Physics and Chemistry."""
+    return {
+        "group1": {"Math": 2, "Physics": 1},
+        "group2": {"Math": 2, "Chemistry": 2},
+    }
+
+
+@pytest.fixture
+def teachers():
+    return {"Math": "Teacher A", "Physics": "Teacher B", "Chemistry": "Teacher B"}
+
+
+@pytest.fixture
+def config():
+    return Config(days=5, start_hour=9, hours_per_day=4, max_subjects_per_day=3, common_subjects=["Math"],
+                  num_workers=1, time_limit=10.0)
@@ -0,0 +1,64 @@
+import copy
+
+from benchmarks.generator import InstanceSpec, generate_instance, write_instance_excel
+from benchmarks.run import compare, run_case
+from src.data_loader import load_data_from_excel
+
+
+class TestGenerateInstance:
+    def test_shape_follows_spec(self):
+        spec = InstanceSpec(groups=6, subjects_per_group=5, common_ratio=0.4, teachers=3)
+        teachers, subjects_per_group, config = generate_instance(spec)
+
+        assert len(subjects_per_group) == 6
+        assert all(len(subjects) == 5 for subjects in subjects_per_group.values())
+        assert len(config.common_subjects) == 2
+        for subjects in subjects_per_group.values():
+            assert set(config.common_subjects) <= set(subjects)
+        assert set(teachers) == set(config.subjects)
+        assert len(set(teachers.values())) == 3
+
+    def test_is_deterministic_per_seed(self):
+        spec = InstanceSpec(groups=3)
+
+        assert generate_instance(spec)[1] == generate_instance(spec)[1]
+
+    def test_round_trips_through_excel_loader(self, tmp_path):
+        teachers, subjects_per_group, _ = generate_instance(InstanceSpec(groups=2))
+        write_instance_excel(teachers, subjects_per_group, tmp_path)
+
+        assert load_data_from_excel(str(tmp_path) + "/") == (teachers, subjects_per_group)
+
+
+class TestRunCase:
+    def test_reports_metrics(self):
+        result = run_case(InstanceSpec(groups=2), time_limit=10.0, num_workers=1)
+
+        assert result["status"] == "OPTIMAL"
+        assert result["variables"] > 0 and result["constraints"] > 0
+        assert result["build_time"] >= 0 and result["solve_time"] >= 0
+
+
+class TestCompare:
+    @staticmethod
+    def _report(**metrics):
+        result = {"label": "g4", "status": "OPTIMAL", "objective": 10.0, "load_time": 0.1, "build_time": 1.0,
+                  "solve_time": 2.0, "peak_rss_mb": 100.0, "variables": 500, "constraints": 900}
+        result.update(metrics)
+        return {"results": [result]}
+
+    def test_identical_runs_do_not_regress(self):
+        report = self._report()
+
+        assert compare(report, copy.deepcopy(report), tolerance=0.25) == []
+
+    def test_flags_slowdown_and_growth(self):
+        regressions = compare(self._report(build_time=5.0, variables=501), self._report(), tolerance=0.25)
+
+        assert any("build_time" in line for line in regressions)
+        assert any("variables" in line for line in regressions)
+
+    def test_flags_status_change(self):
+        regressions = compare(self._report(status="FEASIBLE"), self._report(), tolerance=0.25)
+
+        assert any("status" in line for line in regressions)
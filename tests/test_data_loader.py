@@ -1,6 +1,12 @@
+import csv
+import shutil
+from pathlib import Path
+
+import pandas as pd
 import pytest
 
-from src.data_loader import load_data_from_excel
+from src import data_loader
+from src.data_loader import load_availability, load_data, load_data_from_excel, save_data_to_json
 
 
 class TestLoadDataFromExcel:
@@ -38,3 +44,108 @@ class TestLoadDataFromExcel:
 
         with pytest.raises((ValueError, Exception)):
             load_data_from_excel(str(tmp_path) + "/")
+
+
+@pytest.fixture
+def data_copy(tmp_path):
+    """A writable copy of the shipped data directory."""
+    shutil.copytree("data", tmp_path / "data")
+    return str(tmp_path / "data") + "/"
+
+
+class TestSnapshotCache:
+    def test_matches_uncached_load(self, data_copy, tmp_path):
+        cache_path = tmp_path / "cache.json"
+
+        first = load_data_from_excel(data_copy, cache_path=cache_path)
+        second = load_data_from_excel(data_copy, cache_path=cache_path)
+
+        assert cache_path.exists()
+        assert first == second == load_data_from_excel(data_copy)
+
+    def test_unchanged_files_are_not_parsed_again(self, data_copy, tmp_path, monkeypatch):
+        cache_path = tmp_path / "cache.json"
+        load_data_from_excel(data_copy, cache_path=cache_path)
+
+        def fail(path):
+            raise AssertionError(f"{path} was parsed again")
+
+        monkeypatch.setattr(data_loader, "_read_group_excel", fail)
+        monkeypatch.setattr(data_loader, "_read_teachers_excel", fail)
+
+        load_data_from_excel(data_copy, cache_path=cache_path)
+
+    def test_only_changed_file_is_parsed_again(self, data_copy, tmp_path, monkeypatch):
+        cache_path = tmp_path / "cache.json"
+        load_data_from_excel(data_copy, cache_path=cache_path)
+
+        changed = Path(data_copy) / "groups" / "group1_schedule.xlsx"
+        pd.DataFrame({"Subject": ["English"], "Min_Hours": [5]}).to_excel(changed, index=False)
+        parsed = []
+        original = data_loader._read_group_excel
+        monkeypatch.setattr(data_loader, "_read_group_excel", lambda path: parsed.append(path) or original(path))
+
+        _, subjects_per_group = load_data_from_excel(data_copy, cache_path=cache_path)
+
+        assert parsed == [changed]
+        assert subjects_per_group["group1_schedule"] == {"English": 5}
+
+    def test_parallel_load_matches_serial(self, data_copy):
+        assert load_data_from_excel(data_copy, workers=2) == load_data_from_excel(data_copy, workers=1)
+
+
+class TestPandasFreeInputs:
+    def test_csv_matches_excel(self, data_copy, tmp_path):
+        teachers, subjects_per_group = load_data_from_excel(data_copy)
+        csv_dir = tmp_path / "csv"
+        (csv_dir / "groups").mkdir(parents=True)
+        for group, subjects in subjects_per_group.items():
+            with open(csv_dir / "groups" / f"{group}.csv", "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["Subject", "Min_Hours"])
+                writer.writerows(subjects.items())
+        with open(csv_dir / "Teachers.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Subject", "Teacher"])
+            writer.writerows(teachers.items())
+
+        assert load_data(csv_dir) == (teachers, subjects_per_group)
+
+    def test_json_round_trip(self, data_copy, tmp_path):
+        teachers, subjects_per_group = load_data_from_excel(data_copy)
+        save_data_to_json(teachers, subjects_per_group, tmp_path / "instance.json")
+
+        assert load_data(tmp_path / "instance.json") == (teachers, subjects_per_group)
+
+
+class TestLoadAvailability:
+    ROWS = [["teacher", "Teacher A", 0, 9], ["teacher", "Teacher A", 3, None], ["group", "group1_schedule", 1, 10],
+            ["Subject", "English", 2, None]]
+    EXPECTED = {"teacher": {"Teacher A": [[0, 0], [3]]}, "group": {"group1_schedule": [[1, 1]]},
+                "subject": {"English": [[2]]}}
+
+    def test_csv(self, data_copy):
+        with open(Path(data_copy) / "Availability.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Type", "Name", "Day", "Hour"])
+            writer.writerows([["" if value is None else value for value in row] for row in self.ROWS])
+
+        assert load_availability(data_copy, start_hour=9) == self.EXPECTED
+
+    def test_excel_is_cached(self, data_copy, tmp_path, monkeypatch):
+        pd.DataFrame(self.ROWS, columns=["Type", "Name", "Day", "Hour"]).to_excel(
+            Path(data_copy) / "Availability.xlsx", index=False)
+        cache_path = tmp_path / "availability.json"
+
+        assert load_availability(data_copy, start_hour=9, cache_path=cache_path) == self.EXPECTED
+        monkeypatch.setattr(data_loader, "_read_availability_excel", lambda path: pytest.fail(f"{path} parsed again"))
+        assert load_availability(data_copy, start_hour=9, cache_path=cache_path) == self.EXPECTED
+
+    def test_missing_file_means_no_calendars(self, data_copy):
+        assert load_availability(data_copy) == {}
+
+    def test_unknown_type_is_rejected(self, data_copy):
+        (Path(data_copy) / "Availability.csv").write_text("Type,Name,Day,Hour\nroom,Lab 1,0,9\n")
+
+        with pytest.raises(ValueError, match="unknown availability type 'room'"):
+            load_availability(data_copy)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from src.constraints import build_model
+from src.decompose import coupling_components, solve_decomposed
+from src.schedule import EMPTY, Schedule, merge_schedules, validate_schedule
+from src.solver import make_solver
+
+
+@pytest.fixture
+def schedule_data(schedule):
+    """The shared two-group instance plus three more groups in two independent components."""
+    return {
+        **schedule,
+        "group3": {"History": 2, "Art": 1},
+        "group4": {"Music": 2, "Drawing": 2},
+        "group5": {"Dance": 1, "Singing": 2},
+    }
+
+
+@pytest.fixture
+def teachers(teachers):
+    return {
+        **teachers, "History": "Teacher D", "Art": "Teacher E", "Music": "Teacher F", "Drawing": "Teacher G",
+        "Dance": "Teacher F", "Singing": "Teacher H",
+    }
+
+
+class TestCouplingComponents:
+    def test_links_common_subjects_and_shared_teachers(self, schedule_data, teachers, config):
+        components = coupling_components(schedule_data, teachers, config)
+
+        assert sorted(map(sorted, components)) == [["group1", "group2"], ["group3"], ["group4", "group5"]]
+
+    def test_everything_common_is_one_component(self, schedule_data, teachers, config):
+        config.common_subjects = ["Math", "History", "Music", "Dance"]
+        schedule_data["group3"]["Math"] = 2
+
+        assert len(coupling_components(schedule_data, teachers, config)) == 2
+
+
+class TestSolveDecomposed:
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_matches_monolithic_objective(self, schedule_data, teachers, config, workers):
+        model, _ = build_model(schedule_data, teachers, config)
+        solver = make_solver(config)
+        solver.Solve(model)
+
+        result = solve_decomposed(schedule_data, teachers, config, workers=workers)
+
+        assert result.status == "OPTIMAL"
+        assert len(result.components) == 3
+        assert result.objective == solver.ObjectiveValue()
+        assert result.schedule is not None
+        assert result.schedule.groups == list(schedule_data)
+        assert validate_schedule(result.schedule, schedule_data, config) == []
+
+    def test_infeasible_component_fails_the_whole_run(self, schedule_data, teachers, config):
+        schedule_data["group3"]["History"] = config.days + 1
+
+        result = solve_decomposed(schedule_data, teachers, config, workers=1)
+
+        assert result.status == "INFEASIBLE"
+        assert result.schedule is None
+
+
+class TestMergeSchedules:
+    def test_remaps_subject_ids(self):
+        first = Schedule(["g1"], ["Math"], ["A"], np.array([[True]]), np.array([[[0, EMPTY]]], dtype=np.int16))
+        second = Schedule(["g2"], ["Art", "Math"], ["B", "A"], np.array([[True, True]]),
+                          np.array([[[1, 0]]], dtype=np.int16))
+
+        merged = merge_schedules([first, second])
+
+        assert merged.subjects == ["Math", "Art"]
+        assert merged.grid.tolist() == [[[0, EMPTY]], [[0, 1]]]
+        assert merged.offered.tolist() == [[True, False], [True, True]]
@@ -0,0 +1,106 @@
+import csv
+import subprocess
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.export import COLUMNS, iter_rows, lesson_date, write_csv, write_ics, write_parquet
+from src.schedule import EMPTY, Schedule
+
+
+@pytest.fixture
+def export_config():
+    return Config(days=6, start_hour=9, hours_per_day=2, max_subjects_per_day=2, common_subjects=["Math"])
+
+
+@pytest.fixture
+def timetable(export_config):
+    grid = np.full((2, export_config.days, export_config.hours_per_day), EMPTY, dtype=np.int16)
+    grid[:, 0, 0] = 0  # common Math for both groups
+    grid[0, 5, 1] = 1
+    grid[1, 2, 1] = 2
+    return Schedule(groups=["group1", "group2"], subjects=["Math", "Physics", "Chemistry"],
+                    teachers=["Teacher A", "Teacher B", "Teacher B"], offered=np.ones((2, 3), dtype=bool), grid=grid)
+
+
+class TestRows:
+    def test_one_row_per_lesson_with_clock_hours(self, timetable, export_config):
+        assert list(iter_rows(timetable, export_config)) == [
+            ("group1", 0, 9, "Math", "Teacher A"),
+            ("group1", 5, 10, "Physics", "Teacher B"),
+            ("group2", 0, 9, "Math", "Teacher A"),
+            ("group2", 2, 10, "Chemistry", "Teacher B"),
+        ]
+
+    def test_csv(self, timetable, export_config, tmp_path):
+        path = write_csv(timetable, export_config, tmp_path / "out" / "timetable.csv")
+
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        assert tuple(rows[0]) == COLUMNS
+        assert rows[1:] == [[str(value) for value in row] for row in iter_rows(timetable, export_config)]
+
+    def test_parquet_matches_rows(self, timetable, export_config, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        path = write_parquet(timetable, export_config, tmp_path / "timetable.parquet", groups_per_batch=1)
+
+        table = pq.read_table(path)
+        assert table.column_names == list(COLUMNS)
+        columns = [table.column(name).to_pylist() for name in COLUMNS]
+        assert list(zip(*columns)) == list(iter_rows(timetable, export_config))
+
+    def test_does_not_import_matplotlib(self):
+        code = "import sys, src.export; print('matplotlib' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "False"
+
+
+class TestIcs:
+    def test_lesson_dates_skip_weekends(self):
+        monday = date(2026, 9, 7)
+
+        assert [lesson_date(monday, day) for day in (0, 4, 5, 9)] == [
+            date(2026, 9, 7), date(2026, 9, 11), date(2026, 9, 14), date(2026, 9, 18)]
+
+    def test_group_and_teacher_calendars(self, timetable, export_config, tmp_path):
+        paths = write_ics(timetable, export_config, tmp_path, date(2026, 9, 7))
+
+        assert sorted(path.relative_to(tmp_path).as_posix() for path in paths) == [
+            "groups/group1.ics", "groups/group2.ics", "teachers/Teacher_A.ics", "teachers/Teacher_B.ics"]
+        group1 = (tmp_path / "groups" / "group1.ics").read_bytes().decode()
+        assert group1.startswith("BEGIN:VCALENDAR\r\n") and group1.endswith("END:VCALENDAR\r\n")
+        assert group1.count("BEGIN:VEVENT") == 2
+        assert "DTSTART:20260907T090000\r\nDTEND:20260907T100000\r\nSUMMARY:Math\r\n" in group1
+        assert "DTSTART:20260914T100000" in group1
+
+        teacher_a = (tmp_path / "teachers" / "Teacher_A.ics").read_text()
+        assert teacher_a.count("BEGIN:VEVENT") == 1
+        assert "DESCRIPTION:group1\\, group2" in teacher_a
+        assert (tmp_path / "teachers" / "Teacher_B.ics").read_text().count("BEGIN:VEVENT") == 2
+
+    def test_colliding_names_get_separate_files(self, timetable, export_config, tmp_path):
+        timetable.teachers[2] = "Teacher_B"  # same file name as "Teacher B"
+
+        paths = write_ics(timetable, export_config, tmp_path, date(2026, 9, 7))
+
+        teachers = sorted(path.name for path in paths if path.parent.name == "teachers")
+        assert teachers == ["Teacher_A.ics", "Teacher_B-2.ics", "Teacher_B.ics"]
+        assert "SUMMARY:Physics" in (tmp_path / "teachers" / "Teacher_B.ics").read_text()
+        assert "SUMMARY:Chemistry" in (tmp_path / "teachers" / "Teacher_B-2.ics").read_text()
+
+    def test_long_lines_are_folded(self, timetable, export_config, tmp_path):
+        timetable.subjects[0] = "Mathematics " * 10
+        write_ics(timetable, export_config, tmp_path, date(2026, 9, 7))
+
+        lines = (tmp_path / "groups" / "group1.ics").read_bytes().split(b"\r\n")
+        assert max(len(line) for line in lines) <= 75
+        assert any(line.startswith(b" ") for line in lines)
+
+    def test_start_must_be_a_monday(self, timetable, export_config, tmp_path):
+        with pytest.raises(ValueError, match="not a Monday"):
+            write_ics(timetable, export_config, tmp_path, date(2026, 9, 8))
@@ -0,0 +1,95 @@
+from dataclasses import replace
+
+import pytest
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.constraints import build_model
+from src.feasibility import InfeasibleInstanceError, check_feasibility, ensure_feasible, explain_infeasibility
+
+
+@pytest.fixture
+def small_config():
+    return Config(days=3, start_hour=9, hours_per_day=4, max_subjects_per_day=3)
+
+
+class TestCheckFeasibility:
+    def test_feasible_instance_passes(self, small_config):
+        assert check_feasibility({"group1": {"Math": 2, "Physics": 2}}, {}, small_config) == []
+
+    def test_group_over_capacity(self, small_config):
+        problems = check_feasibility({"group1": {"Math": 3, "Physics": 2, "Art": 2}}, {}, small_config)
+
+        assert len(problems) == 1
+        assert problems[0].startswith("group1 needs 7 hours but has 3 days x 2 usable hours = 6")
+
+    def test_daily_limit_lowers_capacity(self):
+        config = Config(days=3, start_hour=9, hours_per_day=4, max_subjects_per_day=1)
+
+        assert check_feasibility({"group1": {"Math": 2, "Physics": 2}}, {}, config)
+
+    def test_subject_needs_more_days(self, small_config):
+        problems = check_feasibility({"group1": {"Math": 4}}, {}, small_config)
+
+        assert problems == ["group1: Math needs 4 hours but allows one lesson per day over 3 days"]
+
+    def test_common_subject_takes_largest_minimum(self, small_config):
+        small_config.common_subjects = ["Math"]
+        schedule = {"group1": {"Math": 3, "Physics": 3}, "group2": {"Math": 1, "Art": 3, "Music": 2}}
+
+        problems = check_feasibility(schedule, {}, small_config)
+
+        assert [problem.split(" needs")[0] for problem in problems] == ["group2"]
+
+    def test_teacher_overload(self, small_config):
+        schedule = {"group1": {"Math": 3}, "group2": {"Math": 3}, "group3": {"Physics": 1}}
+
+        problems = check_feasibility(schedule, {"Math": "Teacher A", "Physics": "Teacher A"}, small_config)
+
+        assert problems == ["Teacher A must teach 7 hours (Math, Physics) but only 6 slots are usable"]
+
+    def test_never_rejects_a_solvable_instance(self, small_config):
+        schedule = {"group1": {"Math": 3, "Physics": 3}, "group2": {"Math": 3, "Art": 3}}
+        teachers = {"Math": "Teacher A", "Physics": "Teacher B", "Art": "Teacher C"}
+        small_config.common_subjects = ["Math"]
+
+        model, _ = build_model(schedule, teachers, small_config)
+
+        assert cp_model.CpSolver().Solve(model) == cp_model.OPTIMAL
+        assert check_feasibility(schedule, teachers, small_config) == []
+
+    def test_ensure_feasible_raises(self, small_config):
+        with pytest.raises(InfeasibleInstanceError) as error:
+            ensure_feasible({"group1": {"Math": 4}}, {}, small_config)
+
+        assert len(error.value.problems) == 1
+
+    def test_calendars_reduce_capacity(self, small_config):
+        schedule = {"group1": {"Math": 2, "Physics": 2}}
+        teachers = {"Math": "Teacher A", "Physics": "Teacher A"}
+        group_days_off = replace(small_config, unavailable={"group": {"group1": [[0], [1, 1]]}})
+        teacher_mornings = replace(small_config, unavailable={"teacher": {"Teacher A": [[0, 0], [0, 1], [1, 0]]}})
+        math_days = replace(small_config, unavailable={"subject": {"Math": [[0], [1]]}})
+
+        assert check_feasibility(schedule, teachers, group_days_off) == [
+            "group1 needs 4 hours but its calendar leaves 3 usable hours"]
+        assert "only 3 slots are usable" in check_feasibility(schedule, teachers, teacher_mornings)[0]
+        assert check_feasibility(schedule, teachers, math_days) == [
+            "group1: Math needs 2 hours but the availability calendars leave 1 days with a usable slot"]
+
+
+class TestExplainInfeasibility:
+    def test_feasible_instance_has_no_conflict(self, small_config):
+        assert explain_infeasibility({"group1": {"Math": 2}}, {}, small_config) == []
+
+    def test_finds_minimal_conflicting_families(self):
+        # Passes every cheap check: Teacher T1 has exactly 4 usable slots for D and B, which leaves
+        # the shared lesson A no slot that is free in both groups.
+        config = Config(days=2, start_hour=9, hours_per_day=2, max_subjects_per_day=2, common_subjects=["A", "B"])
+        schedule = {"group1": {"D": 2, "A": 1}, "group2": {"A": 1, "B": 2}}
+        teachers = {"A": "T3", "B": "T1", "D": "T1"}
+        assert check_feasibility(schedule, teachers, config) == []
+
+        families = explain_infeasibility(schedule, teachers, config)
+
+        assert sorted(families) == ["minimum_hours", "single_class_per_slot", "teachers"]
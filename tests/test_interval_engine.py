@@ -0,0 +1,88 @@
+import pytest
+from ortools.sat.python import cp_model
+
+from benchmarks.generator import InstanceSpec, generate_instance
+from src.config import Config
+from src.engines import ENGINES
+from src.feasibility import check_feasibility
+from src.schedule import validate_schedule
+
+
+def _solve(engine, subjects_per_group, teachers, config):
+    model, store = ENGINES[engine].build(subjects_per_group, teachers, config)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 4
+    status = solver.Solve(model)
+    schedule = None
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        schedule = ENGINES[engine].extract(store, solver.ResponseProto(), teachers)
+    return solver.StatusName(status), solver.ObjectiveValue(), schedule
+
+
+class TestIntervalEngine:
+    @pytest.mark.parametrize("spec", [
+        InstanceSpec(groups=3, subjects_per_group=5, days=5, hours_per_day=4, seed=1),
+        InstanceSpec(groups=4, subjects_per_group=6, common_ratio=0.5, teachers=4, days=6, seed=2),
+        InstanceSpec(groups=2, subjects_per_group=4, common_ratio=0.0, days=4, hours_per_day=2, seed=3),
+    ])
+    def test_agrees_with_grid_engine(self, spec):
+        teachers, subjects_per_group, config = generate_instance(spec)
+
+        grid = _solve("grid", subjects_per_group, teachers, config)
+        interval = _solve("interval", subjects_per_group, teachers, config)
+
+        assert interval[0] == grid[0]
+        assert interval[1] == grid[1]
+        if interval[2] is not None:
+            assert validate_schedule(interval[2], subjects_per_group, config) == []
+
+    def test_daily_limit_binds(self):
+        config = Config(days=3, start_hour=9, hours_per_day=4, max_subjects_per_day=1)
+        subjects_per_group = {"group1": {"Math": 2, "Physics": 1}}
+
+        status, _, schedule = _solve("interval", subjects_per_group, {}, config)
+
+        assert status == "OPTIMAL"
+        assert validate_schedule(schedule, subjects_per_group, config) == []
+
+    def test_over_constrained_instance_is_infeasible(self):
+        config = Config(days=3, start_hour=9, hours_per_day=4, max_subjects_per_day=1)
+        subjects_per_group = {"group1": {"Math": 2, "Physics": 2}}
+
+        assert _solve("grid", subjects_per_group, {}, config)[0] == "INFEASIBLE"
+        assert _solve("interval", subjects_per_group, {}, config)[0] == "INFEASIBLE"
+
+    def test_lessons_never_start_after_the_gapless_hours(self):
+        config = Config(days=5, start_hour=9, hours_per_day=7, max_subjects_per_day=6)
+        subjects_per_group = {"group1": {"Math": 3, "Physics": 3, "Art": 3}}
+
+        _, _, schedule = _solve("interval", subjects_per_group, {}, config)
+
+        assert (schedule.grid[:, :, 2:] == -1).all()
+
+    @pytest.mark.parametrize("unavailable", [
+        {"teacher": {"Teacher A": [[0], [1, 0]]}, "group": {"group2": [[2, 1]]}},
+        {"subject": {"Math": [[0], [1], [2]]}},
+    ])
+    def test_respects_availability_like_the_grid_engine(self, unavailable):
+        config = Config(days=4, start_hour=9, hours_per_day=3, max_subjects_per_day=2, common_subjects=["Math"],
+                        unavailable=unavailable)
+        subjects_per_group = {"group1": {"Math": 2, "Physics": 2}, "group2": {"Math": 1, "Art": 2}}
+        teachers = {"Math": "Teacher A", "Physics": "Teacher A", "Art": "Teacher B"}
+
+        grid = _solve("grid", subjects_per_group, teachers, config)
+        interval = _solve("interval", subjects_per_group, teachers, config)
+
+        assert interval[:2] == grid[:2]
+        for _, _, schedule in (grid, interval):
+            if schedule is not None:
+                assert validate_schedule(schedule, subjects_per_group, config) == []
+
+    def test_lesson_with_no_allowed_slot_is_infeasible(self):
+        config = Config(days=2, start_hour=9, hours_per_day=3, max_subjects_per_day=2,
+                        unavailable={"subject": {"Math": [[0], [1]]}})
+        subjects_per_group = {"group1": {"Math": 1, "Physics": 1}}
+
+        assert _solve("interval", subjects_per_group, {}, config)[0] == "INFEASIBLE"
+        assert _solve("grid", subjects_per_group, {}, config)[0] == "INFEASIBLE"
+        assert any("Math" in problem for problem in check_feasibility(subjects_per_group, {}, config))
@@ -0,0 +1,96 @@
+import os
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from src.constraints import BuildReport
+from src.model_cache import MODEL_FILE, ModelCache, model_key
+from src.schedule import extract_schedule
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ModelCache(tmp_path / "models")
+
+
+def _solve(model, store, teachers):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    return solver.ObjectiveValue(), extract_schedule(store, solver.ResponseProto(), teachers)
+
+
+class TestModelKey:
+    def test_ignores_solver_settings(self, schedule, teachers, config):
+        tuned = replace(config, num_workers=8, time_limit=30.0, relative_gap=0.01, start_hour=8)
+
+        assert model_key(schedule, teachers, tuned) == model_key(schedule, teachers, config)
+
+    def test_changes_with_model_inputs(self, schedule, teachers, config):
+        key = model_key(schedule, teachers, config)
+
+        assert model_key(schedule, teachers, replace(config, days=6)) != key
+        assert model_key(schedule, {**teachers, "Physics": "Teacher C"}, config) != key
+        assert model_key({**schedule, "group3": {"Math": 2}}, teachers, config) != key
+
+
+class TestModelCache:
+    def test_reload_matches_fresh_build(self, cache, schedule, teachers, config):
+        report = BuildReport()
+        built, built_store, hit = cache.get_or_build(schedule, teachers, config, report)
+        loaded, loaded_store, reloaded = cache.get_or_build(schedule, teachers, config)
+
+        assert (hit, reloaded) == (False, True)
+        assert report.families
+        np.testing.assert_array_equal(loaded_store.index, built_store.index)
+        np.testing.assert_array_equal(loaded_store.proto_indices(), built_store.proto_indices())
+        assert loaded_store.groups == built_store.groups
+        assert len(loaded.Proto().constraints) == len(built.Proto().constraints)
+        fresh_objective, _ = _solve(built, built_store, teachers)
+        objective, schedule_from_cache = _solve(loaded, loaded_store, teachers)
+        assert objective == fresh_objective
+        hours = schedule_from_cache.hours_per_subject()[0]
+        assert {schedule_from_cache.subjects[s]: int(n) for s, n in enumerate(hours) if n} == {"Math": 2, "Physics": 1}
+
+    def test_loaded_model_accepts_new_constraints(self, cache, schedule, teachers, config):
+        cache.get_or_build(schedule, teachers, config)
+        model, store, _ = cache.get_or_build(schedule, teachers, config)
+
+        model.Add(store["group1"][("Math", 0, 0)] == 1)
+        model.AddHint(store["group2"][("Chemistry", 1, 0)], 1)
+
+        _, solved = _solve(model, store, teachers)
+        assert solved.grid[0, 0, 0] == solved.subjects.index("Math")
+
+    def test_unreadable_entry_is_rebuilt(self, cache, schedule, teachers, config):
+        cache.get_or_build(schedule, teachers, config)
+        key = model_key(schedule, teachers, config)
+        (cache.directory / key / MODEL_FILE).write_text("not a model")
+
+        assert cache.load(key) is None
+        assert cache.get_or_build(schedule, teachers, config)[2] is False
+
+    def test_invalidate(self, cache, schedule, teachers, config):
+        cache.get_or_build(schedule, teachers, config)
+        cache.get_or_build(schedule, teachers, replace(config, days=6))
+
+        assert cache.invalidate(model_key(schedule, teachers, config)) == 1
+        assert cache.load(model_key(schedule, teachers, config)) is None
+        assert cache.invalidate() == 1
+        assert cache.size() == 0
+
+    def test_evicts_least_recently_used(self, cache, schedule, teachers, config):
+        configs = [replace(config, days=days) for days in (5, 6, 7)]
+        for i, variant in enumerate(configs):
+            cache.get_or_build(schedule, teachers, variant)
+            path = cache.directory / model_key(schedule, teachers, variant)
+            os.utime(path, (1000 + i, 1000 + i))
+        cache.load(model_key(schedule, teachers, configs[0]))  # the oldest entry becomes the newest
+
+        cache.max_bytes = cache.size() - 1
+        evicted = cache.evict()
+
+        assert evicted == [model_key(schedule, teachers, configs[1])]
+        assert cache.size() <= cache.max_bytes
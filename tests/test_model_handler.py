@@ -1,18 +1,24 @@
+import numpy as np
 import pytest
 from ortools.sat.python import cp_model
 
 from src.config import Config
 from src.constraints import (
+    BuildReport,
+    add_all_constraints,
     add_max_subjects_per_day_constraints,
     add_minimum_hours_constraints,
     add_non_adjacent_repeats_constraints,
     add_single_class_per_slot_constraints,
     add_subject_slots,
+    add_teacher_constraints,
+    minimize_slots_usage,
+    redundant_families,
 )
 
 
 @pytest.fixture
-def config():
+def simple_config():
     return Config(days=10, start_hour=9, hours_per_day=7, max_subjects_per_day=6)
 
 
@@ -27,6 +33,20 @@ def simple_schedule():
     }
 
 
+@pytest.fixture
+def pruning_schedule():
+    """Two groups small enough to enumerate every timetable, sharing Math and a teacher."""
+    return {
+        "group1": {"Math": 1, "Physics": 1},
+        "group2": {"Math": 1, "Biology": 1},
+    }
+
+
+@pytest.fixture
+def pruning_teachers():
+    return {"Math": "Teacher A", "Physics": "Teacher B", "Biology": "Teacher B"}
+
+
 @pytest.fixture
 def model():
     return cp_model.CpModel()
@@ -39,34 +59,53 @@ def _solve(model: cp_model.CpModel) -> cp_model.CpSolver:
     return solver
 
 
+class _SolutionCollector(cp_model.CpSolverSolutionCallback):
+    def __init__(self, summarize):
+        super().__init__()
+        self.summarize = summarize
+        self.found: list = []
+
+    def on_solution_callback(self):
+        self.found.append(self.summarize(self))
+
+
+def _enumerate_solutions(model: cp_model.CpModel, summarize=lambda solution: None) -> list:
+    """Every solution of ``model``, each reduced by ``summarize(callback)`` while the callback is live."""
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    collector = _SolutionCollector(summarize)
+    solver.Solve(model, collector)
+    return collector.found
+
+
 class TestAddSubjectSlots:
-    def test_creates_variables_for_all_combinations(self, model, simple_schedule, config):
-        slots = add_subject_slots(model, simple_schedule, config)
+    def test_creates_variables_for_all_combinations(self, model, simple_schedule, simple_config):
+        slots = add_subject_slots(model, simple_schedule, simple_config)
 
         assert "group1" in slots
         for subject in simple_schedule["group1"]:
-            for day in range(config.days):
-                for hour in range(config.hours_per_day):
+            for day in range(simple_config.days):
+                for hour in range(simple_config.hours_per_day):
                     assert (subject, day, hour) in slots["group1"]
 
-    def test_variable_count_matches_expected(self, model, simple_schedule, config):
-        slots = add_subject_slots(model, simple_schedule, config)
+    def test_variable_count_matches_expected(self, model, simple_schedule, simple_config):
+        slots = add_subject_slots(model, simple_schedule, simple_config)
 
         num_subjects = len(simple_schedule["group1"])
-        expected = num_subjects * config.days * config.hours_per_day
+        expected = num_subjects * simple_config.days * simple_config.hours_per_day
         assert len(slots["group1"]) == expected
 
 
 class TestSingleClassPerSlotConstraint:
-    def test_no_two_subjects_in_same_slot(self, model, simple_schedule, config):
-        slots = add_subject_slots(model, simple_schedule, config)
-        add_minimum_hours_constraints(model, slots, simple_schedule, config)
-        add_single_class_per_slot_constraints(model, slots, simple_schedule, config)
+    def test_no_two_subjects_in_same_slot(self, model, simple_schedule, simple_config):
+        slots = add_subject_slots(model, simple_schedule, simple_config)
+        add_minimum_hours_constraints(model, slots, simple_schedule, simple_config)
+        add_single_class_per_slot_constraints(model, slots, simple_schedule, simple_config)
 
         solver = _solve(model)
 
-        for day in range(config.days):
-            for hour in range(config.hours_per_day):
+        for day in range(simple_config.days):
+            for hour in range(simple_config.hours_per_day):
                 active = sum(
                     solver.Value(slots["group1"][(subj, day, hour)])
                     for subj in simple_schedule["group1"]
@@ -75,57 +114,313 @@ class TestSingleClassPerSlotConstraint:
 
 
 class TestMinimumHoursConstraint:
-    def test_each_subject_meets_minimum(self, model, simple_schedule, config):
-        slots = add_subject_slots(model, simple_schedule, config)
-        add_minimum_hours_constraints(model, slots, simple_schedule, config)
-        add_single_class_per_slot_constraints(model, slots, simple_schedule, config)
+    def test_each_subject_meets_minimum(self, model, simple_schedule, simple_config):
+        slots = add_subject_slots(model, simple_schedule, simple_config)
+        add_minimum_hours_constraints(model, slots, simple_schedule, simple_config)
+        add_single_class_per_slot_constraints(model, slots, simple_schedule, simple_config)
 
         solver = _solve(model)
 
         for subject, min_hours in simple_schedule["group1"].items():
             total = sum(
                 solver.Value(slots["group1"][(subject, day, hour)])
-                for day in range(config.days)
-                for hour in range(config.hours_per_day)
+                for day in range(simple_config.days)
+                for hour in range(simple_config.hours_per_day)
             )
             assert total >= min_hours, f"{subject}: got {total} hours, need >= {min_hours}"
 
 
 class TestMaxSubjectsPerDayConstraint:
-    def test_respects_daily_limit(self, model, config):
+    def test_respects_daily_limit(self, model, simple_config):
         heavy_schedule = {
             "group1": {f"Subject_{i}": 3 for i in range(8)},
         }
-        slots = add_subject_slots(model, heavy_schedule, config)
-        add_minimum_hours_constraints(model, slots, heavy_schedule, config)
-        add_single_class_per_slot_constraints(model, slots, heavy_schedule, config)
-        add_max_subjects_per_day_constraints(model, slots, heavy_schedule, config)
+        slots = add_subject_slots(model, heavy_schedule, simple_config)
+        add_minimum_hours_constraints(model, slots, heavy_schedule, simple_config)
+        add_single_class_per_slot_constraints(model, slots, heavy_schedule, simple_config)
+        add_max_subjects_per_day_constraints(model, slots, heavy_schedule, simple_config)
 
         solver = _solve(model)
 
-        for day in range(config.days):
+        for day in range(simple_config.days):
             daily_total = sum(
                 solver.Value(slots["group1"][(subj, day, hour)])
                 for subj in heavy_schedule["group1"]
-                for hour in range(config.hours_per_day)
+                for hour in range(simple_config.hours_per_day)
             )
-            assert daily_total <= config.max_subjects_per_day, f"Day {day}: {daily_total} subjects"
+            assert daily_total <= simple_config.max_subjects_per_day, f"Day {day}: {daily_total} subjects"
 
 
 class TestNonAdjacentRepeatsConstraint:
-    def test_same_subject_not_in_adjacent_slots(self, model, simple_schedule, config):
-        slots = add_subject_slots(model, simple_schedule, config)
-        add_minimum_hours_constraints(model, slots, simple_schedule, config)
-        add_single_class_per_slot_constraints(model, slots, simple_schedule, config)
-        add_non_adjacent_repeats_constraints(model, slots, simple_schedule, config)
+    def test_same_subject_not_in_adjacent_slots(self, model, simple_schedule, simple_config):
+        slots = add_subject_slots(model, simple_schedule, simple_config)
+        add_minimum_hours_constraints(model, slots, simple_schedule, simple_config)
+        add_single_class_per_slot_constraints(model, slots, simple_schedule, simple_config)
+        add_non_adjacent_repeats_constraints(model, slots, simple_schedule, simple_config)
 
         solver = _solve(model)
 
         for subject in simple_schedule["group1"]:
-            for day in range(config.days):
-                for hour in range(config.hours_per_day - 1):
+            for day in range(simple_config.days):
+                for hour in range(simple_config.hours_per_day - 1):
                     current = solver.Value(slots["group1"][(subject, day, hour)])
                     next_slot = solver.Value(slots["group1"][(subject, day, hour + 1)])
                     assert not (current == 1 and next_slot == 1), (
                         f"{subject} repeated at day={day}, hours={hour}-{hour + 1}"
                     )
+
+
+class TestCommonSubjectAliasing:
+    @pytest.fixture
+    def shared_schedule(self):
+        return {
+            "group1": {"Math": 1, "Physics": 1},
+            "group2": {"Math": 1, "Chemistry": 1},
+        }
+
+    @staticmethod
+    def _build(schedule, alias):
+        config = Config(days=2, start_hour=9, hours_per_day=3, max_subjects_per_day=2,
+                        common_subjects=["Math"], alias_common_subjects=alias)
+        model = cp_model.CpModel()
+        slots = add_subject_slots(model, schedule, config)
+        add_all_constraints(model, slots, schedule, {}, config)
+        return model, slots, config
+
+    @staticmethod
+    def _count_solutions(model):
+        return len(_enumerate_solutions(model))
+
+    def test_groups_share_one_variable_per_common_slot(self, shared_schedule):
+        _, slots, config = self._build(shared_schedule, alias=True)
+
+        for day in range(config.days):
+            for hour in range(config.hours_per_day):
+                assert slots["group1"][("Math", day, hour)] is slots["group2"][("Math", day, hour)]
+
+    def test_model_shrinks(self, shared_schedule):
+        copied, _, config = self._build(shared_schedule, alias=False)
+        aliased, _, _ = self._build(shared_schedule, alias=True)
+
+        copied_proto, aliased_proto = copied.Proto(), aliased.Proto()
+        slots_per_subject = config.days * config.hours_per_day
+        assert len(copied_proto.variables) - len(aliased_proto.variables) == 2 * slots_per_subject
+        assert len(aliased_proto.constraints) < len(copied_proto.constraints)
+
+    def test_solution_space_unchanged(self, shared_schedule):
+        copied, _, _ = self._build(shared_schedule, alias=False)
+        aliased, _, _ = self._build(shared_schedule, alias=True)
+
+        assert self._count_solutions(aliased) == self._count_solutions(copied) > 0
+
+    def test_optimal_objective_unchanged(self, shared_schedule):
+        objectives = []
+        for alias in (False, True):
+            model, slots, config = self._build(shared_schedule, alias)
+            minimize_slots_usage(model, slots, shared_schedule, config)
+            objectives.append(_solve(model).ObjectiveValue())
+
+        assert objectives[0] == objectives[1]
+
+
+class TestTeacherConstraints:
+    @pytest.fixture
+    def shared_teachers(self):
+        return {
+            "Math": "Teacher A",
+            "Physics": "Teacher A",
+            "Chemistry": "Teacher B",
+            "Biology": "Teacher B",
+        }
+
+    @pytest.fixture
+    def multi_group_schedule(self):
+        return {
+            "group1": {"Math": 2, "Physics": 2, "Chemistry": 1},
+            "group2": {"Math": 2, "Physics": 2, "Biology": 2},
+            "group3": {"Math": 2, "Chemistry": 2, "Biology": 1},
+        }
+
+    @staticmethod
+    def _solve_all(schedule, teachers, alias=True):
+        config = Config(days=5, start_hour=9, hours_per_day=4, max_subjects_per_day=3,
+                        common_subjects=["Math"], alias_common_subjects=alias)
+        model = cp_model.CpModel()
+        slots = add_subject_slots(model, schedule, config)
+        add_all_constraints(model, slots, schedule, teachers, config)
+        minimize_slots_usage(model, slots, schedule, config)
+        return _solve(model), slots, config
+
+    @pytest.mark.parametrize("alias", [True, False])
+    def test_teacher_never_double_booked(self, multi_group_schedule, shared_teachers, alias):
+        solver, slots, config = self._solve_all(multi_group_schedule, shared_teachers, alias)
+
+        for day in range(config.days):
+            for hour in range(config.hours_per_day):
+                lessons: dict[str, set] = {}
+                for group, subjects in multi_group_schedule.items():
+                    for subject in subjects:
+                        if solver.Value(slots[group][(subject, day, hour)]):
+                            lesson = subject if subject in config.common_subjects else (group, subject)
+                            lessons.setdefault(shared_teachers[subject], set()).add(lesson)
+                for teacher, busy in lessons.items():
+                    assert len(busy) <= 1, f"{teacher} teaches {busy} at day={day}, hour={hour}"
+
+    def test_common_lesson_counted_once(self, multi_group_schedule, shared_teachers, model):
+        config = Config(days=5, start_hour=9, hours_per_day=4, max_subjects_per_day=3, common_subjects=["Math"])
+        slots = add_subject_slots(model, multi_group_schedule, config)
+
+        teacher_rows = add_teacher_constraints(model, slots, shared_teachers, multi_group_schedule, config)
+
+        assert sorted(teacher_rows["Teacher A"]) == [("group1", "Math"), ("group1", "Physics"), ("group2", "Physics")]
+        at_most_one = [ct for ct in model.Proto().constraints if ct.has_at_most_one()]
+        assert len(at_most_one) == 2 * config.days * config.hours_per_day
+
+    def test_same_subject_in_two_groups_is_two_lessons(self, model):
+        schedule = {"group1": {"Physics": 3}, "group2": {"Physics": 3}}
+        config = Config(days=3, start_hour=9, hours_per_day=1, max_subjects_per_day=1)
+        slots = add_subject_slots(model, schedule, config)
+        add_minimum_hours_constraints(model, slots, schedule, config)
+        add_teacher_constraints(model, slots, {"Physics": "Teacher A"}, schedule, config)
+
+        solver = cp_model.CpSolver()
+
+        assert solver.Solve(model) == cp_model.INFEASIBLE
+
+
+class TestConstraintPruning:
+    @staticmethod
+    def _build(schedule, teachers, prune, hours_per_day=3, max_subjects_per_day=2, alias=True, report=None):
+        config = Config(days=2, start_hour=9, hours_per_day=hours_per_day, max_subjects_per_day=max_subjects_per_day,
+                        common_subjects=["Math"], alias_common_subjects=alias, prune_redundant_constraints=prune)
+        model = cp_model.CpModel()
+        slots = add_subject_slots(model, schedule, config)
+        add_all_constraints(model, slots, schedule, teachers, config, report)
+        return model, slots, config
+
+    @staticmethod
+    def _solutions(model, slots):
+        return set(_enumerate_solutions(model, lambda solution: tuple(solution.Value(var) for var in slots.variables)))
+
+    @pytest.mark.parametrize("hours_per_day, max_subjects_per_day, alias", [
+        (2, 1, True), (3, 1, True), (3, 2, True), (4, 3, True), (4, 2, False), (4, 1, False),
+    ])
+    def test_solution_space_unchanged(self, pruning_schedule, pruning_teachers, hours_per_day, max_subjects_per_day,
+                                      alias):
+        spaces = []
+        for prune in (False, True):
+            model, slots, _ = self._build(pruning_schedule, pruning_teachers, prune, hours_per_day,
+                                          max_subjects_per_day, alias)
+            spaces.append(self._solutions(model, slots))
+
+        assert spaces[0] == spaces[1] != set()
+
+    @pytest.mark.parametrize("max_subjects_per_day", [1, 2])
+    def test_optimal_objective_unchanged(self, pruning_schedule, pruning_teachers, max_subjects_per_day):
+        objectives = []
+        for prune in (False, True):
+            model, slots, config = self._build(pruning_schedule, pruning_teachers, prune, 4, max_subjects_per_day)
+            minimize_slots_usage(model, slots, pruning_schedule, config)
+            objectives.append(_solve(model).ObjectiveValue())
+
+        assert objectives[0] == objectives[1]
+
+    def test_model_shrinks(self, pruning_schedule, pruning_teachers):
+        full, _, _ = self._build(pruning_schedule, pruning_teachers, prune=False, hours_per_day=7,
+                                 max_subjects_per_day=6)
+        pruned, _, _ = self._build(pruning_schedule, pruning_teachers, prune=True, hours_per_day=7,
+                                   max_subjects_per_day=6)
+
+        assert len(pruned.Proto().constraints) < len(full.Proto().constraints)
+
+    def test_binding_daily_limit_is_kept(self):
+        config = Config(days=2, hours_per_day=7, max_subjects_per_day=1)
+
+        assert "max_subjects_per_day" not in redundant_families(config)
+        assert "non_adjacent_repeats" in redundant_families(config)
+
+
+class TestBuildReport:
+    def test_counts_match_model(self, simple_schedule, simple_config):
+        for prune in (False, True):
+            simple_config.prune_redundant_constraints = prune
+            model = cp_model.CpModel()
+            slots = add_subject_slots(model, simple_schedule, simple_config)
+            report = BuildReport()
+            add_all_constraints(model, slots, simple_schedule, {}, simple_config, report)
+
+            assert report.constraints == len(model.Proto().constraints)
+            assert report.variables == 0
+
+    def test_lists_every_family_and_skips(self, simple_schedule, simple_config):
+        model = cp_model.CpModel()
+        slots = add_subject_slots(model, simple_schedule, simple_config)
+        report = BuildReport()
+        add_all_constraints(model, slots, simple_schedule, {}, simple_config, report)
+
+        stats = {family.name: family for family in report.families}
+        assert stats["non_adjacent_repeats"].skipped is not None
+        assert stats["no_gaps"].constraints == 2 * simple_config.days * (simple_config.hours_per_day - 2)
+        assert stats["minimum_hours"].literals == 2 * simple_config.days * simple_config.hours_per_day
+        assert report.to_dict()["total"]["literals"] == report.literals
+
+
+class TestAvailability:
+    UNAVAILABLE = {"teacher": {"Teacher B": [[0, 1]]}, "group": {"group2": [[1]]}, "subject": {"Math": [[0, 0]]}}
+
+    @staticmethod
+    def _config(unavailable, alias=True, prune=True):
+        return Config(days=2, start_hour=9, hours_per_day=3, max_subjects_per_day=2, common_subjects=["Math"],
+                      alias_common_subjects=alias, prune_redundant_constraints=prune, unavailable=unavailable)
+
+    @staticmethod
+    def _timetables(schedule, teachers, config, block=None):
+        """Every feasible timetable as a set of occupied (group, subject, day, hour) slots."""
+        model = cp_model.CpModel()
+        slots = add_subject_slots(model, schedule, config, teachers)
+        add_all_constraints(model, slots, schedule, teachers, config)
+        if block is not None:
+            for var in slots.vars_at(slots.index[block]):
+                model.Add(var == 0)
+        occupied = np.argwhere(slots.index >= 0).tolist()
+        return set(_enumerate_solutions(model, lambda solution: frozenset(
+            tuple(key) for key in occupied if solution.Value(slots.variables[slots.index[tuple(key)]]))))
+
+    def test_blocked_slots_get_no_variable(self, pruning_schedule, pruning_teachers):
+        model = cp_model.CpModel()
+        slots = add_subject_slots(model, pruning_schedule, self._config(self.UNAVAILABLE), pruning_teachers)
+        math, physics, biology = (slots.subject_index[s] for s in ("Math", "Physics", "Biology"))
+
+        # Math is shared, so group2's day off also blocks it for group1.
+        assert (slots.row(0, math) >= 0).tolist() == [[False, True, True], [False, False, False]]
+        assert (slots.row(0, physics) >= 0).tolist() == [[True, False, True], [True, True, True]]
+        assert (slots.row(1, biology) >= 0).tolist() == [[True, False, True], [False, False, False]]
+        assert len(slots.variables) == 2 + 5 + 2
+        assert slots.present().tolist() == [[True, True, False], [True, False, True]]
+
+    @pytest.mark.parametrize("alias, prune", [(True, True), (True, False), (False, True), (False, False)])
+    def test_same_timetables_as_dense_model_with_blocked_slots_fixed(self, pruning_schedule, pruning_teachers, alias,
+                                                                     prune):
+        sparse_config = self._config(self.UNAVAILABLE, alias, prune)
+        dense_config = self._config({}, alias, prune)
+        sparse_slots = add_subject_slots(cp_model.CpModel(), pruning_schedule, sparse_config, pruning_teachers)
+        dense_slots = add_subject_slots(cp_model.CpModel(), pruning_schedule, dense_config, pruning_teachers)
+        blocked = (dense_slots.index >= 0) & (sparse_slots.index < 0)
+
+        sparse = self._timetables(pruning_schedule, pruning_teachers, sparse_config)
+        dense = self._timetables(pruning_schedule, pruning_teachers, dense_config, block=blocked)
+
+        assert sparse == dense != set()
+
+    def test_model_shrinks_with_the_calendars(self, pruning_schedule, pruning_teachers):
+        sizes = []
+        for unavailable in ({}, {"teacher": {"Teacher B": [[0]]}}, self.UNAVAILABLE):
+            config = self._config(unavailable, prune=False)
+            model = cp_model.CpModel()
+            slots = add_subject_slots(model, pruning_schedule, config, pruning_teachers)
+            add_all_constraints(model, slots, pruning_schedule, pruning_teachers, config)
+            minimize_slots_usage(model, slots, pruning_schedule, config)
+            sizes.append((len(model.Proto().variables), len(model.Proto().constraints)))
+
+        assert sizes[0][0] == 18 and sizes[1][0] == 18 - 6 and sizes[2][0] == 9
+        assert sizes[0][1] > sizes[1][1] > sizes[2][1]
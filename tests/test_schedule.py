@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from src.constraints import add_all_constraints, add_subject_slots, minimize_slots_usage
+from src.schedule import EMPTY, Schedule, extract_schedule, validate_schedule
+
+
+@pytest.fixture
+def solved(schedule, teachers, config):
+    model = cp_model.CpModel()
+    slots = add_subject_slots(model, schedule, config)
+    add_all_constraints(model, slots, schedule, teachers, config)
+    minimize_slots_usage(model, slots, schedule, config)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    return solver, slots
+
+
+class TestExtractSchedule:
+    def test_matches_per_variable_values(self, solved, teachers, config):
+        solver, slots = solved
+        schedule = extract_schedule(slots, solver.ResponseProto(), teachers)
+
+        assert schedule.grid.shape == (2, config.days, config.hours_per_day)
+        for g, group in enumerate(schedule.groups):
+            for (subject, day, hour), var in slots[group].items():
+                expected = schedule.subjects.index(subject) if solver.Value(var) else None
+                if expected is not None:
+                    assert schedule.grid[g, day, hour] == expected
+
+    def test_teacher_lookup(self, solved, teachers):
+        solver, slots = solved
+        schedule = extract_schedule(slots, solver.ResponseProto(), teachers)
+
+        for day, hour, subject, teacher in schedule.lessons("group2"):
+            assert teacher == teachers[subject]
+
+    def test_optimal_schedule_is_valid(self, solved, schedule, teachers, config):
+        solver, slots = solved
+        timetable = extract_schedule(slots, solver.ResponseProto(), teachers)
+
+        assert validate_schedule(timetable, schedule, config) == []
+        assert timetable.hours_per_subject().sum() == solver.ObjectiveValue()
+
+    def test_round_trips_through_dict(self, solved, teachers):
+        solver, slots = solved
+        schedule = extract_schedule(slots, solver.ResponseProto(), teachers)
+        restored = Schedule.from_dict(schedule.to_dict())
+
+        np.testing.assert_array_equal(restored.grid, schedule.grid)
+        assert restored.group_subjects("group1") == ["Math", "Physics"]
+
+
+class TestValidateSchedule:
+    def test_reports_broken_rules(self, schedule, config):
+        grid = np.full((2, config.days, config.hours_per_day), EMPTY, dtype=np.int16)
+        grid[0, 0, 0] = grid[1, 0, 0] = 0  # Math once, aligned across groups
+        grid[0, 1, 0] = 1  # Physics for group1 ...
+        grid[1, 1, 0] = 2  # ... while Teacher B also gives group2 Chemistry
+        timetable = Schedule(groups=["group1", "group2"], subjects=["Math", "Physics", "Chemistry"],
+                             teachers=["Teacher A", "Teacher B", "Teacher B"],
+                             offered=np.array([[True, True, False], [True, False, True]]), grid=grid)
+
+        problems = validate_schedule(timetable, schedule, config)
+
+        assert any("Math has 1 hours" in problem for problem in problems)
+        assert any("Chemistry has 1 hours" in problem for problem in problems)
+        assert any("Teacher B double-booked" in problem for problem in problems)
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.generator import InstanceSpec, generate_instance
+from src.service import SchedulerService, call
+
+
+@pytest.fixture
+def hard_instance():
+    """An instance single-worker CP-SAT cannot close within a few seconds."""
+    teachers, subjects_per_group, config = generate_instance(InstanceSpec(groups=8))
+    return subjects_per_group, teachers, replace(config, num_workers=1)
+
+
+async def _collect(job) -> list[dict]:
+    return [event async for event in job.events()]
+
+
+class TestSchedulerService:
+    def test_streams_solutions_and_result(self, schedule, teachers, config):
+        async def scenario():
+            async with SchedulerService(workers=1) as service:
+                job = await service.submit(schedule, teachers, config)
+                return job, await _collect(job)
+
+        job, events = asyncio.run(scenario())
+
+        types = [event["type"] for event in events]
+        assert types[:2] == ["queued", "running"] and types[-1] == "done"
+        assert "solution" in types
+        assert job.result["status"] == "OPTIMAL" and job.result["objective"] == 7
+        assert job.result["schedule"]["groups"] == ["group1", "group2"]
+
+    def test_identical_submissions_share_a_job_then_hit_the_cache(self, schedule, teachers, config):
+        async def scenario():
+            async with SchedulerService(workers=1) as service:
+                first = await service.submit(schedule, teachers, config)
+                second = await service.submit(dict(schedule), dict(teachers), replace(config))
+                await _collect(first)
+                third = await service.submit(schedule, teachers, config)
+                other = await service.submit(schedule, teachers, replace(config, days=6))
+                await _collect(other)
+                return first, second, third, other
+
+        first, second, third, other = asyncio.run(scenario())
+
+        assert second is first
+        assert third is not first and third.cached and third.status == "done"
+        assert third.result == first.result
+        assert not other.cached
+
+    def test_cancel_queued_and_running_jobs(self, hard_instance, schedule, teachers, config):
+        async def scenario():
+            async with SchedulerService(workers=1) as service:
+                running = await service.submit(*hard_instance)
+                queued = await service.submit(schedule, teachers, config)
+                assert await service.cancel(queued.id)
+                async for event in running.events():
+                    if event["type"] == "solution":
+                        assert await service.cancel(running.id)
+                        break
+                await _collect(running)
+                return running, queued
+
+        running, queued = asyncio.run(scenario())
+
+        assert queued.status == "cancelled" and queued.result is None
+        assert running.status == "cancelled"
+        assert running.result["schedule"] is not None
+
+    def test_timeout_keeps_best_schedule(self, hard_instance):
+        async def scenario():
+            async with SchedulerService(workers=1) as service:
+                job = await service.submit(*hard_instance, timeout=3.0)
+                await _collect(job)
+                return job, service
+
+        job, service = asyncio.run(scenario())
+
+        assert job.status == "timeout"
+        assert job.result["status"] == "FEASIBLE"
+        assert job.key not in service.results
+
+    def test_shutdown_does_not_block_the_event_loop(self, schedule, teachers, config):
+        async def tick(gaps):
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        async def scenario():
+            gaps: list[float] = []
+            async with SchedulerService(workers=1) as service:
+                await _collect(await service.submit(schedule, teachers, config))
+                shutdown = service._pool.shutdown
+
+                def slow_shutdown(*args, **kwargs):
+                    time.sleep(0.5)  # a solve that takes a while to notice the stop request
+                    shutdown(*args, **kwargs)
+
+                service._pool.shutdown = slow_shutdown
+                ticker = asyncio.create_task(tick(gaps))
+                await asyncio.sleep(0.05)
+            await asyncio.sleep(0.05)
+            ticker.cancel()
+            return gaps
+
+        gaps = asyncio.run(scenario())
+
+        assert max(gaps) < 0.25
+
+
+class TestProtocol:
+    def test_submit_and_watch_over_tcp(self, schedule, teachers):
+        async def scenario():
+            async with SchedulerService(workers=1) as service:
+                server = await service.serve(port=0)
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    request = {"op": "submit", "subjects_per_group": schedule, "teachers": teachers,
+                               "config": {"days": 5, "hours_per_day": 4, "common_subjects": ["Math"],
+                                          "num_workers": 1},
+                               "watch": True}
+                    replies = [reply async for reply in call(request, port=port)]
+                    status = [reply async for reply in call({"op": "status", "job": replies[0]["job"]}, port=port)]
+                    error = [reply async for reply in call({"op": "explode"}, port=port)]
+                return replies, status, error
+
+        replies, status, error = asyncio.run(scenario())
+
+        assert replies[0]["status"] == "queued"
+        assert replies[-1]["type"] == "done" and replies[-1]["result"]["objective"] == 7
+        assert status == [{"job": replies[0]["job"], "status": "done", "cached": False,
+                           "result": replies[-1]["result"]}]
+        assert "Unknown op" in error[0]["error"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from src.constraints import add_subject_slots
+
+
+@pytest.fixture
+def unequal_schedule():
+    """The groups ask for different amounts of the common Math."""
+    return {
+        "group1": {"Math": 2, "Physics": 1},
+        "group2": {"Math": 3, "Chemistry": 1},
+    }
+
+
+@pytest.fixture
+def store(unequal_schedule, config):
+    return add_subject_slots(cp_model.CpModel(), unequal_schedule, config)
+
+
+class TestSlotStore:
+    def test_dense_indices(self, store, config):
+        assert store.groups == ["group1", "group2"]
+        assert store.subjects == ["Math", "Physics", "Chemistry"]
+        assert store.index.shape == (2, 3, config.days, config.hours_per_day)
+
+    def test_missing_rows_are_marked(self, store):
+        physics, chemistry = store.subject_index["Physics"], store.subject_index["Chemistry"]
+
+        assert (store.index[1, physics] == -1).all()
+        assert (store.index[0, chemistry] == -1).all()
+        assert store.present().tolist() == [[True, True, False], [True, False, True]]
+
+    def test_common_rows_share_positions(self, store):
+        math = store.subject_index["Math"]
+
+        np.testing.assert_array_equal(store.row(0, math), store.row(1, math))
+        assert store.owner[0, math] and not store.owner[1, math]
+        assert store.required[0, math] == 3
+
+    def test_slot_slice_skips_missing_subjects(self, store):
+        assert len(store.vars_at(store.slot(0, 1, 2))) == 2
+
+    def test_rows_yield_each_variable_block_once(self, store, config):
+        rows = list(store.rows())
+
+        assert len(rows) == 3
+        assert len(store.variables) == len(rows) * config.days * config.hours_per_day
+
+    def test_usage_counts_reflect_sharing(self, store, config):
+        counts = store.usage_counts()
+
+        assert sorted(set(counts.tolist())) == [1, 2]
+        assert counts.sum() == 4 * config.days * config.hours_per_day
+
+
+class TestGroupSlots:
+    def test_behaves_like_the_old_mapping(self, store, config):
+        group = store["group2"]
+
+        assert ("Chemistry", 0, 0) in group
+        assert ("Physics", 0, 0) not in group
+        assert len(group) == 2 * config.days * config.hours_per_day
+        assert group[("Math", 1, 1)] is store["group1"][("Math", 1, 1)]
+
+    def test_missing_key_raises(self, store):
+        with pytest.raises(KeyError):
+            store["group1"][("Chemistry", 0, 0)]
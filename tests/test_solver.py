@@ -0,0 +1,78 @@
+import json
+from dataclasses import replace
+
+import pytest
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.constraints import add_all_constraints, add_subject_slots, minimize_slots_usage
+from src.schedule import Schedule
+from src.solver import ImprovingSolutionRecorder, make_solver, split_cores
+
+
+@pytest.fixture
+def config(config):
+    return replace(config, num_workers=2, relative_gap=0.0)
+
+
+def _build(schedule, config):
+    model = cp_model.CpModel()
+    slots = add_subject_slots(model, schedule, config)
+    add_all_constraints(model, slots, schedule, {}, config)
+    minimize_slots_usage(model, slots, schedule, config)
+    return model, slots
+
+
+class TestMakeSolver:
+    def test_applies_limits(self, config):
+        solver = make_solver(config)
+
+        assert solver.parameters.num_workers == 2
+        assert solver.parameters.max_time_in_seconds == 10.0
+        assert solver.parameters.relative_gap_limit == 0.0
+
+    def test_leaves_unset_limits_at_defaults(self):
+        solver = make_solver(Config())
+
+        assert solver.parameters.max_time_in_seconds == cp_model.CpSolver().parameters.max_time_in_seconds
+
+
+class TestSplitCores:
+    def test_shares_cores_between_pool_workers(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+        assert split_cores(Config(), 4).num_workers == 2
+        assert split_cores(Config(), 16).num_workers == 1
+
+    def test_keeps_explicit_worker_count(self, config):
+        assert split_cores(config, 4) is config
+
+
+class TestImprovingSolutionRecorder:
+    def test_records_strictly_improving_solutions(self, schedule, config, tmp_path):
+        model, slots = _build(schedule, config)
+        recorder = ImprovingSolutionRecorder(slots, {}, output_dir=tmp_path, verbose=False)
+
+        solver = make_solver(config)
+        status = solver.Solve(model, recorder)
+
+        assert status == cp_model.OPTIMAL
+        assert recorder.records
+        objectives = [record.objective for record in recorder.records]
+        assert objectives == sorted(objectives, reverse=True)
+        assert len(set(objectives)) == len(objectives)
+        assert recorder.records[-1].objective == solver.ObjectiveValue()
+
+    def test_writes_each_solution_to_disk(self, schedule, config, tmp_path):
+        model, slots = _build(schedule, config)
+        recorder = ImprovingSolutionRecorder(slots, {}, output_dir=tmp_path, verbose=False)
+
+        make_solver(config).Solve(model, recorder)
+
+        for record in recorder.records:
+            assert record.path is not None and record.path.exists()
+        best = json.loads((tmp_path / "best.json").read_text())
+        assert best["objective"] == recorder.records[-1].objective
+        written = Schedule.from_dict(best["schedule"])
+        math = written.subjects.index("Math")
+        assert written.hours_per_subject()[0, math] == schedule["group1"]["Math"]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from benchmarks.startup import measure_startup, parse_importtime
+from src.config import Config
+from src.data_loader import save_data_to_json
+from src.engines import ENGINES
+from src.main import ENGINE_CHOICES, parse_args
+from src.schedule import EMPTY, Schedule
+from src.warm_start import save_solution
+
+
+@pytest.fixture
+def saved_run(tmp_path):
+    """A pandas-free instance file and a schedule saved for it."""
+    subjects_per_group = {"group1": {"Math": 1, "Physics": 1}}
+    teachers = {"Math": "Teacher A", "Physics": "Teacher B"}
+    grid = np.full((1, 10, 7), EMPTY, dtype=np.int16)
+    grid[0, 0, 0], grid[0, 1, 0] = 0, 1
+    schedule = Schedule(groups=["group1"], subjects=["Math", "Physics"], teachers=["Teacher A", "Teacher B"],
+                        offered=np.ones((1, 2), dtype=bool), grid=grid)
+    save_data_to_json(teachers, subjects_per_group, tmp_path / "instance.json")
+    save_solution(tmp_path / "solution.json", schedule, subjects_per_group, teachers, Config(), 2.0, 0.1)
+    return tmp_path
+
+
+class TestStartup:
+    def test_help_skips_heavy_imports(self):
+        profile = measure_startup(["--help"])
+
+        assert profile.heavy() == []
+
+    def test_headless_export_of_saved_schedule_skips_heavy_imports(self, saved_run):
+        profile = measure_startup(["--data", str(saved_run / "instance.json"),
+                                   "--from-solution", str(saved_run / "solution.json"),
+                                   "--export-csv", str(saved_run / "out.csv"),
+                                   "--export-ics", str(saved_run / "calendars"), "--calendar-start", "2026-09-07"])
+
+        assert profile.heavy() == []
+        assert (saved_run / "out.csv").read_text().splitlines()[1:] == ["group1,0,9,Math,Teacher A",
+                                                                         "group1,1,9,Physics,Teacher B"]
+        assert (saved_run / "calendars" / "teachers" / "Teacher_B.ics").exists()
+
+    def test_solving_still_imports_the_solver(self, saved_run):
+        profile = measure_startup(["--data", str(saved_run / "instance.json"), "--num-workers", "1",
+                                   "--save-solution", str(saved_run / "solved.json"),
+                                   "--export-csv", str(saved_run / "out.csv"), "--no-model-cache"])
+
+        assert profile.imported("ortools") and not profile.imported("matplotlib")
+        assert (saved_run / "solved.json").exists()
+
+    def test_missing_saved_schedule_is_a_usage_error(self, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exit_info:
+            parse_args(["--from-solution", str(tmp_path / "missing.json")])
+
+        assert exit_info.value.code == 2
+        assert "no saved solution" in capsys.readouterr().err
+
+    def test_engine_choices_match_registry(self):
+        assert set(ENGINE_CHOICES) == set(ENGINES)
+
+
+class TestParseImporttime:
+    def test_totals_top_level_imports(self):
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   numpy._core",
+            "import time:       200 |        300 | numpy",
+            "import time:        50 |         50 | json",
+        ])
+
+        profile = parse_importtime(stderr)
+
+        assert profile.top_level == {"numpy": 300, "json": 50}
+        assert profile.total_ms == 0.35
+        assert profile.imported("numpy") and not profile.imported("num")
@@ -0,0 +1,51 @@
+import pytest
+
+from src.sweep import ScenarioResult, format_row, scenario_grid, solve_scenario, sweep
+
+
+class TestScenarioGrid:
+    def test_cartesian_product(self):
+        scenarios = scenario_grid(days=[4, 5], hours_per_day=[2, 3, 4])
+
+        assert len(scenarios) == 6
+        assert scenarios[0] == {"days": 4, "hours_per_day": 2}
+        assert {"days": 5, "hours_per_day": 4} in scenarios
+
+
+class TestSolveScenario:
+    def test_reports_objective_and_utilisation(self, schedule, teachers, config):
+        result = solve_scenario({"hours_per_day": 2}, config, instance=(schedule, teachers))
+
+        assert result.status == "OPTIMAL" and result.feasible
+        assert result.objective == 7  # Math counted for both groups, plus Physics and Chemistry
+        assert result.utilisation == pytest.approx(7 / (2 * 5 * 2))
+
+    def test_precheck_skips_the_solver(self, schedule, teachers, config):
+        result = solve_scenario({"days": 1}, config, instance=(schedule, teachers))
+
+        assert result.status == "INFEASIBLE" and not result.feasible
+        assert result.problems and result.solve_time == 0.0
+        assert "INFEASIBLE" in format_row(result)
+
+    @pytest.mark.parametrize("engine", ["grid", "interval"])
+    def test_engines_agree(self, schedule, teachers, config, engine):
+        result = solve_scenario({}, config, engine, instance=(schedule, teachers))
+
+        assert result.objective == 7
+
+
+class TestSweep:
+    def test_streams_every_scenario(self, schedule, teachers, config):
+        scenarios = scenario_grid(days=[1, 3, 5], max_subjects_per_day=[1, 2])
+
+        results = list(sweep(schedule, teachers, config, scenarios, workers=2))
+
+        assert sorted(result.label for result in results) == sorted(
+            ScenarioResult(overrides, "", None, None, 0.0, 0.0, None, []).label for overrides in scenarios
+        )
+        feasible = {(r.overrides["days"], r.overrides["max_subjects_per_day"]) for r in results if r.feasible}
+        assert feasible == {(3, 2), (5, 1), (5, 2)}
+
+    def test_rejects_unknown_fields(self, schedule, teachers, config):
+        with pytest.raises(ValueError, match="weeks"):
+            list(sweep(schedule, teachers, config, [{"weeks": 2}]))
@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from src.constraints import BuildReport, build_model
+from src.solver import ImprovingSolutionRecorder, make_solver
+from src.telemetry import BoundTracker, RunMetrics, model_size, profiled, solver_metrics, trajectory
+
+
+class TestRunMetrics:
+    def test_stages_accumulate(self):
+        metrics = RunMetrics()
+        for _ in range(2):
+            with metrics.stage("build"):
+                pass
+
+        assert list(metrics.stages) == ["build"]
+        assert metrics.stages["build"] >= 0
+
+    def test_stage_is_timed_when_it_raises(self):
+        metrics = RunMetrics()
+        with pytest.raises(ValueError), metrics.stage("load"):
+            raise ValueError("bad data")
+
+        assert "load" in metrics.stages
+
+    def test_writes_one_json_record(self, tmp_path, schedule, config):
+        report = BuildReport()
+        model, _ = build_model(schedule, {}, config, report)
+        metrics = RunMetrics()
+        metrics.record(model=model_size(model), build=report.to_dict())
+
+        record = json.loads(metrics.write(tmp_path / "runs" / "metrics.json").read_text())
+
+        assert record["model"]["constraints"] == report.constraints
+        assert {"timestamp", "ortools", "stages", "build"} <= set(record)
+
+
+class TestSolverMetrics:
+    def test_reports_search_statistics_and_trajectory(self, schedule, config):
+        model, slots = build_model(schedule, {}, config)
+        solver = make_solver(config)
+        recorder = ImprovingSolutionRecorder(slots, {}, verbose=False)
+        bounds = BoundTracker()
+        bounds.attach(solver)
+        status = solver.Solve(model, recorder)
+
+        stats = solver_metrics(solver, status)
+        events = trajectory(recorder.records, bounds.bounds)
+
+        assert stats["status"] == "OPTIMAL"
+        assert stats["objective"] == stats["bound"]
+        assert stats["num_branches"] >= 0 and stats["num_conflicts"] >= 0
+        assert "CpSolverResponse" in stats["response_stats"]
+        assert [event["time"] for event in events] == sorted(event["time"] for event in events)
+        assert any("objective" in event for event in events)
+        json.dumps(stats)
+
+
+class TestProfiled:
+    def test_collects_hotspots_and_allocations(self):
+        out = io.StringIO()
+        with profiled(top=5, out=out) as profile:
+            data = [list(range(100)) for _ in range(100)]
+
+        assert data
+        assert 0 < len(profile["hotspots"]) <= 5
+        assert 0 < len(profile["allocations"]) <= 5
+        assert profile["peak_traced_mib"] > 0
+        assert "allocation site" in out.getvalue()
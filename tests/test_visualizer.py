@@ -0,0 +1,43 @@
+import re
+
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.schedule import EMPTY, Schedule
+from src.visualizer import render_combined_pdf, render_groups
+
+
+@pytest.fixture
+def chart_config():
+    return Config(days=10, start_hour=9, hours_per_day=3, max_subjects_per_day=2)
+
+
+@pytest.fixture
+def timetable(chart_config):
+    grid = np.full((3, chart_config.days, chart_config.hours_per_day), EMPTY, dtype=np.int16)
+    grid[:, ::2, 0] = 0
+    grid[:, 1::3, 1] = 1
+    return Schedule(groups=["group1", "group2", "group3"], subjects=["Math", "Physics"],
+                    teachers=["Teacher A", "Teacher B"], offered=np.ones((3, 2), dtype=bool), grid=grid)
+
+
+class TestRenderGroups:
+    @pytest.mark.parametrize("fmt", ["png", "svg"])
+    def test_writes_one_file_per_group(self, timetable, chart_config, tmp_path, fmt):
+        paths = render_groups(timetable, chart_config, tmp_path, fmt=fmt, workers=1)
+
+        assert sorted(path.name for path in paths) == [f"group{i}.{fmt}" for i in (1, 2, 3)]
+        assert all(path.stat().st_size > 0 for path in paths)
+
+    def test_parallel_matches_serial_output_set(self, timetable, chart_config, tmp_path):
+        paths = render_groups(timetable, chart_config, tmp_path, workers=2)
+
+        assert {path.name for path in paths} == {"group1.png", "group2.png", "group3.png"}
+
+
+class TestRenderCombinedPdf:
+    def test_one_page_per_group(self, timetable, chart_config, tmp_path):
+        path = render_combined_pdf(timetable, chart_config, tmp_path / "all.pdf")
+
+        assert re.findall(rb"/Count (\d+)", path.read_bytes()) == [b"3"]
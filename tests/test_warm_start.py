@@ -0,0 +1,165 @@
+from dataclasses import replace
+
+import pytest
+from ortools.sat.python import cp_model
+
+from src.config import Config
+from src.constraints import build_model
+from src.main import parse_args
+from src.schedule import extract_schedule, validate_schedule
+from src.warm_start import apply_warm_start, load_solution, save_solution, touched_by_change
+
+
+@pytest.fixture
+def warm_config():
+    return Config(days=5, start_hour=9, hours_per_day=3, max_subjects_per_day=2, common_subjects=["Math"])
+
+
+@pytest.fixture
+def warm_teachers():
+    return {"Math": "Teacher A", "Physics": "Teacher B", "Chemistry": "Teacher C", "Biology": "Teacher C"}
+
+
+@pytest.fixture
+def schedule_data():
+    return {
+        "group1": {"Math": 2, "Physics": 2},
+        "group2": {"Math": 2, "Chemistry": 2},
+    }
+
+
+def _solve(schedule_data, teachers, config):
+    model, slots = build_model(schedule_data, teachers, config)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    return solver, slots
+
+
+@pytest.fixture
+def previous(schedule_data, warm_teachers, warm_config, tmp_path):
+    solver, slots = _solve(schedule_data, warm_teachers, warm_config)
+    schedule = extract_schedule(slots, solver.ResponseProto(), warm_teachers)
+    path = tmp_path / "last.json"
+    save_solution(path, schedule, schedule_data, warm_teachers, warm_config, solver.ObjectiveValue(), solver.WallTime())
+    return load_solution(path)
+
+
+class TestTouchedByChange:
+    def test_nothing_changed(self, previous, schedule_data, warm_teachers, warm_config):
+        assert touched_by_change(previous, schedule_data, warm_teachers, warm_config) == (set(), set())
+
+    def test_reports_changed_group_and_subject(self, previous, schedule_data, warm_teachers, warm_config):
+        changed = {**schedule_data, "group2": {"Math": 2, "Chemistry": 2, "Biology": 1}}
+
+        assert touched_by_change(previous, changed, warm_teachers, warm_config) == ({"group2"}, {"Biology"})
+
+    def test_teacher_change_touches_subject(self, previous, schedule_data, warm_teachers, warm_config):
+        changed = {**warm_teachers, "Physics": "Teacher D"}
+
+        assert touched_by_change(previous, schedule_data, changed, warm_config) == (set(), {"Physics"})
+
+    def test_calendar_change_touches_its_group_and_subjects(self, previous, schedule_data, warm_teachers, warm_config):
+        restricted = replace(warm_config, unavailable={"group": {"group1": [[0]]}, "teacher": {"Teacher C": [[1, 2]]}})
+
+        assert touched_by_change(previous, schedule_data, warm_teachers, restricted) == (
+            {"group1"}, {"Chemistry", "Biology"})
+
+    def test_grid_change_touches_everything(self, previous, schedule_data, warm_teachers, warm_config):
+        assert touched_by_change(previous, schedule_data, warm_teachers, replace(warm_config, days=4)) == (
+            {"group1", "group2"}, {"Math", "Physics", "Chemistry"})
+
+    def test_file_without_config_touches_everything(self, previous, schedule_data, warm_teachers, warm_config):
+        legacy = {key: value for key, value in previous.items() if key != "config"}
+
+        assert touched_by_change(legacy, schedule_data, warm_teachers, warm_config)[0] == {"group1", "group2"}
+
+
+class TestApplyWarmStart:
+    def test_unchanged_instance_keeps_every_hint(self, previous, schedule_data, warm_teachers, warm_config):
+        model, slots = build_model(schedule_data, warm_teachers, warm_config)
+        warm = apply_warm_start(model, slots, previous, schedule_data, warm_teachers, warm_config)
+
+        solver = cp_model.CpSolver()
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        assert len(warm.values) == len(slots.variables)
+        assert len(model.Proto().solution_hint.vars) == len(slots.variables)
+        assert solver.ObjectiveValue() == previous["objective"]
+
+    def test_fixes_only_untouched_rows(self, previous, schedule_data, warm_teachers, warm_config):
+        changed = {**schedule_data, "group2": {"Math": 2, "Chemistry": 2, "Biology": 1}}
+        model, slots = build_model(changed, warm_teachers, warm_config)
+
+        warm = apply_warm_start(model, slots, previous, changed, warm_teachers, warm_config, fix_untouched=True)
+
+        # Only group1's Physics is fixed: Math is shared with the changed group2.
+        assert warm.fixed == warm_config.days * warm_config.hours_per_day
+
+    def test_unaliased_common_rows_follow_the_changed_group(self, previous, schedule_data, warm_teachers, warm_config):
+        copied = replace(warm_config, alias_common_subjects=False)
+        changed = {**schedule_data, "group2": {"Math": 2, "Chemistry": 2, "Biology": 1}}
+        model, slots = build_model(changed, warm_teachers, copied)
+
+        warm = apply_warm_start(model, slots, previous, changed, warm_teachers, copied, fix_untouched=True)
+
+        # group1 owns a copy of Math tied to group2's by equalities, so fixing it would pin group2 too.
+        assert warm.fixed == warm_config.days * warm_config.hours_per_day
+        assert cp_model.CpSolver().Solve(model) == cp_model.OPTIMAL
+
+    def test_resolve_after_change_is_valid(self, previous, schedule_data, warm_teachers, warm_config):
+        changed = {**schedule_data, "group2": {"Math": 2, "Chemistry": 2, "Biology": 1}}
+        model, slots = build_model(changed, warm_teachers, warm_config)
+        warm = apply_warm_start(model, slots, previous, changed, warm_teachers, warm_config, fix_untouched=True)
+
+        solver = cp_model.CpSolver()
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        schedule = extract_schedule(slots, solver.ResponseProto(), warm_teachers)
+        assert validate_schedule(schedule, changed, warm_config) == []
+        physics = schedule.subjects.index("Physics")
+        old_physics = previous["schedule"].subjects.index("Physics")
+        assert ((schedule.grid[0] == physics) == (previous["schedule"].grid[0] == old_physics)).all()
+        assert warm.kept(slots, solver.ResponseProto()) >= warm.fixed
+
+    def test_blocked_slots_get_no_hint(self, previous, schedule_data, warm_teachers, warm_config):
+        restricted = replace(warm_config,
+                             unavailable={"teacher": {"Teacher B": [[0], [1]]}, "group": {"group2": [[4]]}})
+        model, slots = build_model(schedule_data, warm_teachers, restricted)
+        warm = apply_warm_start(model, slots, previous, schedule_data, warm_teachers, restricted, fix_untouched=True)
+
+        # The new calendars touch group2 and Physics, and Math is shared with group2, so nothing is fixed.
+        assert warm.fixed == 0
+        assert len(warm.values) == len(slots.variables) == len(model.Proto().solution_hint.vars)
+        solver = cp_model.CpSolver()
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        assert 0 < warm.kept(slots, solver.ResponseProto()) <= len(warm.values)
+        assert validate_schedule(extract_schedule(slots, solver.ResponseProto(), warm_teachers), schedule_data,
+                                 restricted) == []
+
+    def test_unchanged_calendars_fix_only_allowed_slots(self, schedule_data, warm_teachers, warm_config, tmp_path):
+        restricted = replace(warm_config,
+                             unavailable={"teacher": {"Teacher B": [[0], [1]]}, "group": {"group2": [[4]]}})
+        solver, slots = _solve(schedule_data, warm_teachers, restricted)
+        path = tmp_path / "restricted.json"
+        timetable = extract_schedule(slots, solver.ResponseProto(), warm_teachers)
+        save_solution(path, timetable, schedule_data, warm_teachers, restricted, solver.ObjectiveValue(),
+                      solver.WallTime())
+        model, slots = build_model(schedule_data, warm_teachers, restricted)
+
+        warm = apply_warm_start(model, slots, load_solution(path), schedule_data, warm_teachers, restricted,
+                                fix_untouched=True)
+
+        assert warm.fixed == len(warm.values) == len(slots.variables)
+
+
+class TestWarmStartFlag:
+    def test_missing_solution_file_is_a_usage_error(self, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exit_info:
+            parse_args(["--warm-start", str(tmp_path / "missing.json")])
+
+        assert exit_info.value.code == 2
+        assert "no saved solution" in capsys.readouterr().err
+
+    def test_saved_solution_file_is_accepted(self, tmp_path):
+        path = tmp_path / "last.json"
+        path.write_text("{}")
+
+        assert parse_args(["--warm-start", str(path)]).warm_start == path